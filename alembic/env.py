@@ -6,6 +6,7 @@ from sqlalchemy import pool
 from alembic import context
 
 from app.models.document import Base
+from app.models import translation_memory  # noqa: F401 (Base.metadata에 테이블 등록)
 
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,64 @@
+import os
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """환경 변수(.env)로 설정 가능한 서버 설정"""
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    # PDF 렌더링 프로세스 풀
+    render_workers: int = os.cpu_count() or 1
+    render_max_queue: int = 32
+
+    # 페이지 병렬 렌더링: 페이지 수가 기준 이상이면 shard 단위로 나눠 여러 프로세스에서 렌더링
+    parallel_render_min_pages: int = 40
+    render_shard_size: int = 20
+
+    # 결과 PDF가 이 크기(바이트)를 넘으면 메모리 대신 임시 파일로 응답 (기본값: 사용 안 함)
+    response_spill_bytes: Optional[int] = None
+
+    # 원본 PDF 다운로드
+    download_timeout: float = 60.0
+    download_pool_size: int = 16
+    download_max_bytes: int = 1024 * 1024 * 1024
+    # 이 크기를 넘는 다운로드는 메모리 대신 임시 파일에 받음
+    download_spool_bytes: int = 32 * 1024 * 1024
+
+    # 원본 PDF 디스크 캐시 (디렉토리를 지정하면 사용)
+    pdf_cache_dir: Optional[str] = None
+    pdf_cache_max_bytes: int = 2 * 1024 * 1024 * 1024
+
+    # 스타일 추출용 페이지 이미지 캐시 (프로세스당)
+    page_raster_cache_bytes: int = 256 * 1024 * 1024
+
+    # 단계 파이프라인: 페이지 묶음 단위로 OCR 파싱, 스타일 추정, 렌더링을 겹쳐 실행
+    pipeline_batch_pages: int = 10
+    pipeline_queue_size: int = 2  # 단계 사이에서 대기할 수 있는 묶음 수
+    pipeline_style_concurrency: int = 2
+    pipeline_render_concurrency: int = 2
+
+    # OCR 입력용 페이지 이미지 (파일을 쓰지 않고 렌더링 프로세스 풀에서 메모리로 인코딩)
+    ocr_image_dpi: int = 200
+    ocr_image_format: str = "png"  # png, jpeg, webp
+    ocr_image_quality: int = 85  # jpeg, webp 품질
+    ocr_raster_pages_per_task: int = 2
+    ocr_raster_max_pending: int = 4  # 메모리에 올라가는 페이지는 약 max_pending * pages_per_task
+
+    # OCR 요청: 페이지를 batch_size개씩 묶어 최대 max_in_flight개를 동시에 요청
+    ocr_max_in_flight: int = 8
+    ocr_batch_size: int = 8
+    ocr_max_retries: int = 3
+    ocr_retry_backoff: float = 0.5  # 초, 재시도마다 두 배
+
+    # 번역 메모리. 테이블은 alembic 마이그레이션으로 생성
+    translation_memory_lru_size: int = 100_000  # 프로세스 내 LRU에 둘 번역문 수
+    # 비슷한 원문 조회: 이 유사도 이상이면 결과를 반환하고, reuse 이상이면 번역기 대신 사용
+    # (1.0은 숫자, 자리표시자만 다른 원문)
+    fuzzy_memory_min_score: float = 0.7
+    fuzzy_memory_reuse_score: float = 1.0
+
+
+settings = Settings()
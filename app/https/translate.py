@@ -1,22 +1,39 @@
+import asyncio
 import os
-from typing import List, Optional, TypedDict
+import shutil
+from typing import List, Optional, TypedDict, Union
+from urllib.parse import quote
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
+from starlette.background import BackgroundTask
 import tempfile
 
-from app.modules.pdf import Paragraph, process_pdf_paragraphs_from_api
-from app.modules.save_translated_pdf import save_pdf
+from app.config import settings
+from app.modules.ocr_pipeline import render_ocr_pdf, render_ocr_pdf_pipelined
+from app.modules.page_classification import classify_pages
+from app.modules.parallel_render import count_pages, render_pdf_parallel_async, write_bytes
+from app.modules.pdf import Paragraph, render_pdf
+from app.modules.pdf_cache import open_source_pdf
+from app.modules.render_plan import compile_render_plan
+from app.modules.render_pool import RenderQueueFull, run_in_render_pool
+from app.modules.stage_pipeline import get_pipeline_stats, prefetch
+from app.modules.style_extraction import StyleBox, extract_styles_async
+from app.modules.translation_memory import get_translation_memory_stats
 
 
 pdf_router = APIRouter()
 
+STREAM_CHUNK_SIZE = 1024 * 1024
+
 
 class PDFData(BaseModel):
     original_pdf: str
     ocr_result: str
     translations: list[list[str]] = []
     output_filename: str
+    page_number_limit: Optional[int] = 15
+    use_text_layer: bool = True  # False면 스타일을 모두 래스터로 추정
 
 
 class PDFDataV2(BaseModel):
@@ -26,6 +43,16 @@ class PDFDataV2(BaseModel):
     page_number_limit: Optional[int] = 15  # 기본값 설정
 
 
+class ClassifyRequest(BaseModel):
+    original_pdf: str
+    page_number_limit: Optional[int] = None
+
+
+class StyleRequest(BaseModel):
+    original_pdf: str
+    boxes: List[StyleBox]
+    use_text_layer: bool = True  # False면 텍스트 레이어를 무시하고 모두 래스터로 추정
+
 
 # @pdf_router.post("/process_pdf")
 # async def api_process_pdf(data: PDFData):
@@ -65,37 +92,233 @@ class PDFDataV2(BaseModel):
 #         pass
 
 
+def _content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def _iter_chunks(data: bytes, chunk_size: int = STREAM_CHUNK_SIZE):
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        yield view[start : start + chunk_size]
+
+
+def pdf_response(
+    result: Union[bytes, str], filename: str, temp_dir: Optional[str] = None
+) -> Response:
+    """렌더링 결과(바이트 또는 spill된 파일 경로)를 응답으로 변환
+
+    임시 디렉토리가 있으면 응답 전송이 끝난 뒤 삭제한다.
+    """
+    background = (
+        BackgroundTask(shutil.rmtree, temp_dir, ignore_errors=True) if temp_dir else None
+    )
+    if isinstance(result, str):
+        return FileResponse(
+            path=result,
+            filename=filename,
+            media_type="application/pdf",
+            background=background,
+        )
+
+    return StreamingResponse(
+        _iter_chunks(result),
+        media_type="application/pdf",
+        headers={
+            "Content-Length": str(len(result)),
+            "Content-Disposition": _content_disposition(filename),
+        },
+        background=background,
+    )
+
+
 @pdf_router.post("/process_pdf_v2")
 async def api_process_pdf(data: PDFDataV2):
     original_pdf = data.original_pdf
     paragraphs = data.paragraphs
     output_filename = data.output_filename
     page_number_limit = data.page_number_limit
+    spill_threshold = settings.response_spill_bytes
 
-    # 임시 디렉토리 생성
-    temp_dir = tempfile.mkdtemp()
-    temp_path = os.path.join(temp_dir, "output.pdf")
+    # 임시 디렉토리는 병렬 렌더링이나 spill이 필요할 때만 사용
+    temp_dir = None
 
     try:
-        new_pdf = process_pdf_paragraphs_from_api(
-            original_pdf,
-            paragraphs,
-            page_number_limit,
-        )
-        save_pdf(new_pdf, temp_path)
+        # 다운로드는 비동기로, 렌더링과 저장은 프로세스 풀에서 실행해서
+        # 이벤트 루프가 다른 요청(헬스 체크 포함)을 계속 처리할 수 있게 함
+        # 캐시가 켜져 있으면 source는 캐시 파일 경로 (MuPDF가 필요한 부분만 읽음)
+        async with prefetch(open_source_pdf(original_pdf)) as download:
+            # 다운로드하는 동안 payload를 렌더링 계획으로 변환
+            plan = await asyncio.to_thread(
+                compile_render_plan, paragraphs, page_number_limit
+            )
+            source = await download
+            page_count = await asyncio.to_thread(count_pages, source)
 
-        return FileResponse(
-            path=temp_path, filename=output_filename, media_type="application/pdf"
+            if (
+                settings.render_workers > 1
+                and page_count >= settings.parallel_render_min_pages
+            ):
+                # 긴 문서는 페이지 구간별로 여러 프로세스에서 렌더링 후 합침
+                temp_dir = tempfile.mkdtemp()
+                source_path = source
+                if not isinstance(source, str):
+                    source_path = os.path.join(temp_dir, "source.pdf")
+                    await asyncio.to_thread(write_bytes, source_path, source)
+                result = await render_pdf_parallel_async(
+                    source_path,
+                    plan,
+                    page_number_limit,
+                    page_count,
+                    temp_dir,
+                    settings.render_shard_size,
+                    os.path.join(temp_dir, "output.pdf"),
+                    spill_threshold,
+                )
+            else:
+                spill_path = None
+                if spill_threshold is not None:
+                    temp_dir = tempfile.mkdtemp()
+                    spill_path = os.path.join(temp_dir, "output.pdf")
+                result = await run_in_render_pool(
+                    render_pdf,
+                    source,
+                    plan,
+                    page_number_limit,
+                    spill_path,
+                    spill_threshold,
+                )
+
+        return pdf_response(result, output_filename, temp_dir)
+    except RenderQueueFull as e:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        print("Error occured: ", str(e))
+        # 에러 발생 시 임시 파일 정리 (병렬 렌더링의 shard 파일 포함)
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@pdf_router.post("/process_pdf_ocr")
+async def api_process_pdf_ocr(data: PDFData):
+    """Document AI 결과(ocr_result)와 페이지별 번역문으로 번역 PDF를 생성
+
+    문단 텍스트, 위치, 스타일을 서버에서 페이지 단위로 계산해서 바로 렌더링한다.
+    translations[페이지][문단]은 ocr_result의 문단 순서와 같아야 한다.
+    """
+    if not data.original_pdf or not data.ocr_result:
+        raise HTTPException(
+            status_code=400, detail="Both original_pdf and ocr_result must be provided."
         )
+
+    spill_threshold = settings.response_spill_bytes
+    ocr_json = data.ocr_result.encode()
+    temp_dir = None
+    try:
+        async with prefetch(open_source_pdf(data.original_pdf)) as download:
+            # 임시 디렉토리는 spill 또는 파이프라인의 shard 파일에 사용
+            pipelined = len(data.translations) >= settings.parallel_render_min_pages
+            spill_path = None
+            if spill_threshold is not None or pipelined:
+                temp_dir = tempfile.mkdtemp()
+                spill_path = os.path.join(temp_dir, "output.pdf")
+
+            if pipelined:
+                # 긴 문서는 OCR 파싱(다운로드와 동시에), 스타일 추정, 렌더링을 페이지 구간 단위로 겹쳐 실행
+                result = await render_ocr_pdf_pipelined(
+                    download,
+                    ocr_json,
+                    data.translations,
+                    data.page_number_limit,
+                    temp_dir,
+                    spill_path,
+                    spill_threshold,
+                    data.use_text_layer,
+                )
+            else:
+                result = await run_in_render_pool(
+                    render_ocr_pdf,
+                    await download,
+                    ocr_json,
+                    data.translations,
+                    data.page_number_limit,
+                    spill_path,
+                    spill_threshold,
+                    data.use_text_layer,
+                )
+
+        return pdf_response(result, data.output_filename, temp_dir)
+    except RenderQueueFull as e:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        print("Error occured: ", str(e))
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@pdf_router.post("/extract_styles")
+async def api_extract_styles(data: StyleRequest):
+    """박스별 fontSize, color, bgColor, isBold를 추출 (/process_pdf_v2의 style 입력 형식)
+
+    텍스트 레이어가 있는 박스는 font도 함께 반환하고, method에 사용한 방법을 표시한다.
+    """
+    try:
+        async with open_source_pdf(data.original_pdf) as source:
+            page_count = await asyncio.to_thread(count_pages, source)
+            invalid = sorted(
+                {box["pageNum"] for box in data.boxes if not 1 <= box["pageNum"] <= page_count}
+            )
+            if invalid:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"페이지 번호가 범위를 벗어났습니다: {invalid} (1-{page_count})",
+                )
+            # 페이지별로 한 번만 래스터화하고, 여러 페이지는 프로세스 풀에서 나눠 처리
+            styles = await extract_styles_async(
+                source, data.boxes, use_text_layer=data.use_text_layer
+            )
+        return {"styles": styles}
+    except HTTPException:
+        raise
+    except RenderQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         print("Error occured: ", str(e))
-        # 에러 발생 시 임시 파일 정리
-        if os.path.exists(temp_path):
-            os.unlink(temp_path)
-        if os.path.exists(temp_dir):
-            os.rmdir(temp_dir)
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        # 응답이 완료된 후 파일 정리를 위한 background task 등록이 필요한 경우
-        # FastAPI의 BackgroundTasks를 사용할 수 있습니다.
-        pass
+
+
+@pdf_router.post("/classify_pages")
+async def api_classify_pages(data: ClassifyRequest):
+    """페이지별로 텍스트 레이어를 쓸지, OCR이 필요한지(ocr, hybrid) 분류
+
+    텍스트 레이어를 쓸 수 있는 페이지는 /process_pdf_v2 형식의 문단(translatedText 제외)을 함께
+    반환하므로, OCR은 ocrPages에 있는 페이지(hybrid는 ocrRegions 영역)만 요청하면 된다.
+    """
+    try:
+        async with open_source_pdf(data.original_pdf) as source:
+            return await run_in_render_pool(classify_pages, source, data.page_number_limit)
+    except RenderQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        print("Error occured: ", str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@pdf_router.get("/pipeline_stats")
+async def api_pipeline_stats():
+    """단계 파이프라인의 단계별 처리 수, 처리 시간, 대기열 길이"""
+    return {"stages": get_pipeline_stats()}
+
+
+@pdf_router.get("/translation_memory_stats")
+async def api_translation_memory_stats():
+    """번역 메모리 조회 수, LRU/DB 적중 수, 적중률"""
+    return get_translation_memory_stats()
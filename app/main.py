@@ -1,11 +1,26 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
+from app.modules.download import close_http_client
+from app.modules.render_pool import shutdown_render_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 종료 시 공유 HTTP 클라이언트와 렌더링 프로세스 풀 정리
+    await close_http_client()
+    shutdown_render_pool()
+
+
 app = FastAPI(
     title="My FastAPI Application",
     description="A simple FastAPI application with SQLAlchemy and Alembic.",
     version="1.0.0",
-    debug=True
+    debug=True,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, DateTime, Integer, String, UniqueConstraint, func
+
+from app.models.document import Base
+
+
+class TranslationMemoryEntry(Base):
+    """정규화한 원문의 해시로 찾는 번역 결과 (문서와 관계없이 재사용)"""
+
+    __tablename__ = "translation_memory"
+    __table_args__ = (
+        UniqueConstraint(
+            "from_lang", "to_lang", "text_hash", name="uq_translation_memory_key"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    from_lang = Column(String(16), nullable=False)
+    to_lang = Column(String(16), nullable=False)
+    text_hash = Column(String(64), nullable=False)  # 정규화한 원문의 sha256
+    text = Column(String, nullable=False)
+    translation = Column(String, nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
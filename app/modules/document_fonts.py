@@ -0,0 +1,131 @@
+import re
+from typing import Dict, List, Set
+
+import fitz  # PyMuPDF
+
+from app.modules.font_registry import FontFace
+
+
+FONT_FILE_KEYS = ("FontFile", "FontFile2", "FontFile3")
+
+
+def _xref_of(value: str) -> int:
+    """ "12 0 R" 형태의 참조에서 xref 번호를 추출"""
+    return int(value.split()[0])
+
+
+def _add_font_reference(page: fitz.Page, name: str, xref: int) -> bool:
+    """이미 문서에 임베드된 폰트(xref)를 페이지의 /Resources/Font에 이름으로 등록
+
+    Resources, Font가 간접 참조인 경우에도 실제 딕셔너리를 찾아서 키를 추가한다.
+    페이지가 Resources를 부모에서 상속받는 경우에는 등록하지 않고 False를 반환한다.
+    """
+    doc = page.parent
+    owner, key = page.xref, "Resources"
+    kind, value = doc.xref_get_key(owner, key)
+    if kind == "null":
+        return False
+    if kind == "xref":
+        owner, key = _xref_of(value), ""
+
+    key = f"{key}/Font" if key else "Font"
+    kind, value = doc.xref_get_key(owner, key)
+    if kind == "xref":
+        owner, key = _xref_of(value), ""
+
+    doc.xref_set_key(owner, f"{key}/{name}" if key else name, f"{xref} 0 R")
+    return True
+
+
+class DocumentFonts:
+    """문서당 폰트를 한 번만 임베드하고, 이후 페이지에서는 이름으로만 참조
+
+    첫 사용 시 insert_font로 레지스트리의 폰트 버퍼를 임베드하고,
+    다른 페이지에서는 같은 xref를 페이지 리소스에 추가만 한다.
+    """
+
+    def __init__(self, doc: fitz.Document):
+        self.doc = doc
+        self._xrefs: Dict[str, int] = {}
+        # 페이지 xref -> 페이지 리소스에 있는 폰트 이름 (get_fonts는 페이지마다 처음 한 번만 호출)
+        self._page_fonts: Dict[int, Set[str]] = {}
+
+    def use(self, page: fitz.Page, face: FontFace) -> str:
+        """페이지에서 face를 사용할 수 있게 하고 리소스 이름을 반환
+
+        Args:
+            page (fitz.Page): 텍스트를 넣을 페이지
+            face (FontFace): 레지스트리의 폰트
+
+        Returns:
+            str: insert_text의 fontname으로 사용할 이름
+        """
+        name = face.resource_name
+        page_fonts = self._page_fonts.get(page.xref)
+        if page_fonts is None:
+            page_fonts = self._page_fonts[page.xref] = {
+                font[4] for font in page.get_fonts()
+            }
+        if name in page_fonts:
+            return name
+
+        xref = self._xrefs.get(name)
+        if xref is None:
+            self._xrefs[name] = page.insert_font(fontname=name, fontbuffer=face.buffer)
+        elif not _add_font_reference(page, name, xref):
+            page.insert_font(fontname=name, fontbuffer=face.buffer)
+        page_fonts.add(name)
+        return name
+
+
+def _font_descriptors(doc: fitz.Document, font_xref: int) -> List[int]:
+    """폰트 딕셔너리(Type0이면 하위 폰트 포함)의 FontDescriptor xref 목록"""
+    kind, value = doc.xref_get_key(font_xref, "FontDescriptor")
+    if kind == "xref":
+        return [_xref_of(value)]
+
+    descriptors = []
+    kind, value = doc.xref_get_key(font_xref, "DescendantFonts")
+    if kind == "xref":
+        value = doc.xref_object(_xref_of(value), compressed=True)
+    for ref in re.findall(r"(\d+) 0 R", value if kind in ("array", "xref") else ""):
+        kind, value = doc.xref_get_key(int(ref), "FontDescriptor")
+        if kind == "xref":
+            descriptors.append(_xref_of(value))
+    return descriptors
+
+
+def embedded_font_bytes(doc: fitz.Document) -> int:
+    """페이지에서 사용하는 폰트의 임베드된 파일 스트림 전체 크기 (저장된 바이트 기준)
+
+    서브셋 후에도 이전 폰트 객체는 저장 시 garbage collection 전까지 남아 있으므로
+    페이지에서 참조되는 폰트만 계산한다.
+    """
+    font_xrefs = {font[0] for page in doc for font in page.get_fonts()}
+    stream_xrefs = set()
+    for font_xref in font_xrefs:
+        for descriptor in _font_descriptors(doc, font_xref):
+            for key in FONT_FILE_KEYS:
+                kind, value = doc.xref_get_key(descriptor, key)
+                if kind == "xref":
+                    stream_xrefs.add(_xref_of(value))
+    return sum(len(doc.xref_stream_raw(xref) or b"") for xref in stream_xrefs)
+
+
+def subset_document_fonts(doc: fitz.Document) -> Dict[str, int]:
+    """임베드된 폰트를 실제로 사용된 글리프만 남기도록 서브셋
+
+    KoPubWorld OTF(CFF)는 MuPDF 내장 서브셋에서 실패하므로 fontTools 경로를 사용한다.
+
+    Returns:
+        dict: before, after, saved (폰트 스트림 바이트)
+    """
+    before = embedded_font_bytes(doc)
+    try:
+        doc.subset_fonts(fallback=True)
+    except Exception as e:
+        print(f"폰트 서브셋 중 오류 발생: {e}")
+        return {"before": before, "after": before, "saved": 0}
+
+    after = embedded_font_bytes(doc)
+    return {"before": before, "after": after, "saved": before - after}
@@ -0,0 +1,78 @@
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+QUANT_BITS = 4  # 채널당 4비트 -> 4096개 색상 구간
+
+
+def _group_labels(pixel_groups: Sequence[np.ndarray]):
+    """픽셀 그룹들을 (N, 3) 하나로 합치고 각 픽셀의 그룹 번호를 만듦"""
+    sizes = np.array([len(group) for group in pixel_groups], dtype=np.int64)
+    pixels = np.concatenate(
+        [np.asarray(group, dtype=np.uint8).reshape(-1, 3) for group in pixel_groups]
+    )
+    labels = np.repeat(np.arange(len(pixel_groups)), sizes)
+    return pixels, labels, sizes
+
+
+def _group_means(pixels: np.ndarray, labels: np.ndarray, count: int) -> np.ndarray:
+    """그룹별 평균 색상 (count, 3). 픽셀이 없는 그룹은 nan"""
+    sizes = np.bincount(labels, minlength=count)
+    sums = np.stack(
+        [np.bincount(labels, weights=pixels[:, c], minlength=count) for c in range(3)],
+        axis=1,
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums / sizes[:, None]
+
+
+def quantize_colors(pixels: np.ndarray, quant_bits: int = QUANT_BITS) -> np.ndarray:
+    """(N, 3) uint8 색상을 채널당 quant_bits 비트로 줄여 하나의 구간 번호로 변환"""
+    q = pixels >> (8 - quant_bits)
+    return (
+        (q[:, 0].astype(np.int64) << (2 * quant_bits))
+        | (q[:, 1].astype(np.int64) << quant_bits)
+        | q[:, 2]
+    )
+
+
+def dominant_colors(
+    pixel_groups: Sequence[np.ndarray],
+    method: str = "mean",
+    quant_bits: int = QUANT_BITS,
+) -> List[Optional[np.ndarray]]:
+    """여러 픽셀 그룹의 대표 색상을 한 번에 계산
+
+    한 페이지의 모든 박스(텍스트/배경 마스크)를 모아서 호출하면 numpy 연산 몇 번으로 끝난다.
+
+    Args:
+        pixel_groups (Sequence[np.ndarray]): 그룹별 (n, 3) uint8 픽셀 배열
+        method (str): "mean"은 평균 (KMeans(n_clusters=1)의 중심과 같음),
+            "mode"는 양자화한 색상 히스토그램에서 가장 많은 구간의 평균
+        quant_bits (int): "mode"에서 채널당 사용할 비트 수
+
+    Returns:
+        List[Optional[np.ndarray]]: 그룹별 대표 색상 (float64, 3), 픽셀이 없으면 None
+    """
+    count = len(pixel_groups)
+    if count == 0:
+        return []
+    pixels, labels, sizes = _group_labels(pixel_groups)
+    if len(pixels) == 0:
+        return [None] * count
+
+    if method == "mean":
+        colors = _group_means(pixels, labels, count)
+    elif method == "mode":
+        bins = quantize_colors(pixels, quant_bits)
+        bin_count = 1 << (3 * quant_bits)
+        histogram = np.bincount(labels * bin_count + bins, minlength=count * bin_count)
+        modes = histogram.reshape(count, bin_count).argmax(axis=1)
+        # 가장 많은 구간에 속한 픽셀의 평균으로 양자화 오차를 없앰
+        in_mode = bins == modes[labels]
+        colors = _group_means(pixels[in_mode], labels[in_mode], count)
+    else:
+        raise ValueError(f"지원하지 않는 method 입니다: {method}")
+
+    return [colors[i] if sizes[i] else None for i in range(count)]
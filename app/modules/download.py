@@ -0,0 +1,190 @@
+import hashlib
+import os
+import tempfile
+from io import BytesIO
+from typing import Optional, Union
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.config import settings
+
+
+CHUNK_SIZE = 256 * 1024
+
+
+class DownloadTooLarge(Exception):
+    """다운로드 크기가 download_max_bytes를 넘음"""
+
+
+class SpooledDownload:
+    """다운로드 내용을 메모리에 받다가 spool_bytes를 넘으면 임시 파일로 옮겨 쓰는 버퍼
+
+    응답 본문을 한 번만 보관하므로 response.content + BytesIO 복사처럼 두 벌이 생기지 않고,
+    큰 파일은 디스크에 두고 MuPDF가 경로로 필요한 부분만 읽게 한다.
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        spool_bytes: Optional[int] = None,
+        dir: Optional[str] = None,
+        hash_content: bool = False,
+    ):
+        self.max_bytes = settings.download_max_bytes if max_bytes is None else max_bytes
+        self.spool_bytes = (
+            settings.download_spool_bytes if spool_bytes is None else spool_bytes
+        )
+        self.dir = dir
+        self.size = 0
+        self.path: Optional[str] = None
+        self._buffer: Optional[BytesIO] = BytesIO()
+        self._file = None
+        self._hash = hashlib.sha256() if hash_content else None
+
+    @property
+    def sha256(self) -> Optional[str]:
+        """hash_content=True인 경우 받은 내용의 sha256"""
+        return self._hash.hexdigest() if self._hash is not None else None
+
+    def check_length(self, content_length: Optional[str]):
+        """Content-Length 헤더로 미리 크기 제한을 확인"""
+        if content_length and int(content_length) > self.max_bytes:
+            raise DownloadTooLarge(
+                f"PDF 크기가 제한을 초과합니다. ({content_length} > {self.max_bytes} bytes)"
+            )
+
+    def write(self, chunk: bytes):
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            self.cleanup()
+            raise DownloadTooLarge(
+                f"PDF 크기가 제한을 초과합니다. (> {self.max_bytes} bytes)"
+            )
+        if self._hash is not None:
+            self._hash.update(chunk)
+
+        if self._file is not None:
+            self._file.write(chunk)
+            return
+
+        self._buffer.write(chunk)
+        if self.size > self.spool_bytes:
+            # 메모리 버퍼를 임시 파일로 옮기고 이후로는 파일에 씀
+            self._file = tempfile.NamedTemporaryFile(
+                suffix=".pdf", dir=self.dir, delete=False
+            )
+            self.path = self._file.name
+            self._file.write(self._buffer.getbuffer())
+            self._buffer = None
+
+    def finish(self) -> Union[bytes, str]:
+        """받은 내용을 반환. 메모리에 있으면 bytes, 파일로 옮겨졌으면 그 경로"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            return self.path
+        # BytesIO.getvalue()는 내부 버퍼를 복사하지 않고 bytes로 넘겨줌
+        data = self._buffer.getvalue()
+        self._buffer = None
+        return data
+
+    def cleanup(self):
+        """임시 파일이 있으면 삭제"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+
+_client: Optional[httpx.AsyncClient] = None
+_session: Optional[requests.Session] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """keep-alive 커넥션 풀을 공유하는 비동기 HTTP 클라이언트"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=settings.download_timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=settings.download_pool_size,
+                max_keepalive_connections=settings.download_pool_size,
+            ),
+        )
+    return _client
+
+
+def get_http_session() -> requests.Session:
+    """동기 코드(load_pdf_all)에서 사용하는 커넥션 풀 공유 세션"""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=settings.download_pool_size,
+            pool_maxsize=settings.download_pool_size,
+        )
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+    return _session
+
+
+async def download_pdf(url: str, sink: Optional[SpooledDownload] = None) -> SpooledDownload:
+    """URL에서 PDF를 비동기 스트리밍으로 다운로드
+
+    Args:
+        url (str): PDF 파일 URL
+        sink (SpooledDownload, optional): 내용을 받을 버퍼 (기본값: 설정값으로 생성)
+
+    Returns:
+        SpooledDownload: finish()로 bytes 또는 임시 파일 경로를 얻음
+    """
+    async with get_http_client().stream("GET", url) as response:
+        response.raise_for_status()  # HTTP 오류 발생 시 예외 처리
+        return await read_response(response, sink or SpooledDownload())
+
+
+async def read_response(response: httpx.Response, sink: SpooledDownload) -> SpooledDownload:
+    """스트리밍 응답 본문을 크기 제한을 지키며 sink에 받음"""
+    sink.check_length(response.headers.get("Content-Length"))
+    try:
+        async for chunk in response.aiter_bytes(CHUNK_SIZE):
+            sink.write(chunk)
+    except BaseException:
+        sink.cleanup()
+        raise
+    return sink
+
+
+def download_pdf_sync(url: str, sink: Optional[SpooledDownload] = None) -> SpooledDownload:
+    """download_pdf의 동기 버전 (requests 세션 사용)"""
+    sink = sink or SpooledDownload()
+    with get_http_session().get(
+        url, stream=True, timeout=settings.download_timeout
+    ) as response:
+        response.raise_for_status()  # HTTP 오류 발생 시 예외 처리
+        sink.check_length(response.headers.get("Content-Length"))
+        try:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                sink.write(chunk)
+        except BaseException:
+            sink.cleanup()
+            raise
+    return sink
+
+
+async def close_http_client():
+    global _client, _session
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    if _session is not None:
+        _session.close()
+        _session = None
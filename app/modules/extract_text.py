@@ -1,6 +1,12 @@
 import io
+from contextlib import closing
+from typing import Iterator, Tuple, Union
+
 from google.cloud import vision
 
+from app.modules.ocr_client import OCRExecutor, VisionOCRBackend
+from app.modules.page_images import iter_page_images
+
 
 def google_detect_text(image_path: str, client: any) -> str:
     """
@@ -13,6 +19,17 @@ def google_detect_text(image_path: str, client: any) -> str:
     with io.open(image_path, "rb") as image_file:
         content = image_file.read()
 
+    return google_detect_text_content(content, client)
+
+
+def google_detect_text_content(content: bytes, client: any) -> str:
+    """
+    Google Vision API를 사용하여 메모리에 있는 이미지에서 텍스트를 감지.
+    Args:
+        content (bytes): 인코딩된 이미지 (PNG, JPEG, WebP)
+    Returns:
+        str: 감지된 텍스트
+    """
     image = vision.Image(content=content)
     response = client.text_detection(image=image)
     texts = response.text_annotations
@@ -25,6 +42,26 @@ def google_detect_text(image_path: str, client: any) -> str:
     return full_text
 
 
+def google_detect_pdf_text(
+    source: Union[bytes, str], client: any, **image_options
+) -> Iterator[Tuple[int, str]]:
+    """
+    PDF 페이지를 메모리에서 이미지로 렌더링해서 바로 Google Vision API로 텍스트를 감지.
+    페이지는 묶음 단위로 여러 요청을 동시에 보내고, 결과는 페이지 순서대로 반환.
+    Args:
+        source (Union[bytes, str]): PDF 바이트 또는 파일 경로
+        image_options: iter_page_images 옵션 (pages, dpi, fmt, quality, executor 등)
+    Yields:
+        Tuple[int, str]: (페이지 번호(0부터 시작), 감지된 텍스트)
+    """
+    # OCR 오류로 중간에 끝나도 페이지 렌더링을 멈추고 렌더링 대기열 자리를 돌려줌
+    with closing(iter_page_images(source, **image_options)) as pages, OCRExecutor(
+        VisionOCRBackend(client)
+    ) as ocr:
+        for result in ocr.iter_results(pages):
+            yield result.page_num, result.text
+
+
 def pixels_to_font_point(pixels: int, dpi: int = 96) -> float:
     """
     픽셀 단위 높이를 포인트 단위 글자 크기로 변환합니다.
@@ -0,0 +1,140 @@
+import os
+import threading
+from typing import Dict, NamedTuple, Tuple
+
+import fitz  # PyMuPDF
+
+
+FONT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "fonts",
+)
+
+DEFAULT_FAMILY = "KoPubWorld Dotum"
+DEFAULT_WEIGHT = "Medium"
+
+# (family, weight) -> fonts/ 디렉토리 안의 파일 이름
+FONT_FACES: Dict[Tuple[str, str], str] = {
+    ("KoPubWorld Dotum", "Medium"): "KoPubWorld Dotum_Pro_Medium.otf",
+    ("KoPubWorld Dotum", "Bold"): "KoPubWorld Dotum_Pro_Bold.otf",
+    ("KoPubWorld Dotum", "Light"): "KoPubWorld Dotum_Pro_Light.otf",
+    ("NanumGothicCoding", "Regular"): "NanumGothicCoding.ttf",
+}
+
+
+class FontMetrics(NamedTuple):
+    """폰트 크기 1pt 기준의 메트릭"""
+
+    ascender: float
+    descender: float
+    space_width: float
+
+
+class FontFace(NamedTuple):
+    family: str
+    weight: str
+    path: str
+    font: fitz.Font
+    metrics: FontMetrics
+
+    @property
+    def resource_name(self) -> str:
+        """PDF 페이지 리소스에서 사용할 폰트 이름 (공백 없는 고정 이름)"""
+        return f"{self.family}-{self.weight}".replace(" ", "")
+
+    @property
+    def buffer(self) -> bytes:
+        return self.font.buffer
+
+
+_lock = threading.Lock()
+_faces: Dict[Tuple[str, str], FontFace] = {}
+_stats = {"hits": 0, "loads": 0}
+_owner_pid = os.getpid()
+
+
+def _reset_if_forked():
+    """fork된 워커 프로세스에서는 부모의 캐시를 버리고 새로 로드"""
+    global _owner_pid
+    pid = os.getpid()
+    if pid != _owner_pid:
+        _faces.clear()
+        _stats["hits"] = 0
+        _stats["loads"] = 0
+        _owner_pid = pid
+
+
+def resolve_face(font_name: str) -> Tuple[str, str]:
+    """렌더러에 전달되는 폰트 이름("Helvetica-Bold" 등)을 (family, weight)로 변환
+
+    Args:
+        font_name (str): 스타일에서 전달된 폰트 이름
+
+    Returns:
+        Tuple[str, str]: 레지스트리 키 (family, weight)
+    """
+    if "NanumGothicCoding" in font_name:
+        return ("NanumGothicCoding", "Regular")
+    if "Bold" in font_name:
+        return (DEFAULT_FAMILY, "Bold")
+    if "Light" in font_name:
+        return (DEFAULT_FAMILY, "Light")
+    return (DEFAULT_FAMILY, DEFAULT_WEIGHT)
+
+
+def get_face(family: str = DEFAULT_FAMILY, weight: str = DEFAULT_WEIGHT) -> FontFace:
+    """(family, weight)에 해당하는 폰트를 프로세스당 한 번만 로드해서 반환
+
+    Args:
+        family (str): 폰트 패밀리 이름
+        weight (str): 폰트 굵기 ("Medium", "Bold", "Light", "Regular")
+
+    Returns:
+        FontFace: 공유되는 fitz.Font 객체와 메트릭
+    """
+    key = (family, weight)
+    with _lock:
+        _reset_if_forked()
+        face = _faces.get(key)
+        if face is not None:
+            _stats["hits"] += 1
+            return face
+
+        if key not in FONT_FACES:
+            raise KeyError(f"등록되지 않은 폰트입니다: {family} {weight}")
+
+        path = os.path.join(FONT_DIR, FONT_FACES[key])
+        font = fitz.Font(fontfile=path)
+        metrics = FontMetrics(
+            ascender=font.ascender,
+            descender=font.descender,
+            space_width=font.text_length(" ", fontsize=1),
+        )
+        face = FontFace(family, weight, path, font, metrics)
+        _faces[key] = face
+        _stats["loads"] += 1
+        return face
+
+
+def get_face_for_name(font_name: str) -> FontFace:
+    """스타일의 폰트 이름으로 폰트를 조회"""
+    return get_face(*resolve_face(font_name))
+
+
+def get_registry_stats() -> Dict[str, int]:
+    """레지스트리 사용 통계 (hits, loads, faces)"""
+    with _lock:
+        _reset_if_forked()
+        return {
+            "hits": _stats["hits"],
+            "loads": _stats["loads"],
+            "faces": len(_faces),
+        }
+
+
+def reset_registry():
+    """로드된 폰트와 통계를 모두 비움 (테스트용)"""
+    with _lock:
+        _faces.clear()
+        _stats["hits"] = 0
+        _stats["loads"] = 0
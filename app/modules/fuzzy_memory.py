@@ -0,0 +1,356 @@
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from sqlalchemy import Engine, select
+
+from app.config import settings
+from app.models.document import DocumentLineTranslation
+from app.models.translation_memory import TranslationMemoryEntry
+from app.modules.translation_memory import normalize_text
+
+
+# 숫자, 날짜, 시간(12, 3.5, 1,000, 2024-11-06, 12/05, 10:30)과 자리표시자({name}, ${name}, %s, %d)
+MASK_PATTERN = re.compile(r"\d+(?:[.,:/-]\d+)*|\$?\{[^{}]*\}|%[sd]")
+# 원문 비교용 표시 (값과 관계없이 같은 문자, 사용자 정의 영역 U+E000)
+SOURCE_MARK = "\ue000"
+# 번역문 안의 i번째 값 자리 (U+E001 i U+E002)
+VALUE_TOKEN = re.compile("\ue001(\\d+)\ue002")
+
+SHINGLE_SIZE = 3
+NUM_PERM = 64
+BANDS = 16  # 밴드당 4행. 자카드 유사도 0.5 근처부터 후보가 됨
+ROWS = NUM_PERM // BANDS
+# 정확한 유사도를 다시 계산할 후보 수
+RESCORE_CANDIDATES = 8
+# add()로 하나씩 추가한 항목이 이 수만큼 모이면 밴드별 정렬된 배열로 합침
+MERGE_THRESHOLD = 50_000
+
+_rng = np.random.default_rng(20241106)
+_GRAM_MULTIPLIERS = _rng.integers(
+    1, 2**63 - 1, SHINGLE_SIZE, dtype=np.uint64
+) | np.uint64(1)
+_PERM_A = _rng.integers(1, 2**63 - 1, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_PERM_B = _rng.integers(0, 2**63 - 1, NUM_PERM, dtype=np.uint64)
+_BAND_MULTIPLIERS = _rng.integers(1, 2**63 - 1, ROWS, dtype=np.uint64) | np.uint64(1)
+
+
+class MaskedSegment(NamedTuple):
+    text: str  # 숫자, 자리표시자를 SOURCE_MARK로 바꾸고 소문자로 만든 원문
+    values: Tuple[str, ...]  # 바꾼 값 (원문 순서)
+
+
+class FuzzyMatch(NamedTuple):
+    source: str  # 찾은 기존 원문
+    translation: str  # 조회한 원문의 숫자, 자리표시자를 채운 번역문
+    score: float  # 마스킹한 원문의 문자 n-gram 자카드 유사도 (1이면 숫자만 다름)
+
+
+def mask_segment(text: str) -> MaskedSegment:
+    """숫자와 자리표시자를 값과 관계없는 표시로 바꿈 ("Table 12"와 "Table 7"은 같은 텍스트)"""
+    values = []
+
+    def replace(match: re.Match) -> str:
+        values.append(match.group())
+        return SOURCE_MARK
+
+    masked = MASK_PATTERN.sub(replace, normalize_text(text))
+    return MaskedSegment(masked.lower(), tuple(values))
+
+
+def mask_translation(translation: str, values: Sequence[str]) -> Optional[str]:
+    """번역문 안의 원문 값을 원문 위치 번호가 있는 자리로 바꿈
+
+    번역문의 숫자, 자리표시자를 같은 패턴으로 찾으므로 다른 숫자의 일부("12"의 "1")는 바꾸지 않는다.
+    원문의 값마다 번역문에 정확히 한 번씩 나와야 위치를 확정할 수 있으므로, 원문에 같은 값이 여러 번
+    있거나("Table 7, row 7") 번역문에서 값의 형식이 바뀌었으면("1,000" -> "1000") None을 반환한다.
+
+    Returns:
+        Optional[str]: 값 자리를 표시한 번역문 (위치를 확정할 수 없으면 None)
+    """
+    if not values:
+        return translation
+    positions = {value: i for i, value in enumerate(values)}
+    if len(positions) != len(values):
+        return None
+    found = Counter(match.group() for match in MASK_PATTERN.finditer(translation))
+    if any(found[value] != 1 for value in values):
+        return None
+
+    def replace(match: re.Match) -> str:
+        i = positions.get(match.group())
+        return match.group() if i is None else f"\ue001{i}\ue002"
+
+    return MASK_PATTERN.sub(replace, translation)
+
+
+def fill_translation(masked: str, values: Sequence[str]) -> str:
+    """mask_translation 결과의 자리를 같은 위치의 원문 값으로 채움"""
+    return VALUE_TOKEN.sub(lambda match: values[int(match.group(1))], masked)
+
+
+def _pad(masked: str) -> str:
+    # 앞뒤 경계도 n-gram에 포함하고, 빈 텍스트도 n-gram이 하나 이상 생기도록 채움
+    return "\0\0" + masked + "\0"
+
+
+def shingles(masked: str) -> Set[str]:
+    """문자 n-gram 집합 (minhash_signatures와 같은 경계 처리)"""
+    padded = _pad(masked)
+    return {padded[i : i + SHINGLE_SIZE] for i in range(len(padded) - SHINGLE_SIZE + 1)}
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    return len(a & b) / len(a | b)
+
+
+def minhash_signatures(texts: Sequence[str]) -> np.ndarray:
+    """마스킹한 텍스트별 MinHash 서명 (N, NUM_PERM) uint32
+
+    모든 텍스트의 코드 포인트를 한 배열로 이어서 문자 3-gram 해시를 한 번에 계산하고,
+    텍스트 구간별 최소값(reduceat)으로 서명을 만든다. MinHash는 중복 n-gram에 영향을 받지 않으므로
+    n-gram 중복 제거는 하지 않는다. 중간 배열이 n-gram 수 * NUM_PERM이므로 텍스트는 수천 개씩 넘긴다.
+    """
+    padded = [_pad(text) for text in texts]
+    lengths = np.fromiter(
+        (len(text) for text in padded), dtype=np.int64, count=len(padded)
+    )
+    codes = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32).astype(
+        np.uint64
+    )
+    grams = (
+        (codes[:-2] * _GRAM_MULTIPLIERS[0])
+        ^ (codes[1:-1] * _GRAM_MULTIPLIERS[1])
+        ^ (codes[2:] * _GRAM_MULTIPLIERS[2])
+    )
+
+    # 텍스트 경계를 넘는 n-gram 제외
+    ends = np.cumsum(lengths)
+    owner = np.repeat(np.arange(len(padded)), lengths)[: len(grams)]
+    grams = grams[np.arange(len(grams)) <= ends[owner] - SHINGLE_SIZE] >> np.uint64(32)
+
+    # 곱셈-시프트 해시로 NUM_PERM개의 순열을 흉내냄
+    # (NUM_PERM, n-gram 수)로 두어야 reduceat이 연속된 메모리를 읽음
+    permuted = (_PERM_A[:, None] * grams + _PERM_B[:, None]) >> np.uint64(32)
+    starts = np.concatenate(([0], np.cumsum(lengths - SHINGLE_SIZE + 1)[:-1]))
+    return np.minimum.reduceat(permuted, starts, axis=1).T.astype(np.uint32)
+
+
+def band_keys(signatures: np.ndarray) -> np.ndarray:
+    """서명을 밴드별 uint64 키로 묶음 (N, BANDS)"""
+    bands = signatures.reshape(len(signatures), BANDS, ROWS).astype(np.uint64)
+    return (bands * _BAND_MULTIPLIERS).sum(axis=2, dtype=np.uint64)
+
+
+class FuzzyMemoryIndex:
+    """비슷한 원문의 기존 번역을 찾는 MinHash-LSH 색인 (언어 쌍 하나)
+
+    원문은 숫자와 자리표시자를 마스킹하고 문자 3-gram의 MinHash 서명으로 색인한다.
+    밴드별 키는 정렬된 numpy 배열로 두고 searchsorted로 찾으므로 수백만 개에서도
+    조회는 밴드 수만큼의 이진 탐색과 후보 몇 개의 유사도 계산으로 끝난다.
+
+    사용 예:
+        index = load_fuzzy_index(engine, "en", "ko")
+        match = index.lookup("Table 12")  # FuzzyMatch("Table 7", "표 12", 1.0)
+    """
+
+    def __init__(self, from_lang: str, to_lang: str):
+        self.from_lang = from_lang
+        self.to_lang = to_lang
+        self._sources: List[str] = []
+        self._masked: List[str] = []
+        self._values: List[Tuple[str, ...]] = []
+        # mask_translation 결과 (값 위치를 확정할 수 없으면 번역문 그대로, _fillable이 0)
+        self._translations: List[str] = []
+        self._fillable = bytearray()
+        self._signatures = np.zeros((0, NUM_PERM), dtype=np.uint32)
+        self._size = 0
+        # 밴드별 정렬된 키와 id, 아직 합치지 않은 키 -> id 목록
+        self._keys = [np.zeros(0, dtype=np.uint64) for _ in range(BANDS)]
+        self._ids = [np.zeros(0, dtype=np.int64) for _ in range(BANDS)]
+        self._pending: List[Dict[int, List[int]]] = [{} for _ in range(BANDS)]
+        self._pending_count = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add_many(self, pairs: Iterable[Tuple[str, str]], chunk_size: int = 1000):
+        """(원문, 번역문) 목록을 색인에 추가
+
+        서명은 chunk_size개씩 계산하고, 밴드 키는 마지막에 한 번만 정렬해서 합친다.
+        마스킹 결과가 같은 원문이 여러 개면 먼저 추가한 것을 찾는다.
+        """
+        additions: List[Tuple[np.ndarray, np.ndarray]] = []
+        chunk: List[Tuple[str, str]] = []
+        for pair in pairs:
+            chunk.append(pair)
+            if len(chunk) == chunk_size:
+                additions.append(self._add_chunk(chunk))
+                chunk = []
+        if chunk:
+            additions.append(self._add_chunk(chunk))
+        if additions:
+            keys = np.concatenate([keys for keys, _ in additions])
+            ids = np.concatenate([ids for _, ids in additions])
+            self._merge([(keys[:, band], ids) for band in range(BANDS)])
+
+    def add(self, source: str, translation: str):
+        """하나씩 추가 (밴드 키는 MERGE_THRESHOLD개가 모일 때까지 dict에 둠)"""
+        keys, ids = self._add_chunk([(source, translation)])
+        for band in range(BANDS):
+            self._pending[band].setdefault(int(keys[0, band]), []).append(int(ids[0]))
+        self._pending_count += 1
+        if self._pending_count >= MERGE_THRESHOLD:
+            self._merge_pending()
+
+    def _add_chunk(
+        self, pairs: Sequence[Tuple[str, str]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """원문, 번역문, 서명을 저장하고 밴드 키 (N, BANDS)와 id를 반환"""
+        segments = [mask_segment(source) for source, _ in pairs]
+        signatures = minhash_signatures([segment.text for segment in segments])
+
+        first = self._size
+        self._size += len(pairs)
+        if self._size > len(self._signatures):
+            grown = np.zeros(
+                (max(self._size, len(self._signatures) * 2), NUM_PERM), dtype=np.uint32
+            )
+            grown[:first] = self._signatures[:first]
+            self._signatures = grown
+        self._signatures[first : self._size] = signatures
+
+        for (source, translation), segment in zip(pairs, segments):
+            self._sources.append(source)
+            self._masked.append(segment.text)
+            self._values.append(segment.values)
+            masked = mask_translation(translation, segment.values)
+            self._translations.append(translation if masked is None else masked)
+            self._fillable.append(masked is not None)
+
+        return band_keys(signatures), np.arange(first, self._size, dtype=np.int64)
+
+    def _merge(self, additions: Sequence[Tuple[np.ndarray, np.ndarray]]):
+        for band, (keys, ids) in enumerate(additions):
+            keys = np.concatenate((self._keys[band], keys))
+            ids = np.concatenate((self._ids[band], ids))
+            order = np.argsort(keys, kind="stable")
+            self._keys[band], self._ids[band] = keys[order], ids[order]
+
+    def _merge_pending(self):
+        additions = []
+        for band, pending in enumerate(self._pending):
+            keys = [key for key, ids in pending.items() for _ in ids]
+            ids = [id_ for ids in pending.values() for id_ in ids]
+            additions.append(
+                (np.array(keys, dtype=np.uint64), np.array(ids, dtype=np.int64))
+            )
+            self._pending[band] = {}
+        self._pending_count = 0
+        self._merge(additions)
+
+    def _candidates(self, keys: np.ndarray) -> np.ndarray:
+        found = []
+        for band, key in enumerate(keys):
+            # 키를 np.uint64 그대로 넘겨야 정렬된 배열 전체가 다른 타입으로 변환되지 않음
+            sorted_keys = self._keys[band]
+            left = sorted_keys.searchsorted(key, side="left")
+            right = sorted_keys.searchsorted(key, side="right")
+            if right > left:
+                found.append(self._ids[band][left:right])
+            pending = self._pending[band].get(int(key))
+            if pending:
+                found.append(np.array(pending, dtype=np.int64))
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(found))
+
+    def lookup(
+        self, text: str, min_score: Optional[float] = None
+    ) -> Optional[FuzzyMatch]:
+        """가장 비슷한 기존 원문의 번역문과 유사도 (min_score 미만이면 None)
+
+        Args:
+            text (str): 조회할 원문
+            min_score (float, optional): 최소 유사도 (기본값: settings.fuzzy_memory_min_score)
+        """
+        min_score = settings.fuzzy_memory_min_score if min_score is None else min_score
+        if not self._size or not text.strip():
+            return None
+
+        segment = mask_segment(text)
+        signature = minhash_signatures([segment.text])
+        candidates = self._candidates(band_keys(signature)[0])
+        if not len(candidates):
+            return None
+
+        # 서명으로 추정한 유사도가 높은 후보만 n-gram으로 정확히 다시 계산
+        if len(candidates) > RESCORE_CANDIDATES:
+            estimated = (self._signatures[candidates] == signature[0]).mean(axis=1)
+            candidates = candidates[
+                np.argsort(-estimated, kind="stable")[:RESCORE_CANDIDATES]
+            ]
+        query_shingles = shingles(segment.text)
+        scored = []
+        for id_ in candidates.tolist():
+            masked = self._masked[id_]
+            score = (
+                1.0
+                if masked == segment.text
+                else _jaccard(query_shingles, shingles(masked))
+            )
+            if score >= min_score:
+                scored.append((-score, id_))
+
+        # 값을 채울 수 없는 후보는 건너뜀 (유사도가 같으면 먼저 추가한 원문)
+        for negative_score, id_ in sorted(scored):
+            translation = self._fill(id_, segment.values)
+            if translation is not None:
+                return FuzzyMatch(self._sources[id_], translation, -negative_score)
+        return None
+
+    def _fill(self, id_: int, values: Tuple[str, ...]) -> Optional[str]:
+        """기존 번역문에 조회한 원문의 값을 채움
+
+        값이 모두 같으면 번역문을 그대로 쓴다. 값 위치를 확정하지 못한 번역문이나 값 개수가 다른
+        원문은 채우면 기존 값이 남으므로 None을 반환한다.
+        """
+        if values == self._values[id_]:
+            if self._fillable[id_]:
+                return fill_translation(self._translations[id_], values)
+            return self._translations[id_]
+        if not self._fillable[id_] or len(values) != len(self._values[id_]):
+            return None
+        return fill_translation(self._translations[id_], values)
+
+
+def iter_stored_translations(
+    engine: Engine, from_lang: str, to_lang: str, chunk_size: int = 10_000
+) -> Iterable[Tuple[str, str]]:
+    """문서 줄 번역(document_line_translations)과 번역 메모리(translation_memory)의 (원문, 번역문)"""
+    lines = DocumentLineTranslation.__table__
+    memory = TranslationMemoryEntry.__table__
+    queries = [
+        select(lines.c.text, lines.c.translation).where(
+            lines.c.from_lang == from_lang,
+            lines.c.to_lang == to_lang,
+            lines.c.text.is_not(None),
+            lines.c.translation.is_not(None),
+        ),
+        select(memory.c.text, memory.c.translation).where(
+            memory.c.from_lang == from_lang, memory.c.to_lang == to_lang
+        ),
+    ]
+    with engine.connect() as connection:
+        for query in queries:
+            result = connection.execution_options(yield_per=chunk_size).execute(query)
+            for text, translation in result:
+                yield text, translation
+
+
+def load_fuzzy_index(engine: Engine, from_lang: str, to_lang: str) -> FuzzyMemoryIndex:
+    """DB에 저장된 번역으로 색인을 만듦 (행은 chunk 단위로 읽음)"""
+    index = FuzzyMemoryIndex(from_lang, to_lang)
+    index.add_many(iter_stored_translations(engine, from_lang, to_lang))
+    return index
@@ -1,4 +1,18 @@
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import orjson
+
+
 class GoogleDocument:
+    """Document AI 응답
+
+    페이지는 처음 접근할 때 만들어지고(LazyPages), 페이지 안의 블록/문단/줄은
+    배열(LayoutElements)로 저장된다.
+    """
+
+    __slots__ = ("uri", "mime_type", "text", "pages")
+
     def __init__(self, uri, mime_type, text, pages):
         self.uri = uri
         self.mime_type = mime_type
@@ -7,16 +21,69 @@ class GoogleDocument:
 
     @classmethod
     def from_dict(cls, data):
-        pages = [GoogleDocumentPage.from_dict(page) for page in data["pages"]]
         return cls(
-            uri=data["uri"], mime_type=data["mimeType"], text=data["text"], pages=pages
+            uri=data.get("uri"),
+            mime_type=data.get("mimeType"),
+            text=data.get("text", ""),
+            pages=LazyPages(data.get("pages", [])),
         )
 
+    @classmethod
+    def from_json(cls, data: Union[bytes, str]) -> "GoogleDocument":
+        """JSON 문자열/바이트를 orjson으로 파싱"""
+        return cls.from_dict(orjson.loads(data))
+
+    @classmethod
+    def load(cls, path: str) -> "GoogleDocument":
+        with open(path, "rb") as f:
+            return cls.from_json(f.read())
+
+    def get_text(self, start: int, end: int) -> str:
+        return self.text[start:end]
+
     def __repr__(self):
         return f"Document(uri={self.uri}, mime_type={self.mime_type}, text={self.text})"
 
 
+class LazyPages(Sequence):
+    """페이지 dict를 처음 접근할 때 GoogleDocumentPage로 변환하고 원본 dict는 버림"""
+
+    __slots__ = ("_raw", "_pages")
+
+    def __init__(self, raw_pages: List[dict]):
+        self._raw: List[Optional[dict]] = list(raw_pages)
+        self._pages: List[Optional["GoogleDocumentPage"]] = [None] * len(raw_pages)
+
+    def __len__(self):
+        return len(self._pages)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        page = self._pages[index]
+        if page is None:
+            page = GoogleDocumentPage.from_dict(self._raw[index])
+            self._pages[index] = page
+            self._raw[index] = None
+        return page
+
+    @property
+    def materialized(self) -> int:
+        """지금까지 만들어진 페이지 수"""
+        return sum(page is not None for page in self._pages)
+
+
 class GoogleDocumentPage:
+    __slots__ = (
+        "page_number",
+        "transforms",
+        "dimension",
+        "layout",
+        "blocks",
+        "paragraphs",
+        "lines",
+    )
+
     def __init__(
         self, page_number, transforms, dimension, layout, blocks, paragraphs, lines
     ):
@@ -35,33 +102,172 @@ class GoogleDocumentPage:
         ]
         dimension = GoogleDocumentDimension.from_dict(data.get("dimension", {}))
         layout = GoogleDocumentLayout.from_dict(data.get("layout", {}))
-        blocks = [
-            GoogleDocumentBlock.from_dict(block) for block in data.get("blocks", [])
-        ]
-        paragraphs = [
-            GoogleDocumentParagraph.from_dict(paragraph)
-            for paragraph in data.get("paragraphs", [])
-        ]
-        lines = [GoogleDocumentLine.from_dict(line) for line in data.get("lines", [])]
 
         return cls(
             page_number=data.get("pageNumber", 0),
             transforms=transforms,
             dimension=dimension,
             layout=layout,
-            blocks=blocks,
-            paragraphs=paragraphs,
-            lines=lines,
+            blocks=LayoutElements(data.get("blocks", []), GoogleDocumentBlock),
+            paragraphs=LayoutElements(data.get("paragraphs", []), GoogleDocumentParagraph),
+            lines=LayoutElements(data.get("lines", []), GoogleDocumentLine),
         )
 
     def __repr__(self):
         return (
-            f"GoogleDocumentPage(page_number={self.page_number}, image={self.image}, "
+            f"GoogleDocumentPage(page_number={self.page_number}, "
             f"transforms={self.transforms}, dimension={self.dimension}, layout={self.layout})"
         )
 
 
+class LayoutElements(Sequence):
+    """페이지의 블록/문단/줄 목록을 배열로 저장
+
+    - normalized_vertices: (N, V, 2) float64, vertices: (N, V, 2) int32, 없는 좌표는 0
+    - normalized_counts, vertex_counts: (N,) 요소별 실제 꼭짓점 수
+    - segment_offsets: (M, 2) int64 [startIndex, endIndex], segment_bounds: (N + 1,)
+      요소 i의 textSegments는 segment_offsets[segment_bounds[i]:segment_bounds[i + 1]]
+    - text_offsets: (N, 2) 요소별 첫 번째 textSegment (없으면 [0, 0])
+
+    인덱스로 접근하면 기존과 같은 GoogleDocumentParagraph 등의 객체를 그때 만들어 반환한다.
+    """
+
+    __slots__ = (
+        "element_class",
+        "normalized_vertices",
+        "normalized_counts",
+        "vertices",
+        "vertex_counts",
+        "segment_offsets",
+        "segment_bounds",
+        "text_offsets",
+        "orientations",
+        "orientation_names",
+        "languages",
+        "contents",
+    )
+
+    def __init__(self, elements: List[dict], element_class):
+        self.element_class = element_class
+        layouts = [element.get("layout", {}) for element in elements]
+        polys = [layout.get("boundingPoly", {}) for layout in layouts]
+
+        self.normalized_vertices, self.normalized_counts = _vertex_array(
+            [poly.get("normalizedVertices", []) for poly in polys]
+        )
+        # vertices는 픽셀 정수 좌표
+        self.vertices, self.vertex_counts = _vertex_array(
+            [poly.get("vertices", []) for poly in polys], np.int32
+        )
+
+        anchors = [layout.get("textAnchor", {}) for layout in layouts]
+        segments = [anchor.get("textSegments", []) for anchor in anchors]
+        bounds = np.zeros(len(elements) + 1, dtype=np.int64)
+        np.cumsum([len(s) for s in segments], out=bounds[1:])
+        self.segment_bounds = bounds
+        self.segment_offsets = np.array(
+            [
+                (int(segment.get("startIndex", 0)), int(segment.get("endIndex", 0)))
+                for element_segments in segments
+                for segment in element_segments
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        self.text_offsets = np.zeros((len(elements), 2), dtype=np.int64)
+        has_segment = bounds[1:] > bounds[:-1]
+        self.text_offsets[has_segment] = self.segment_offsets[bounds[:-1][has_segment]]
+
+        # orientation 문자열은 종류가 몇 개뿐이므로 코드로 저장
+        self.orientation_names: List[Optional[str]] = []
+        codes: Dict[Optional[str], int] = {}
+        orientation_codes = []
+        for layout in layouts:
+            name = layout.get("orientation")
+            if name not in codes:
+                codes[name] = len(self.orientation_names)
+                self.orientation_names.append(name)
+            orientation_codes.append(codes[name])
+        self.orientations = np.array(orientation_codes, dtype=np.int8)
+
+        self.languages = [
+            tuple(
+                (lang["languageCode"], lang["confidence"])
+                for lang in element.get("detectedLanguages", [])
+            )
+            or None
+            for element in elements
+        ]
+        # textAnchor.content는 거의 없으므로 있는 요소만 저장
+        self.contents = {
+            i: anchor["content"] for i, anchor in enumerate(anchors) if "content" in anchor
+        }
+
+    def __len__(self):
+        return len(self.text_offsets)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.element_class(self.layout(index), self.detected_languages(index))
+
+    def layout(self, index: int) -> "GoogleDocumentLayout":
+        start, end = self.segment_bounds[index], self.segment_bounds[index + 1]
+        segments = [
+            GoogleDocumentTextSegment(int(s), int(e))
+            for s, e in self.segment_offsets[start:end].tolist()
+        ]
+        text_anchor = GoogleDocumentTextAnchor(
+            segments, self.contents.get(index, "no content")
+        )
+        bounding_poly = GoogleDocumentBoundingPoly(
+            _vertex_list(self.vertices[index], self.vertex_counts[index]),
+            _vertex_list(self.normalized_vertices[index], self.normalized_counts[index]),
+        )
+        orientation = self.orientation_names[self.orientations[index]]
+        return GoogleDocumentLayout(text_anchor, bounding_poly, orientation)
+
+    def detected_languages(self, index: int) -> List["GoogleDocumentDetectedLanguage"]:
+        return [
+            GoogleDocumentDetectedLanguage(code, confidence)
+            for code, confidence in self.languages[index] or ()
+        ]
+
+    def text(self, index: int, document_text: str) -> str:
+        """요소의 첫 번째 textSegment에 해당하는 문서 텍스트"""
+        start, end = self.text_offsets[index]
+        return document_text[start:end]
+
+    def texts(self, document_text: str) -> List[str]:
+        return [document_text[start:end] for start, end in self.text_offsets.tolist()]
+
+
+def _vertex_array(polys: List[List[dict]], dtype=np.float64):
+    counts = np.array([len(poly) for poly in polys], dtype=np.int32)
+    width = int(counts.max()) if len(counts) else 0
+    flat = [(vertex.get("x", 0), vertex.get("y", 0)) for poly in polys for vertex in poly]
+    if len(flat) == len(polys) * width:
+        # 모든 요소의 꼭짓점 수가 같은 경우 (보통 4개)
+        return np.array(flat, dtype=dtype).reshape(len(polys), width, 2), counts
+
+    array = np.zeros((len(polys), width, 2), dtype=dtype)
+    start = 0
+    for i, count in enumerate(counts.tolist()):
+        array[i, :count] = flat[start : start + count]
+        start += count
+    return array, counts
+
+
+def _vertex_list(array: np.ndarray, count: int) -> List["GoogleDocumentVertex"]:
+    return [GoogleDocumentVertex(x, y) for x, y in array[:count].tolist()]
+
+
 class GoogleDocumentMatrix:
+    __slots__ = ("rows", "cols", "type", "data")
+
     def __init__(self, rows, cols, type, data):
         self.rows = rows
         self.cols = cols
@@ -79,6 +285,8 @@ class GoogleDocumentMatrix:
 
 
 class GoogleDocumentDimension:
+    __slots__ = ("width", "height", "unit")
+
     def __init__(self, width, height, unit):
         self.width = width
         self.height = height
@@ -93,17 +301,19 @@ class GoogleDocumentDimension:
 
 
 class GoogleDocumentLayout:
+    __slots__ = ("textAnchor", "boundingPoly", "orientation")
+
     def __init__(self, textAnchor, boundingPoly, orientation):
-        self.textAnchor = GoogleDocumentTextAnchor.from_dict(textAnchor)
-        self.boundingPoly = GoogleDocumentBoundingPoly.from_dict(boundingPoly)
+        self.textAnchor = textAnchor
+        self.boundingPoly = boundingPoly
         self.orientation = orientation
 
     @classmethod
     def from_dict(cls, data):
         return cls(
-            textAnchor=data["textAnchor"],
-            boundingPoly=data["boundingPoly"],
-            orientation=data["orientation"],
+            textAnchor=GoogleDocumentTextAnchor.from_dict(data.get("textAnchor", {})),
+            boundingPoly=GoogleDocumentBoundingPoly.from_dict(data.get("boundingPoly", {})),
+            orientation=data.get("orientation"),
         )
 
     def __repr__(self):
@@ -111,16 +321,20 @@ class GoogleDocumentLayout:
 
 
 class GoogleDocumentTextAnchor:
+    __slots__ = ("textSegments", "content")
+
     def __init__(self, textSegments, content):
-        self.textSegments = [
-            GoogleDocumentTextSegment.from_dict(segment) for segment in textSegments
-        ]
+        self.textSegments = textSegments
         self.content = content
 
     @classmethod
     def from_dict(cls, data):
         return cls(
-            textSegments=data["textSegments"], content=data.get("content", "no content")
+            textSegments=[
+                GoogleDocumentTextSegment.from_dict(segment)
+                for segment in data.get("textSegments", [])
+            ],
+            content=data.get("content", "no content"),
         )
 
     def __repr__(self):
@@ -128,30 +342,36 @@ class GoogleDocumentTextAnchor:
 
 
 class GoogleDocumentTextSegment:
+    __slots__ = ("startIndex", "endIndex")
+
     def __init__(self, startIndex, endIndex):
         self.startIndex = startIndex
         self.endIndex = endIndex
 
     @classmethod
     def from_dict(cls, data):
-        return cls(startIndex=data.get("startIndex", 0), endIndex=data["endIndex"])
+        return cls(
+            startIndex=int(data.get("startIndex", 0)), endIndex=int(data["endIndex"])
+        )
 
     def __repr__(self):
         return f"GoogleDocumentTextSegment(startIndex={self.startIndex}, endIndex={self.endIndex})"
 
 
 class GoogleDocumentBoundingPoly:
+    __slots__ = ("vertices", "normalizedVerticies")
+
     def __init__(self, vertices, normalizedVerticies):
-        self.vertices = [GoogleDocumentVertex.from_dict(vertex) for vertex in vertices]
-        self.normalizedVerticies = [
-            GoogleDocumentVertex.from_dict(vertex) for vertex in normalizedVerticies
-        ]
+        self.vertices = vertices
+        self.normalizedVerticies = normalizedVerticies
 
     @classmethod
     def from_dict(cls, data):
         return cls(
-            vertices=data.get("vertices", []),
-            normalizedVerticies=data.get("normalizedVertices", []),
+            vertices=[GoogleDocumentVertex.from_dict(v) for v in data.get("vertices", [])],
+            normalizedVerticies=[
+                GoogleDocumentVertex.from_dict(v) for v in data.get("normalizedVertices", [])
+            ],
         )
 
     def __repr__(self):
@@ -159,6 +379,8 @@ class GoogleDocumentBoundingPoly:
 
 
 class GoogleDocumentVertex:
+    __slots__ = ("x", "y")
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -174,26 +396,9 @@ class GoogleDocumentVertex:
         return f"GoogleDocumentVertex(x={self.x}, y={self.y})"
 
 
-class GoogleDocumentBlock:
-    def __init__(self, layout, detectedLanguages):
-        self.layout = GoogleDocumentLayout.from_dict(layout)
-        self.detectedLanguages = [
-            GoogleDocumentDetectedLanguage.from_dict(lang) for lang in detectedLanguages
-        ]
-
-    @classmethod
-    def from_dict(cls, data):
-        detectedLanguages = data.get("detectedLanguages", [])
-        detectedLanguages = [
-            GoogleDocumentDetectedLanguage.from_dict(lang) for lang in detectedLanguages
-        ]
-        return cls(layout=data["layout"], detectedLanguages=detectedLanguages)
-
-    def __repr__(self):
-        return f"GoogleDocumentBlock(layout={self.layout}, detectedLanguages={self.detectedLanguages})"
-
-
 class GoogleDocumentDetectedLanguage:
+    __slots__ = ("languageCode", "confidence")
+
     def __init__(self, languageCode, confidence):
         self.languageCode = languageCode
         self.confidence = confidence
@@ -206,37 +411,36 @@ class GoogleDocumentDetectedLanguage:
         return f"GoogleDocumentDetectedLanguage(languageCode={self.languageCode}, confidence={self.confidence})"
 
 
-class GoogleDocumentParagraph:
+class _LayoutElement:
+    """블록/문단/줄 공통: layout과 detectedLanguages"""
+
+    __slots__ = ("layout", "detectedLanguages")
+
     def __init__(self, layout, detectedLanguages):
-        self.layout = GoogleDocumentLayout.from_dict(layout)
-        self.detectedLanguages = [
-            GoogleDocumentDetectedLanguage.from_dict(lang) for lang in detectedLanguages
-        ]
+        self.layout = layout
+        self.detectedLanguages = detectedLanguages
 
     @classmethod
     def from_dict(cls, data):
         return cls(
-            layout=data["layout"],
-            detectedLanguages=data.get("detectedLanguages", []),
+            layout=GoogleDocumentLayout.from_dict(data["layout"]),
+            detectedLanguages=[
+                GoogleDocumentDetectedLanguage.from_dict(lang)
+                for lang in data.get("detectedLanguages", [])
+            ],
         )
 
     def __repr__(self):
-        return f"GoogleDocumentParagraph(layout={self.layout}, detectedLanguages={self.detectedLanguages})"
+        return f"{type(self).__name__}(layout={self.layout}, detectedLanguages={self.detectedLanguages})"
 
 
-class GoogleDocumentLine:
-    def __init__(self, layout, detectedLanguages):
-        self.layout = GoogleDocumentLayout.from_dict(layout)
-        self.detectedLanguages = [
-            GoogleDocumentDetectedLanguage.from_dict(lang) for lang in detectedLanguages
-        ]
+class GoogleDocumentBlock(_LayoutElement):
+    __slots__ = ()
 
-    @classmethod
-    def from_dict(cls, data):
-        return cls(
-            layout=data["layout"],
-            detectedLanguages=data.get("detectedLanguages", []),
-        )
 
-    def __repr__(self):
-        return f"GoogleDocumentLine(layout={self.layout}, detectedLanguages={self.detectedLanguages})"
+class GoogleDocumentParagraph(_LayoutElement):
+    __slots__ = ()
+
+
+class GoogleDocumentLine(_LayoutElement):
+    __slots__ = ()
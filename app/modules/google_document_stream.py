@@ -0,0 +1,334 @@
+import io
+import re
+import struct
+import tempfile
+from typing import BinaryIO, Iterator, Optional, Tuple, Union
+
+import numpy as np
+import orjson
+
+from app.modules.google_document import GoogleDocumentPage
+
+
+CHUNK_SIZE = 1024 * 1024
+# 값의 끝을 찾을 때 처음 스캔하는 크기. 못 찾으면 chunk 크기까지 두 배씩 늘림
+MIN_WINDOW = 4096
+
+_NON_WS = re.compile(rb"[^ \t\r\n]")
+_SCALAR_END = re.compile(rb"[,}\] \t\r\n]")
+
+QUOTE, BACKSLASH = ord('"'), ord("\\")
+LBRACE, RBRACE, LBRACKET, RBRACKET = ord("{"), ord("}"), ord("["), ord("]")
+COMMA, COLON = ord(","), ord(":")
+
+# 바이트 -> 괄호 깊이 변화
+_BRACKET_DELTA = np.zeros(256, dtype=np.int8)
+_BRACKET_DELTA[[LBRACE, LBRACKET]] = 1
+_BRACKET_DELTA[[RBRACE, RBRACKET]] = -1
+
+
+class _ScanState:
+    """윈도우 경계를 넘어 이어지는 스캔 상태"""
+
+    __slots__ = ("in_string", "escaped", "depth")
+
+    def __init__(self, in_string: bool):
+        self.in_string = in_string
+        self.escaped = False  # 직전 바이트가 문자열 안의 이스케이프 백슬래시인지
+        self.depth = 0
+
+
+def _scan_window(buf: bytearray, start: int, end: int, state: _ScanState) -> Optional[int]:
+    """buf[start:end]에서 값이 끝나는 위치(끝 인덱스)를 찾음. 없으면 state를 갱신하고 None
+
+    바이트마다 파이썬 루프를 돌지 않도록 numpy로 한 번에 계산한다.
+    - 따옴표 앞의 연속된 백슬래시가 홀수 개면 이스케이프된 따옴표
+    - 실제 따옴표 개수의 누적 홀짝으로 각 바이트가 문자열 안인지 판단
+    - 문자열 밖의 괄호만 누적해서 깊이가 0이 되는 첫 닫는 괄호가 값의 끝
+    """
+    data = np.frombuffer(buf, dtype=np.uint8, count=end - start, offset=start)
+    quote = data == QUOTE
+    escapes = buf.find(b"\\", start, end) != -1 or state.escaped
+    if escapes:
+        index = np.arange(len(data), dtype=np.int32)
+        # p 이하에서 백슬래시가 아닌 마지막 위치 (-1이면 윈도우 시작부터 모두 백슬래시)
+        last_plain = np.maximum.accumulate(np.where(data == BACKSLASH, -1, index))
+        # p 바로 앞까지 이어진 백슬래시 개수 (윈도우 앞에서 넘어온 이스케이프 포함)
+        before = np.empty(len(data), dtype=np.int32)
+        before[0] = state.escaped
+        before[1:] = index[:-1] - last_plain[:-1] + ((last_plain[:-1] == -1) & state.escaped)
+        quote &= before % 2 == 0
+
+    if state.in_string and state.depth == 0:
+        # 문자열 값: 첫 실제 따옴표가 끝
+        closing = np.flatnonzero(quote)
+        if len(closing):
+            return start + int(closing[0]) + 1
+        inside = True
+    else:
+        # 바이트를 처리한 뒤 문자열 안인지 여부. 괄호는 따옴표가 아니므로 처리 전과 같음
+        inside = np.bitwise_xor.accumulate(quote.view(np.uint8)) ^ np.uint8(state.in_string)
+        delta = _BRACKET_DELTA[data]
+        delta[inside.view(bool)] = 0
+        depth = np.cumsum(delta, dtype=np.int32)
+        depth += state.depth
+        closing = np.flatnonzero((depth == 0) & (delta == -1))
+        if len(closing):
+            return start + int(closing[0]) + 1
+        state.depth = int(depth[-1])
+        inside = bool(inside[-1])
+
+    state.in_string = inside
+    if escapes:
+        trailing = len(data) - 1 - int(last_plain[-1])
+        if last_plain[-1] == -1:
+            trailing += state.escaped
+        state.escaped = inside and trailing % 2 == 1
+    return None
+
+
+class _JsonScanner:
+    """파일에서 chunk 단위로 읽으면서 JSON 값의 경계만 찾는 스캐너
+
+    값 전체를 파싱하지 않고 괄호 깊이와 문자열 경계만 추적한다. 건너뛰는 값은 읽은 만큼 버리고,
+    가져오는 값(capture)만 버퍼에 남겨서 orjson으로 파싱한다.
+    """
+
+    def __init__(self, f: BinaryIO, chunk_size: int = CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = bytearray()
+        self.pos = 0
+        self.base = 0  # buf[0]의 스트림 내 위치
+
+    @property
+    def offset(self) -> int:
+        """현재 위치 (스캐너를 만든 시점부터의 바이트 수)"""
+        return self.base + self.pos
+
+    def _fill(self, keep_from: int) -> int:
+        """chunk를 하나 더 읽음. keep_from 이전 바이트는 버릴 수 있음
+
+        Returns:
+            int: 버린 바이트 수 (호출자가 가진 버퍼 인덱스를 이만큼 당겨야 함)
+        """
+        dropped = 0
+        # 버릴 부분이 버퍼의 절반 이상일 때만 당겨서 복사 비용을 분할 상환
+        if keep_from > 0 and keep_from * 2 >= len(self.buf):
+            del self.buf[:keep_from]
+            self.base += keep_from
+            self.pos -= keep_from
+            dropped = keep_from
+        data = self.f.read(self.chunk_size)
+        if not data:
+            raise ValueError("JSON이 중간에 끝났습니다.")
+        self.buf += data
+        return dropped
+
+    def peek(self) -> int:
+        """공백을 건너뛰고 다음 바이트를 반환 (위치는 그 바이트)"""
+        while True:
+            m = _NON_WS.search(self.buf, self.pos)
+            if m is not None:
+                self.pos = m.start()
+                return self.buf[self.pos]
+            self.pos = len(self.buf)
+            self._fill(self.pos)
+
+    def expect(self, byte: int):
+        if self.peek() != byte:
+            raise ValueError(f"{chr(byte)!r}가 필요합니다. (offset {self.offset})")
+        self.pos += 1
+
+    def _value_end(self, capture: bool) -> Tuple[int, int]:
+        """self.pos에서 시작하는 값의 (시작, 끝) 인덱스. capture가 아니면 앞부분을 버리면서 진행"""
+        start = i = self.pos
+        first = self.buf[i]
+        if first not in (QUOTE, LBRACE, LBRACKET):
+            # 숫자, true, false, null
+            while True:
+                m = _SCALAR_END.search(self.buf, i)
+                if m is not None:
+                    return start, m.start()
+                i = len(self.buf)
+                dropped = self._fill(start if capture else i)
+                start, i = start - dropped, i - dropped
+
+        # 문자열이면 여는 따옴표 다음부터 문자열 안 상태로 시작
+        state = _ScanState(in_string=first == QUOTE)
+        if state.in_string:
+            i += 1
+        window = MIN_WINDOW
+        while True:
+            if i == len(self.buf):
+                dropped = self._fill(start if capture else i)
+                start, i = start - dropped, i - dropped
+            end = min(len(self.buf), i + window)
+            found = _scan_window(self.buf, i, end, state)
+            if found is not None:
+                return start, found
+            i = end
+            window = min(window * 2, self.chunk_size)
+
+    def read_raw(self) -> bytes:
+        """다음 값의 원본 바이트"""
+        self.peek()
+        start, end = self._value_end(capture=True)
+        self.pos = end
+        return bytes(self.buf[start:end])
+
+    def read_value(self):
+        return orjson.loads(self.read_raw())
+
+    def skip_value(self):
+        self.peek()
+        _, end = self._value_end(capture=False)
+        self.pos = end
+
+    def members(self) -> Iterator[str]:
+        """객체의 키를 차례로 반환. 호출자는 다음 키를 받기 전에 값을 읽거나 건너뛰어야 함"""
+        self.expect(LBRACE)
+        if self.peek() == RBRACE:
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(COLON)
+            yield key
+            byte = self.peek()
+            self.pos += 1
+            if byte == RBRACE:
+                return
+            if byte != COMMA:
+                raise ValueError(f"',' 또는 '}}'가 필요합니다. (offset {self.offset})")
+
+    def items(self) -> Iterator[bytes]:
+        """배열의 원소를 하나씩 원본 바이트로 반환"""
+        self.expect(LBRACKET)
+        if self.peek() == RBRACKET:
+            self.pos += 1
+            return
+        while True:
+            yield self.read_raw()
+            byte = self.peek()
+            self.pos += 1
+            if byte == RBRACKET:
+                return
+            if byte != COMMA:
+                raise ValueError(f"',' 또는 ']'가 필요합니다. (offset {self.offset})")
+
+
+class GoogleDocumentReader:
+    """Document AI JSON을 페이지 단위로 읽는 리더
+
+    문서 text와 현재 페이지만 메모리에 두고 GoogleDocumentPage를 하나씩 반환한다.
+    text가 pages 뒤에 있으면 파일처럼 seek 가능한 입력은 두 번 읽고,
+    그렇지 않은 스트림은 페이지 원본을 임시 파일에 모아 두었다가 다시 읽는다.
+
+    사용 예:
+        with GoogleDocumentReader(path) as reader:
+            for page in reader.pages():
+                texts = page.paragraphs.texts(reader.text)
+    """
+
+    def __init__(
+        self, source: Union[str, bytes, BinaryIO], chunk_size: int = CHUNK_SIZE
+    ):
+        self._owns_file = isinstance(source, str)
+        if isinstance(source, str):
+            self._file = open(source, "rb")
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            self._file = io.BytesIO(source)
+        else:
+            self._file = source
+        self.chunk_size = chunk_size
+        self.uri: Optional[str] = None
+        self.mime_type: Optional[str] = None
+        self.text: Optional[str] = None
+        self.page_count = 0
+
+    def _seekable(self) -> bool:
+        try:
+            return self._file.seekable()
+        except AttributeError:
+            return False
+
+    def pages(self) -> Iterator[GoogleDocumentPage]:
+        """페이지를 문서 순서대로 반환. 첫 페이지를 반환하기 전에 self.text가 채워짐"""
+        start = self._file.tell() if self._seekable() else 0
+        scanner = _JsonScanner(self._file, self.chunk_size)
+        pages_offset = None
+        spool = None
+
+        for key in scanner.members():
+            if key == "text":
+                self.text = scanner.read_value()
+            elif key == "uri":
+                self.uri = scanner.read_value()
+            elif key == "mimeType":
+                self.mime_type = scanner.read_value()
+            elif key == "pages":
+                if self.text is not None:
+                    yield from self._parse_pages(scanner.items())
+                elif self._seekable():
+                    # text를 찾은 뒤 다시 읽음
+                    scanner.peek()
+                    pages_offset = start + scanner.offset
+                    scanner.skip_value()
+                else:
+                    spool = self._spool_pages(scanner.items())
+            else:
+                scanner.skip_value()
+
+        if self.text is None:
+            self.text = ""
+        if pages_offset is not None:
+            self._file.seek(pages_offset)
+            yield from self._parse_pages(_JsonScanner(self._file, self.chunk_size).items())
+        elif spool is not None:
+            with spool:
+                yield from self._parse_pages(self._replay_pages(spool))
+
+    def _parse_pages(self, raw_pages: Iterator[bytes]) -> Iterator[GoogleDocumentPage]:
+        for raw in raw_pages:
+            page = GoogleDocumentPage.from_dict(orjson.loads(raw))
+            del raw
+            self.page_count += 1
+            yield page
+
+    @staticmethod
+    def _spool_pages(raw_pages: Iterator[bytes]):
+        """페이지 원본을 (길이, 내용) 형식으로 임시 파일에 씀"""
+        spool = tempfile.TemporaryFile()
+        for raw in raw_pages:
+            spool.write(struct.pack("<Q", len(raw)))
+            spool.write(raw)
+        spool.seek(0)
+        return spool
+
+    @staticmethod
+    def _replay_pages(spool) -> Iterator[bytes]:
+        while True:
+            header = spool.read(8)
+            if not header:
+                return
+            yield spool.read(struct.unpack("<Q", header)[0])
+
+    def close(self):
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_document_pages(
+    source: Union[str, bytes, BinaryIO], chunk_size: int = CHUNK_SIZE
+) -> Iterator[Tuple[str, GoogleDocumentPage]]:
+    """(문서 text, 페이지)를 페이지 순서대로 반환하는 제너레이터"""
+    with GoogleDocumentReader(source, chunk_size) as reader:
+        for page in reader.pages():
+            yield reader.text, page
@@ -1,20 +1,43 @@
 import base64
+from contextlib import closing
 from io import BytesIO
-import requests
 import fitz  # PyMuPDF
 import os
-from pdf2image import convert_from_path
+import weakref
+
+from app.modules.download import SpooledDownload, download_pdf_sync
+from app.modules.page_images import iter_page_images
+
+
+class SpooledDocument(fitz.Document):
+    """임시 파일로 받은 다운로드에서 연 문서. 닫을 때 임시 파일을 삭제
+
+    열린 파일을 삭제할 수 없는 플랫폼(Windows)에서도 동작하도록 파일은 문서를 닫은 뒤에 지운다.
+    닫지 않고 버린 문서는 GC될 때 지운다.
+    """
+
+    def __init__(self, download: SpooledDownload):
+        super().__init__(download.path)
+        self._remove_spool = weakref.finalize(self, download.cleanup)
+
+    def close(self):
+        super().close()
+        self._remove_spool()
 
 
 def load_pdf_all(
-    file_path: str = None, url: str = None, base64_pdf: str = None
+    file_path: str = None,
+    url: str = None,
+    base64_pdf: str = None,
+    pdf_bytes: bytes = None,
 ) -> fitz.Document:
-    """PDF 파일을 로드하는 함수 (파일 경로, URL, 또는 Base64 데이터를 지원)
+    """PDF 파일을 로드하는 함수 (파일 경로, URL, Base64 데이터 또는 바이트를 지원)
 
     Args:
         file_path (str, optional): PDF 파일 경로 (기본값 None)
         url (str, optional): PDF 파일 URL (기본값 None)
         base64_pdf (str, optional): Base64 인코딩된 PDF 문자열 (기본값 None)
+        pdf_bytes (bytes, optional): 이미 다운로드된 PDF 내용 (기본값 None)
 
     Returns:
         fitz.Document: 로드된 PDF 문서 객체
@@ -24,16 +47,27 @@ def load_pdf_all(
             # 파일 경로로 PDF 로드
             pdf_document = fitz.open(file_path)
         elif url:
-            # URL에서 PDF 로드
-            response = requests.get(url)
-            response.raise_for_status()  # HTTP 오류 발생 시 예외 처리
-            pdf_document = fitz.open(stream=BytesIO(response.content), filetype="pdf")
+            # URL에서 PDF 로드 (공유 세션으로 스트리밍, 크기 제한 초과 시 DownloadTooLarge)
+            download = download_pdf_sync(url)
+            source = download.finish()
+            if isinstance(source, bytes):
+                pdf_document = fitz.open(stream=source, filetype="pdf")
+            else:
+                # 큰 파일은 임시 파일로 받고, 문서를 닫을 때 삭제
+                try:
+                    pdf_document = SpooledDocument(download)
+                except BaseException:
+                    download.cleanup()
+                    raise
+        elif pdf_bytes:
+            # 메모리에 있는 PDF 로드 (복사 없이 사용)
+            pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
         elif base64_pdf:
             # Base64로 인코딩된 PDF를 로드
             pdf_data = base64.b64decode(base64_pdf)
             pdf_document = fitz.open(BytesIO(pdf_data))
         else:
-            raise ValueError("파일 경로, URL 또는 Base64 데이터를 제공해야 합니다.")
+            raise ValueError("파일 경로, URL, Base64 데이터 또는 바이트를 제공해야 합니다.")
 
         return pdf_document
     except Exception as e:
@@ -61,18 +95,20 @@ def load_pdf(file_path: str) -> fitz.Document:
 def pdf_to_images(pdf_path: str, output_folder: str) -> list:
     """
     PDF 파일을 페이지별로 PNG 이미지로 변환.
+    페이지는 렌더링 프로세스 풀에서 병렬로 렌더링. 파일 없이 OCR에 바로 넘기려면 iter_page_images를 사용.
     Args:
         pdf_path (str): 변환할 PDF 파일의 경로
         output_folder (str): 이미지를 저장할 폴더 경로
     Returns:
         list: 생성된 이미지 파일의 경로 리스트
     """
-    images = convert_from_path(pdf_path, fmt="png")
     image_paths = []
 
-    for i, image in enumerate(images):
-        image_path = os.path.join(output_folder, f"page_{i + 1}.png")
-        image.save(image_path, "PNG")
-        image_paths.append(image_path)
+    with closing(iter_page_images(pdf_path, fmt="png")) as pages:
+        for page_num, content in pages:
+            image_path = os.path.join(output_folder, f"page_{page_num + 1}.png")
+            with open(image_path, "wb") as f:
+                f.write(content)
+            image_paths.append(image_path)
 
     return image_paths
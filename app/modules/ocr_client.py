@@ -0,0 +1,274 @@
+import abc
+import hashlib
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from google.api_core.exceptions import GoogleAPICallError
+from google.cloud import vision
+
+from app.config import settings
+
+
+# 일시적인 오류로 보고 재시도하는 상태 코드 (HTTP, gRPC)
+RETRYABLE_HTTP_STATUS = {408, 429, 500, 502, 503, 504}
+RETRYABLE_GRPC_CODES = {4, 8, 10, 13, 14}  # DEADLINE_EXCEEDED, RESOURCE_EXHAUSTED, ABORTED, INTERNAL, UNAVAILABLE
+
+
+class OCRError(Exception):
+    """OCR 요청 실패. retryable이면 OCRExecutor가 backoff 후 다시 요청"""
+
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class OCRBackend(abc.ABC):
+    """OCR 서비스 인터페이스
+
+    detect_batch는 이미지 목록을 받아 같은 순서로 이미지별 결과를 반환한다.
+    결과는 감지된 텍스트, 또는 그 이미지만 실패한 경우 OCRError.
+    요청 전체가 실패하면 OCRError를 올린다.
+    한 번의 요청에 여러 이미지를 보낼 수 있는 서비스는 max_batch_size를 늘린다.
+    여러 스레드에서 동시에 호출된다.
+    """
+
+    max_batch_size = 1
+
+    @abc.abstractmethod
+    def detect_batch(self, contents: Sequence[bytes]) -> List[Union[str, OCRError]]:
+        ...
+
+
+class VisionOCRBackend(OCRBackend):
+    """Google Vision API batch_annotate_images (TEXT_DETECTION)"""
+
+    max_batch_size = 16  # 동기 batch_annotate_images 요청당 이미지 수 제한
+
+    def __init__(self, client=None):
+        self.client = client or vision.ImageAnnotatorClient()
+        self._features = [vision.Feature(type_=vision.Feature.Type.TEXT_DETECTION)]
+
+    def detect_batch(self, contents: Sequence[bytes]) -> List[Union[str, OCRError]]:
+        requests = [
+            vision.AnnotateImageRequest(image=vision.Image(content=content), features=self._features)
+            for content in contents
+        ]
+        try:
+            response = self.client.batch_annotate_images(requests=requests)
+        except GoogleAPICallError as e:
+            raise OCRError(f"API Error: {e}", retryable=e.code in RETRYABLE_HTTP_STATUS) from e
+
+        texts = []
+        for result in response.responses:
+            if result.error.message:
+                # 이미지 하나의 오류는 그 이미지만 실패로 돌려줌
+                texts.append(
+                    OCRError(
+                        f"API Error: {result.error.message}",
+                        retryable=result.error.code in RETRYABLE_GRPC_CODES,
+                    )
+                )
+                continue
+            # 첫 번째 항목이 전체 감지 텍스트
+            texts.append(result.text_annotations[0].description if result.text_annotations else "")
+        return texts
+
+
+class FakeOCRBackend(OCRBackend):
+    """네트워크 없이 이미지 내용으로 정해지는 텍스트를 반환하는 테스트용 백엔드
+
+    Args:
+        max_batch_size (int): 요청당 이미지 수
+        latency (float): 요청마다 기다리는 시간 (초)
+        fail_times (int): 처음 n번의 요청은 재시도 가능한 오류로 실패
+    """
+
+    def __init__(self, max_batch_size: int = 16, latency: float = 0.0, fail_times: int = 0):
+        self.max_batch_size = max_batch_size
+        self.latency = latency
+        self.fail_times = fail_times
+        self.calls: List[int] = []  # 요청별 이미지 수
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def text_for(content: bytes) -> str:
+        return f"text {hashlib.sha1(content).hexdigest()[:12]}"
+
+    def detect_batch(self, contents: Sequence[bytes]) -> List[Union[str, OCRError]]:
+        with self._lock:
+            self.calls.append(len(contents))
+            fail = len(self.calls) <= self.fail_times
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            if fail:
+                raise OCRError("일시적인 오류 (fake)", retryable=True)
+            return [self.text_for(content) for content in contents]
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class OCRPageResult(NamedTuple):
+    page_num: int
+    text: str
+    latency: float  # 페이지가 포함된 요청의 처리 시간 (재시도 포함, 초)
+    attempts: int  # 이 페이지를 요청한 횟수
+
+
+# 프로세스 전체 OCR 통계
+_lock = threading.Lock()
+_stats = {"pages": 0, "requests": 0, "retries": 0, "failures": 0, "latency_seconds": 0.0, "max_latency": 0.0}
+
+
+def get_ocr_stats() -> Dict[str, Union[int, float]]:
+    """OCR 통계 (pages, requests, retries, failures, latency_seconds, max_latency)"""
+    with _lock:
+        return dict(_stats)
+
+
+def reset_ocr_stats():
+    """통계를 비움 (테스트용)"""
+    with _lock:
+        for key in _stats:
+            _stats[key] = 0
+
+
+def _record(**counts):
+    with _lock:
+        for key, value in counts.items():
+            if key == "max_latency":
+                _stats[key] = max(_stats[key], value)
+            else:
+                _stats[key] += value
+
+
+class OCRExecutor:
+    """페이지 이미지를 묶어서 동시에 OCR 요청하고 결과를 입력 순서대로 반환
+
+    동시에 진행 중인 요청은 max_in_flight개로 제한되고, 재시도 가능한 오류는
+    retry_backoff * 2^n 초 (jitter 포함) 기다린 뒤 max_retries번까지 다시 요청한다.
+    묶음 중 일부 이미지만 실패하면 실패한 이미지만 다시 요청한다.
+
+    사용 예:
+        with closing(iter_page_images(pdf_path)) as pages, OCRExecutor(VisionOCRBackend(client)) as ocr:
+            for result in ocr.iter_results(pages):
+                print(result.page_num, result.text)
+    """
+
+    def __init__(
+        self,
+        backend: OCRBackend,
+        max_in_flight: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+    ):
+        self.backend = backend
+        self.max_in_flight = max(1, max_in_flight or settings.ocr_max_in_flight)
+        self.batch_size = max(1, min(batch_size or settings.ocr_batch_size, backend.max_batch_size))
+        self.max_retries = settings.ocr_max_retries if max_retries is None else max_retries
+        self.retry_backoff = settings.ocr_retry_backoff if retry_backoff is None else retry_backoff
+        self._pool = ThreadPoolExecutor(self.max_in_flight, thread_name_prefix="ocr")
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _request(self, contents: List[bytes]) -> Tuple[List[str], float, List[int]]:
+        """묶음을 요청하고, 재시도 가능한 오류가 난 이미지만 다시 요청
+
+        Returns:
+            Tuple[List[str], float, List[int]]: 이미지별 텍스트, 처리 시간, 이미지별 요청 횟수
+        """
+        started = time.perf_counter()
+        texts: List[Optional[str]] = [None] * len(contents)
+        attempts = [0] * len(contents)
+        pending = list(range(len(contents)))
+        requests = 0
+        while True:
+            requests += 1
+            for index in pending:
+                attempts[index] += 1
+            try:
+                results = self.backend.detect_batch([contents[index] for index in pending])
+            except OCRError as e:
+                results = [e] * len(pending)
+            if len(results) != len(pending):
+                _record(requests=requests, retries=requests - 1, failures=1)
+                raise OCRError(f"요청한 이미지 수({len(pending)})와 결과 수({len(results)})가 다릅니다.")
+
+            failed = []
+            for index, result in zip(pending, results):
+                if isinstance(result, OCRError):
+                    failed.append((index, result))
+                else:
+                    texts[index] = result
+            if not failed:
+                break
+            errors = [error for _, error in failed]
+            fatal = next((error for error in errors if not error.retryable), None)
+            if fatal is not None or requests > self.max_retries:
+                _record(requests=requests, retries=requests - 1, failures=1)
+                raise fatal or errors[0]
+            pending = [index for index, _ in failed]
+            time.sleep(self.retry_backoff * 2 ** (requests - 1) * random.uniform(0.5, 1.0))
+
+        latency = time.perf_counter() - started
+        _record(
+            pages=len(contents),
+            requests=requests,
+            retries=requests - 1,
+            latency_seconds=latency * len(contents),
+            max_latency=latency,
+        )
+        return texts, latency, attempts
+
+    def iter_results(self, pages: Iterable[Tuple[int, bytes]]) -> Iterator[OCRPageResult]:
+        """(페이지 번호, 이미지)를 받아 OCR 결과를 입력 순서대로 반환
+
+        입력을 batch_size개씩 묶어 요청하고, 응답을 기다리는 요청이 max_in_flight개가 되면
+        가장 오래된 요청의 결과를 내보낸 뒤 다음 요청을 보내므로 입력은 필요한 만큼만 읽는다.
+        """
+        pending = deque()
+        page_nums, contents = [], []
+        try:
+            for page_num, content in pages:
+                page_nums.append(page_num)
+                contents.append(content)
+                if len(contents) == self.batch_size:
+                    pending.append((page_nums, self._pool.submit(self._request, contents)))
+                    page_nums, contents = [], []
+                    while len(pending) >= self.max_in_flight:
+                        yield from self._drain(pending.popleft())
+            if contents:
+                pending.append((page_nums, self._pool.submit(self._request, contents)))
+            while pending:
+                yield from self._drain(pending.popleft())
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def detect(self, pages: Iterable[Tuple[int, bytes]]) -> List[OCRPageResult]:
+        """iter_results의 결과를 모두 모아서 반환"""
+        return list(self.iter_results(pages))
+
+    @staticmethod
+    def _drain(entry) -> Iterator[OCRPageResult]:
+        page_nums, future = entry
+        texts, latency, attempts = future.result()
+        for page_num, text, attempt in zip(page_nums, texts, attempts):
+            yield OCRPageResult(page_num, text, latency, attempt)
@@ -0,0 +1,328 @@
+import asyncio
+import os
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from app.config import settings
+from app.modules.google_document_stream import GoogleDocumentReader
+from app.modules.page_raster import DEFAULT_DPI, PageRasterCache, PageRasterizer
+from app.modules.parallel_render import Shard, count_pages, render_shard, stitch_shards, write_bytes
+from app.modules.pdf import open_source, render_plan_to_pdf
+from app.modules.render_plan import RenderPlan, RenderPlanBuilder, RenderStyle, style_from_properties
+from app.modules.render_pool import render_slot
+from app.modules.save_translated_pdf import export_pdf
+from app.modules.stage_pipeline import Stage, StagePipeline
+from app.modules.style_extraction import BoxStyle, extract_page_styles
+from app.utils.dimension import bounding_polys_to_rects
+
+
+class OCRPageTask(NamedTuple):
+    """OCR 페이지에서 번역문이 있는 문단만 뽑은 작업 (pickle 가능)"""
+
+    page_number: int  # 1부터 시작
+    dimension: Tuple[float, float]  # OCR 좌표계의 페이지 크기 (픽셀)
+    vertices: np.ndarray  # (N, V, 2) 문단의 정규화 좌표
+    counts: np.ndarray  # (N,) 문단별 꼭짓점 수
+    texts: List[str]  # 문단별 번역문
+
+
+class StyledPage(NamedTuple):
+    page_number: int
+    boxes: List[List[float]]  # PDF 포인트 [x0, y0, x1, y1]
+    texts: List[str]
+    styles: List[BoxStyle]
+
+
+def style_key(style: BoxStyle) -> tuple:
+    """렌더링 결과가 같은 스타일끼리 같은 키 (추정 방법과 원본 폰트 이름은 무시)"""
+    return (style["fontSize"], tuple(style["color"]), tuple(style["bgColor"]), style["isBold"])
+
+
+def render_style(style: BoxStyle) -> RenderStyle:
+    """추정한 스타일을 렌더러 스타일로 변환
+
+    원본 폰트 이름은 번역문 폰트(font_registry)와 관계가 없으므로 굵기만 사용한다.
+    """
+    return style_from_properties(
+        {
+            "fontSize": style["fontSize"],
+            "color": style["color"],
+            "bgColor": style["bgColor"],
+            "isBold": style["isBold"],
+        }
+    )
+
+
+def select_translated(texts: Sequence[str], count: int) -> List[int]:
+    """번역문이 있는 문단 인덱스 (문단 수보다 많은 번역문은 무시)"""
+    return [i for i, text in enumerate(texts[:count]) if text and text.strip()]
+
+
+def iter_ocr_page_tasks(
+    ocr_json: bytes,
+    translations: Sequence[Sequence[str]],
+    page_number_limit: Optional[int] = None,
+) -> Iterator[OCRPageTask]:
+    """OCR JSON을 페이지 단위로 읽으면서 번역문이 있는 페이지의 작업을 반환
+
+    OCR 문단 좌표는 배열로 그대로 넘기고, PDF 포인트 변환은 원본 PDF를 연 쪽에서 한다.
+    """
+    with GoogleDocumentReader(ocr_json) as reader:
+        for index, ocr_page in enumerate(reader.pages()):
+            page_number = index + 1
+            if index >= len(translations) or (
+                page_number_limit is not None and page_number > page_number_limit
+            ):
+                break
+            paragraphs = ocr_page.paragraphs
+            selected = select_translated(translations[index], len(paragraphs))
+            if not selected:
+                continue
+            yield OCRPageTask(
+                page_number,
+                (ocr_page.dimension.width, ocr_page.dimension.height),
+                paragraphs.normalized_vertices[selected],
+                paragraphs.normalized_counts[selected],
+                [translations[index][i].replace("\n", "") for i in selected],
+            )
+
+
+def style_ocr_page(
+    rasterizer: PageRasterizer, task: OCRPageTask, use_text_layer: bool = True
+) -> StyledPage:
+    """작업의 문단 사각형(get_rect_from_paragraph와 같은 계산)과 스타일을 페이지 단위로 계산"""
+    width, height = task.dimension
+    page_rect = rasterizer.page_rect(task.page_number - 1)
+    rects = bounding_polys_to_rects(
+        task.vertices, width, height, scale=page_rect.width / width, counts=task.counts
+    )
+    boxes = np.trunc(rects).astype(np.int64).tolist()
+    styles = extract_page_styles(rasterizer, task.page_number, boxes, use_text_layer)
+    return StyledPage(task.page_number, boxes, task.texts, styles)
+
+
+def style_ocr_pages(
+    source: Union[bytes, str],
+    tasks: Sequence[OCRPageTask],
+    use_text_layer: bool = True,
+    dpi: int = DEFAULT_DPI,
+) -> List[StyledPage]:
+    """여러 페이지의 스타일을 추정. 프로세스 풀에서 실행되는 작업 단위
+
+    원본에 없는 페이지의 작업은 무시한다.
+    """
+    with PageRasterizer(source, cache=PageRasterCache(0), dpi=dpi) as rasterizer:
+        page_count = len(rasterizer.pdf)
+        return [
+            style_ocr_page(rasterizer, task, use_text_layer)
+            for task in tasks
+            if task.page_number <= page_count
+        ]
+
+
+def add_styled_pages(builder: RenderPlanBuilder, pages: Sequence[StyledPage]):
+    for page in pages:
+        for box, text, style in zip(page.boxes, page.texts, page.styles):
+            style_id = builder.intern_style(style_key(style), render_style(style))
+            builder.add(page.page_number, box, text, style_id)
+
+
+def build_ocr_render_plan(
+    source: Union[bytes, str],
+    ocr_json: bytes,
+    translations: Sequence[Sequence[str]],
+    page_number_limit: Optional[int] = None,
+    use_text_layer: bool = True,
+    dpi: int = DEFAULT_DPI,
+) -> RenderPlan:
+    """Document AI 결과와 번역문으로 렌더링 계획을 만듦
+
+    페이지마다 문단 텍스트 위치(사각형)를 한 번에 계산하고, 번역문이 있는 문단의 스타일을
+    extract_page_styles로 한 번에 추정한다 (래스터가 필요하면 페이지를 한 번만 래스터화).
+    OCR JSON은 페이지 단위로 읽으므로 현재 페이지만 메모리에 둔다.
+
+    Args:
+        source (Union[bytes, str]): 원본 PDF 바이트 또는 파일 경로
+        ocr_json (bytes): Document AI Document JSON
+        translations (Sequence[Sequence[str]]): 페이지별, 문단별 번역문 (OCR 문단 순서)
+        page_number_limit (int, optional): 이 페이지 번호보다 큰 페이지는 제외
+        use_text_layer (bool): 텍스트 레이어에서 스타일을 먼저 찾을지 여부
+        dpi (int): 스타일 추정용 래스터 해상도
+
+    Returns:
+        RenderPlan: 페이지별 렌더링 계획
+    """
+    builder = RenderPlanBuilder()
+    # 스타일은 번역문을 그리기 전의 원본에서 추정. 페이지 이미지는 이 요청에서만 사용
+    with PageRasterizer(source, cache=PageRasterCache(0), dpi=dpi) as rasterizer:
+        page_count = len(rasterizer.pdf)
+        for task in iter_ocr_page_tasks(ocr_json, translations, page_number_limit):
+            if task.page_number > page_count:
+                break
+            add_styled_pages(builder, [style_ocr_page(rasterizer, task, use_text_layer)])
+    return builder.build()
+
+
+def render_ocr_pdf(
+    source: Union[bytes, str],
+    ocr_json: bytes,
+    translations: Sequence[Sequence[str]],
+    page_number_limit: Optional[int] = None,
+    spill_path: Optional[str] = None,
+    spill_threshold: Optional[int] = None,
+    use_text_layer: bool = True,
+) -> Union[bytes, str]:
+    """OCR 결과와 번역문으로 원본 PDF에 번역문을 그리고 결과 PDF를 반환
+
+    렌더링 프로세스 풀에서 실행되는 작업 단위 (render_pdf의 OCR 버전)
+    """
+    plan = build_ocr_render_plan(
+        source, ocr_json, translations, page_number_limit, use_text_layer
+    )
+
+    pdf = open_source(source)
+    if pdf is None:
+        raise ValueError("PDF를 열 수 없습니다.")
+    render_plan_to_pdf(pdf, plan)
+    return export_pdf(pdf, spill_path, spill_threshold)
+
+
+class OCRBatch(NamedTuple):
+    """파이프라인에서 한 번에 처리하는 연속된 페이지 구간"""
+
+    first_page: int
+    last_page: int
+    tasks: List[OCRPageTask]
+
+
+async def iter_ocr_batches(
+    ocr_json: bytes,
+    translations: Sequence[Sequence[str]],
+    page_number_limit: Optional[int],
+    batch_pages: int,
+) -> AsyncIterator[OCRBatch]:
+    """OCR JSON을 스레드에서 파싱하면서 batch_pages 페이지 구간 단위로 작업을 묶어서 반환
+
+    render_shard의 구간과 같도록 구간은 페이지 번호 기준으로 고정한다 (1-10, 11-20, ...).
+    """
+    batch_pages = max(1, batch_pages)
+    tasks = iter_ocr_page_tasks(ocr_json, translations, page_number_limit)
+    batch: List[OCRPageTask] = []
+    while True:
+        task = await asyncio.to_thread(next, tasks, None)
+        if batch and (task is None or _batch_index(task, batch_pages) != _batch_index(batch[0], batch_pages)):
+            first = _batch_index(batch[0], batch_pages) * batch_pages + 1
+            yield OCRBatch(first, first + batch_pages - 1, batch)
+            batch = []
+        if task is None:
+            return
+        batch.append(task)
+
+
+def _batch_index(task: OCRPageTask, batch_pages: int) -> int:
+    return (task.page_number - 1) // batch_pages
+
+
+async def render_ocr_pdf_pipelined(
+    source: Awaitable[Union[bytes, str]],
+    ocr_json: bytes,
+    translations: Sequence[Sequence[str]],
+    page_number_limit: Optional[int],
+    work_dir: str,
+    spill_path: Optional[str] = None,
+    spill_threshold: Optional[int] = None,
+    use_text_layer: bool = True,
+) -> Union[bytes, str]:
+    """render_ocr_pdf를 페이지 구간 단위 단계 파이프라인으로 실행
+
+    - parse: OCR JSON 파싱 (스레드). 원본 다운로드와 동시에 시작
+    - style: 구간별 사각형, 스타일 추정 (프로세스 풀)
+    - render: 구간별 렌더링 계획을 만들어 shard PDF로 렌더링 (프로세스 풀)
+    - save: 모든 shard와 원본의 나머지 페이지를 이어 붙임
+
+    구간 N을 렌더링하는 동안 구간 N+1의 스타일을 추정한다.
+
+    Args:
+        source (Awaitable): 원본 PDF(바이트 또는 경로)를 돌려주는 다운로드 작업
+        work_dir (str): 원본 사본과 shard 파일을 둘 디렉토리
+    """
+    source_path: Optional[str] = None
+    page_count = 0
+    source_lock = asyncio.Lock()
+
+    async def ready_source() -> str:
+        # 첫 구간이 스타일 단계에 들어올 때 다운로드를 기다림
+        nonlocal source_path, page_count
+        async with source_lock:
+            if source_path is None:
+                data = await source
+                path = data
+                if not isinstance(data, str):
+                    path = os.path.join(work_dir, "source.pdf")
+                    await asyncio.to_thread(write_bytes, path, data)
+                page_count = await asyncio.to_thread(count_pages, path)
+                source_path = path
+        return source_path
+
+    async with render_slot() as executor:
+        loop = asyncio.get_running_loop()
+
+        async def style(batch: OCRBatch) -> Tuple[OCRBatch, List[StyledPage]]:
+            path = await ready_source()
+            pages = await loop.run_in_executor(
+                executor, style_ocr_pages, path, batch.tasks, use_text_layer
+            )
+            return batch, pages
+
+        async def render(styled: Tuple[OCRBatch, List[StyledPage]]) -> Optional[Shard]:
+            batch, pages = styled
+            if not pages:
+                return None
+            builder = RenderPlanBuilder()
+            add_styled_pages(builder, pages)
+            last_page = min(batch.last_page, page_count)
+            shard_path = os.path.join(work_dir, f"shard_{batch.first_page:05d}.pdf")
+            await loop.run_in_executor(
+                executor,
+                render_shard,
+                source_path,
+                builder.build(),
+                batch.first_page,
+                last_page,
+                shard_path,
+            )
+            return batch.first_page, last_page, shard_path
+
+        pipeline = StagePipeline(
+            [
+                Stage("style", style, settings.pipeline_style_concurrency),
+                Stage("render", render, settings.pipeline_render_concurrency),
+            ],
+            queue_size=settings.pipeline_queue_size,
+        )
+        shards = await pipeline.run(
+            iter_ocr_batches(
+                ocr_json, translations, page_number_limit, settings.pipeline_batch_pages
+            )
+        )
+
+        path = await ready_source()
+        return await loop.run_in_executor(
+            executor,
+            stitch_shards,
+            path,
+            [shard for shard in shards if shard is not None],
+            spill_path,
+            spill_threshold,
+        )
@@ -0,0 +1,220 @@
+import json
+import unicodedata
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import fitz  # PyMuPDF
+
+from app.modules.pdf import Paragraph
+from app.modules.text_layer_style import (
+    DEFAULT_BACKGROUND,
+    aggregate_spans,
+    vector_background,
+)
+
+
+# 페이지 처리 방법
+TEXT_LAYER = "text_layer"  # 텍스트 레이어만 사용 (OCR, 래스터화 없음)
+OCR = "ocr"  # 페이지 전체를 OCR
+HYBRID = "hybrid"  # 텍스트 레이어 + 텍스트가 없는 큰 이미지 영역만 OCR
+
+# 유효한 글자(매핑되지 않은 글리프 U+FFFD, 제어 문자, 사용자 정의 영역 제외)의 최소 비율
+MIN_GLYPH_VALIDITY = 0.9
+# 텍스트 없는 이미지가 페이지의 이 비율 이상을 덮고 텍스트가 거의 없으면 스캔 페이지
+# (이미지 위 텍스트 면적이 이미지의 MIN_TEXT_COVERAGE 미만이면 텍스트 없는 이미지)
+SCANNED_IMAGE_COVERAGE = 0.6
+MIN_TEXT_COVERAGE = 0.02
+# 텍스트 없는 이미지가 이 비율 이상이면 그 영역만 OCR (로고 등 작은 이미지는 무시)
+HYBRID_IMAGE_COVERAGE = 0.1
+MIN_OCR_REGION_RATIO = 0.02
+
+_INVALID_CATEGORIES = {"Cc", "Cf", "Co", "Cn", "Cs"}
+_TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+
+class PageSignals(NamedTuple):
+    word_count: int
+    text_coverage: float  # 단어 박스 면적 / 페이지 면적
+    image_coverage: float  # 텍스트가 없는 이미지 면적 / 페이지 면적
+    glyph_validity: float  # 유효한 글자 비율
+
+
+class PageClassification(NamedTuple):
+    page_number: int  # 1부터 시작
+    kind: str  # TEXT_LAYER, OCR, HYBRID
+    signals: PageSignals
+    ocr_regions: List[List[float]]  # OCR이 필요한 영역 [x0, y0, x1, y1] (PDF 포인트)
+    paragraphs: List[Paragraph]  # 텍스트 레이어 문단 (translatedText는 빈 문자열)
+
+
+def glyph_validity(text: str) -> float:
+    """공백을 제외한 글자 중 유효한 글자의 비율 (글자가 없으면 0)"""
+    total = invalid = 0
+    for char in text:
+        if char.isspace():
+            continue
+        total += 1
+        if char == "\ufffd" or unicodedata.category(char) in _INVALID_CATEGORIES:
+            invalid += 1
+    return (total - invalid) / total if total else 0.0
+
+
+def _clipped_area(rect: fitz.Rect, page_rect: fitz.Rect) -> float:
+    return abs(rect & page_rect)
+
+
+def page_signals(page: fitz.Page, words: Sequence[tuple]) -> Tuple[PageSignals, List[fitz.Rect]]:
+    """분류 신호와 텍스트가 없는 이미지 영역 목록
+
+    Args:
+        page (fitz.Page): PDF 페이지
+        words (Sequence[tuple]): page.get_text("words") 결과
+    """
+    page_rect = page.rect
+    page_area = abs(page_rect) or 1.0
+    word_rects = [fitz.Rect(word[:4]) for word in words]
+    text_coverage = sum(_clipped_area(rect, page_rect) for rect in word_rects) / page_area
+
+    # 검색 가능한 스캔 PDF처럼 이미지 위에 텍스트 레이어가 충분히 있으면 그 이미지는 OCR할 필요가 없음
+    # (페이지 번호, 스탬프 정도만 있으면 텍스트 없는 이미지로 봄)
+    centers = [(rect.tl + rect.br) / 2 for rect in word_rects]
+    textless_images = []
+    for info in page.get_image_info():
+        rect = fitz.Rect(info["bbox"]) & page_rect
+        if rect.is_empty:
+            continue
+        covered = sum(
+            abs(word_rect) for word_rect, center in zip(word_rects, centers) if rect.contains(center)
+        )
+        if covered < abs(rect) * MIN_TEXT_COVERAGE:
+            textless_images.append(rect)
+    image_coverage = min(1.0, sum(abs(rect) for rect in textless_images) / page_area)
+
+    signals = PageSignals(
+        word_count=len(words),
+        text_coverage=min(1.0, text_coverage),
+        image_coverage=image_coverage,
+        glyph_validity=glyph_validity("".join(word[4] for word in words)),
+    )
+    return signals, textless_images
+
+
+def decide_page_kind(signals: PageSignals) -> str:
+    """신호로 페이지 처리 방법을 결정"""
+    if signals.word_count == 0 or signals.glyph_validity < MIN_GLYPH_VALIDITY:
+        # 텍스트 레이어가 없거나 글리프가 유니코드로 매핑되지 않아 쓸 수 없음
+        return OCR
+    if (
+        signals.image_coverage >= SCANNED_IMAGE_COVERAGE
+        and signals.text_coverage < MIN_TEXT_COVERAGE
+    ):
+        # 스캔 이미지 위에 페이지 번호, 스탬프 정도만 텍스트로 있음
+        return OCR
+    if signals.image_coverage >= HYBRID_IMAGE_COVERAGE:
+        return HYBRID
+    return TEXT_LAYER
+
+
+def text_layer_paragraphs(page: fitz.Page, page_number: int) -> List[Paragraph]:
+    """텍스트 레이어의 블록을 /process_pdf_v2 문단 형식으로 변환
+
+    style은 블록 안 스팬의 대표 스타일(fontSize, color, font, isBold)과 도형에서 찾은 배경색.
+    """
+    drawings = None
+    paragraphs = []
+    for block in page.get_text("dict", flags=_TEXT_FLAGS)["blocks"]:
+        lines = [
+            [span for span in line["spans"] if span["text"].strip()]
+            for line in block.get("lines", [])
+        ]
+        spans = [span for line in lines for span in line]
+        if not spans:
+            continue
+        if drawings is None:
+            drawings = page.get_drawings()
+        rect = fitz.Rect(block["bbox"])
+        style = aggregate_spans(spans)
+        style["bgColor"] = vector_background(drawings, rect) or DEFAULT_BACKGROUND
+        text = " ".join(
+            " ".join(span["text"].strip() for span in line) for line in lines if line
+        )
+        paragraphs.append(
+            {
+                "pageNum": page_number,
+                "boundingBox": [str(round(v, 2)) for v in rect],
+                "originalText": text,
+                "translatedText": "",
+                "style": json.dumps(style),
+            }
+        )
+    return paragraphs
+
+
+def classify_page(page: fitz.Page, page_number: int) -> PageClassification:
+    """페이지 하나를 분류하고, 텍스트 레이어를 쓸 수 있으면 문단도 함께 추출"""
+    words = page.get_text("words", flags=_TEXT_FLAGS)
+    signals, textless_images = page_signals(page, words)
+    kind = decide_page_kind(signals)
+
+    if kind == OCR:
+        return PageClassification(page_number, kind, signals, [list(page.rect)], [])
+
+    page_area = abs(page.rect) or 1.0
+    ocr_regions = []
+    if kind == HYBRID:
+        ocr_regions = [
+            list(rect) for rect in textless_images if abs(rect) / page_area >= MIN_OCR_REGION_RATIO
+        ]
+        if not ocr_regions:
+            # 작은 이미지만 여러 개 있는 페이지
+            kind = TEXT_LAYER
+    return PageClassification(
+        page_number, kind, signals, ocr_regions, text_layer_paragraphs(page, page_number)
+    )
+
+
+def iter_page_classifications(
+    source: Union[bytes, str], page_number_limit: Optional[int] = None
+) -> Iterator[PageClassification]:
+    """문서의 페이지를 순서대로 분류
+
+    Args:
+        source (Union[bytes, str]): PDF 바이트 또는 파일 경로
+        page_number_limit (int, optional): 이 페이지 번호까지만 분류
+    """
+    if isinstance(source, str):
+        pdf = fitz.open(source)
+    else:
+        pdf = fitz.open(stream=source, filetype="pdf")
+    with pdf:
+        count = pdf.page_count
+        if page_number_limit is not None:
+            count = min(count, page_number_limit)
+        for index in range(count):
+            yield classify_page(pdf[index], index + 1)
+
+
+def classify_pages(
+    source: Union[bytes, str], page_number_limit: Optional[int] = None
+) -> Dict[str, list]:
+    """문서 전체를 분류한 결과 (프로세스 풀에서 실행되는 작업 단위)
+
+    Returns:
+        dict:
+            pages: 페이지별 pageNum, kind, signals, ocrRegions
+            paragraphs: 텍스트 레이어 문단 (text_layer, hybrid 페이지)
+            ocrPages: OCR이 필요한 페이지 번호 (ocr, hybrid 페이지)
+    """
+    pages, paragraphs, ocr_pages = [], [], []
+    for result in iter_page_classifications(source, page_number_limit):
+        pages.append(
+            {
+                "pageNum": result.page_number,
+                "kind": result.kind,
+                "signals": result.signals._asdict(),
+                "ocrRegions": result.ocr_regions,
+            }
+        )
+        paragraphs.extend(result.paragraphs)
+        if result.ocr_regions:
+            ocr_pages.append(result.page_number)
+    return {"pages": pages, "paragraphs": paragraphs, "ocrPages": ocr_pages}
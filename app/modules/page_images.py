@@ -0,0 +1,172 @@
+import io
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+from app.config import settings
+from app.modules.render_pool import render_slot_sync
+
+
+IMAGE_FORMATS = ("png", "jpeg", "webp")
+
+
+def encode_pixmap(pix: fitz.Pixmap, fmt: str = "png", quality: int = 85) -> bytes:
+    """픽스맵을 이미지 파일 바이트로 인코딩
+
+    PNG, JPEG는 MuPDF로, WebP는 MuPDF가 지원하지 않아 PIL로 인코딩한다.
+
+    Args:
+        pix (fitz.Pixmap): RGB 또는 Gray 픽스맵 (alpha 없음)
+        fmt (str): "png", "jpeg", "webp"
+        quality (int): JPEG, WebP 품질 (1-100). PNG에는 사용하지 않음
+
+    Returns:
+        bytes: 인코딩된 이미지
+    """
+    if fmt == "png":
+        return pix.tobytes("png")
+    if fmt == "jpeg":
+        return pix.tobytes("jpeg", jpg_quality=quality)
+    if fmt == "webp":
+        mode = "L" if pix.n == 1 else "RGB"
+        image = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+        buffer = io.BytesIO()
+        image.save(buffer, "WEBP", quality=quality)
+        return buffer.getvalue()
+    raise ValueError(f"지원하지 않는 이미지 형식입니다: {fmt} ({', '.join(IMAGE_FORMATS)})")
+
+
+def encode_page_images(
+    source: Union[bytes, str],
+    page_nums: Sequence[int],
+    dpi: int = 200,
+    fmt: str = "png",
+    quality: int = 85,
+    grayscale: bool = False,
+) -> List[bytes]:
+    """문서를 한 번 열어서 여러 페이지를 인코딩된 이미지로 렌더링
+
+    스레드 또는 프로세스 풀에서 실행되는 작업 단위.
+
+    Args:
+        source (Union[bytes, str]): PDF 바이트 또는 파일 경로
+        page_nums (Sequence[int]): 페이지 번호 목록 (0부터 시작)
+
+    Returns:
+        List[bytes]: page_nums 순서대로 인코딩된 페이지 이미지
+    """
+    colorspace = fitz.csGRAY if grayscale else fitz.csRGB
+    if isinstance(source, str):
+        pdf = fitz.open(source)
+    else:
+        pdf = fitz.open(stream=source, filetype="pdf")
+    with pdf:
+        return [
+            encode_pixmap(
+                pdf[page_num].get_pixmap(dpi=dpi, colorspace=colorspace, alpha=False),
+                fmt,
+                quality,
+            )
+            for page_num in page_nums
+        ]
+
+
+def _page_count(source: Union[bytes, str]) -> int:
+    if isinstance(source, str):
+        pdf = fitz.open(source)
+    else:
+        pdf = fitz.open(stream=source, filetype="pdf")
+    with pdf:
+        return pdf.page_count
+
+
+def iter_page_images(
+    source: Union[bytes, str],
+    pages: Optional[Sequence[int]] = None,
+    dpi: Optional[int] = None,
+    fmt: Optional[str] = None,
+    quality: Optional[int] = None,
+    grayscale: bool = False,
+    executor: Optional[Executor] = None,
+    pages_per_task: Optional[int] = None,
+    max_pending: Optional[int] = None,
+) -> Iterator[Tuple[int, bytes]]:
+    """페이지를 풀에서 병렬로 렌더링하고 (페이지 번호, 이미지 바이트)를 페이지 순서대로 반환
+
+    파일을 쓰지 않고 메모리에서 인코딩하며, 동시에 제출하는 작업을 max_pending개로 제한하므로
+    메모리에는 max_pending * pages_per_task 페이지 정도만 올라간다.
+    공유 렌더링 풀을 쓰면 끝날 때까지 대기열 한 자리를 차지하므로, 중간에 그만 읽을 때는
+    contextlib.closing 등으로 반드시 닫는다.
+
+    Args:
+        source (Union[bytes, str]): PDF 바이트 또는 파일 경로
+        pages (Sequence[int], optional): 렌더링할 페이지 번호 (0부터 시작, 기본값: 전체)
+        dpi (int, optional): 해상도 (기본값: settings.ocr_image_dpi)
+        fmt (str, optional): "png", "jpeg", "webp" (기본값: settings.ocr_image_format)
+        quality (int, optional): JPEG, WebP 품질 (기본값: settings.ocr_image_quality)
+        grayscale (bool): 회색조로 렌더링 (OCR에는 충분하고 이미지가 작음)
+        executor (Executor, optional): 작업을 실행할 풀
+            (기본값: 렌더링 프로세스 풀, 끝날 때까지 렌더링 대기열 한 자리를 차지)
+        pages_per_task (int, optional): 작업 하나가 렌더링할 페이지 수, 문서 여는 비용을 나눔
+            (기본값: settings.ocr_raster_pages_per_task)
+        max_pending (int, optional): 동시에 제출할 작업 수 (기본값: settings.ocr_raster_max_pending)
+
+    Yields:
+        Tuple[int, bytes]: (페이지 번호(0부터 시작), 인코딩된 이미지)
+
+    Raises:
+        RenderQueueFull: executor 없이 호출했는데 렌더링 대기열이 가득 찬 경우
+    """
+    dpi = dpi or settings.ocr_image_dpi
+    fmt = (fmt or settings.ocr_image_format).lower()
+    quality = quality or settings.ocr_image_quality
+    if fmt == "jpg":
+        fmt = "jpeg"
+    if fmt not in IMAGE_FORMATS:
+        raise ValueError(f"지원하지 않는 이미지 형식입니다: {fmt} ({', '.join(IMAGE_FORMATS)})")
+    if pages is None:
+        pages = range(_page_count(source))
+    pages = list(pages)
+    pages_per_task = max(1, pages_per_task or settings.ocr_raster_pages_per_task)
+    max_pending = max(1, max_pending or settings.ocr_raster_max_pending)
+    # 공유 렌더링 풀을 쓰면 다른 요청과 같은 대기열 제한을 받음
+    slot = render_slot_sync() if executor is None else nullcontext(executor)
+    with slot as executor:
+        spool_path = None
+        if isinstance(source, bytes) and not isinstance(executor, ThreadPoolExecutor):
+            # 프로세스 풀에 작업마다 문서 전체를 pickle해서 보내지 않도록 파일로 한 번만 씀
+            fd, spool_path = tempfile.mkstemp(suffix=".pdf")
+            with os.fdopen(fd, "wb") as f:
+                f.write(source)
+            source = spool_path
+
+        chunks = [pages[i : i + pages_per_task] for i in range(0, len(pages), pages_per_task)]
+        pending = deque()
+        try:
+            for chunk in chunks:
+                pending.append(
+                    (chunk, executor.submit(encode_page_images, source, chunk, dpi, fmt, quality, grayscale))
+                )
+                if len(pending) >= max_pending:
+                    yield from _drain(pending.popleft())
+            while pending:
+                yield from _drain(pending.popleft())
+        finally:
+            # 소비자가 중간에 멈추면 아직 시작하지 않은 작업은 취소하고, 이미 실행 중인 작업이
+            # 임시 파일을 다 읽을 때까지 기다린 뒤 삭제. 대기열 자리는 with를 나가면서 돌려줌
+            for _, future in pending:
+                future.cancel()
+            wait([future for _, future in pending])
+            if spool_path is not None:
+                os.unlink(spool_path)
+
+
+def _drain(entry) -> Iterator[Tuple[int, bytes]]:
+    chunk, future = entry
+    yield from zip(chunk, future.result())
@@ -0,0 +1,247 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import fitz  # PyMuPDF
+import numpy as np
+
+from app.config import settings
+
+
+DEFAULT_DPI = 200  # pdf2image.convert_from_path의 기본값과 같은 해상도
+
+RasterKey = Tuple[str, int, int]  # (문서 fingerprint, 페이지 번호(0부터), dpi)
+
+# 영역 래스터화: 박스 높이가 약 REGION_TARGET_PIXELS 픽셀이 되도록 dpi를 고르고 범위를 제한
+# (작은 각주는 과하게, 큰 제목은 부족하게 샘플링하지 않도록)
+REGION_TARGET_PIXELS = 64
+REGION_MIN_DPI = 72
+REGION_MAX_DPI = 300
+REGION_PADDING_RATIO = 0.2  # extract_text_and_background_colors의 패딩 비율과 동일
+
+
+def document_fingerprint(source: Union[bytes, str]) -> str:
+    """캐시 키로 사용할 문서 식별자
+
+    바이트는 내용의 sha256, 파일 경로는 경로/크기/수정 시각으로 만든다.
+    (PDF 캐시의 파일은 이미 내용 해시 이름이므로 경로만으로도 내용이 구분됨)
+    """
+    if isinstance(source, str):
+        stat = os.stat(source)
+        return f"{os.path.realpath(source)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha256(source).hexdigest()
+
+
+def render_page_image(pdf: fitz.Document, page_num: int, dpi: int = DEFAULT_DPI) -> np.ndarray:
+    """MuPDF로 한 페이지만 래스터화해서 BGR 이미지(cv2 형식)로 반환
+
+    Args:
+        pdf (fitz.Document): PDF 문서 객체
+        page_num (int): 페이지 번호 (0부터 시작)
+        dpi (int): 해상도
+
+    Returns:
+        np.ndarray: (높이, 너비, 3) uint8 BGR 배열
+    """
+    pix = pdf[page_num].get_pixmap(dpi=dpi, colorspace=fitz.csRGB, alpha=False)
+    img = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, 3)
+    return cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
+
+
+def adaptive_dpi(
+    box_height: float,
+    target_pixels: int = REGION_TARGET_PIXELS,
+    min_dpi: int = REGION_MIN_DPI,
+    max_dpi: int = REGION_MAX_DPI,
+) -> int:
+    """박스 높이(pt)가 target_pixels 픽셀 정도가 되는 dpi를 [min_dpi, max_dpi] 범위로 반환"""
+    if box_height <= 0:
+        return max_dpi
+    dpi = 72 * target_pixels / box_height
+    return int(min(max(dpi, min_dpi), max_dpi))
+
+
+def render_region(
+    pdf: fitz.Document,
+    page_num: int,
+    rect: Sequence[float],
+    dpi: Optional[int] = None,
+    padding_ratio: float = REGION_PADDING_RATIO,
+) -> Tuple[np.ndarray, List[int]]:
+    """박스와 주변 패딩만 래스터화
+
+    Args:
+        pdf (fitz.Document): PDF 문서 객체
+        page_num (int): 페이지 번호 (0부터 시작)
+        rect (Sequence[float]): 박스 (x0, y0, x1, y1), PDF 포인트 단위
+        dpi (int, optional): 해상도 (기본값: 박스 높이로 adaptive_dpi)
+        padding_ratio (float): 박스의 짧은 변 대비 패딩 비율
+
+    Returns:
+        Tuple[np.ndarray, List[int]]: 영역의 BGR 이미지와 이미지 안에서의 박스 픽셀 좌표
+            (extract_text_and_background_colors에 그대로 전달 가능)
+    """
+    page = pdf[page_num]
+    box = fitz.Rect(rect)
+    dpi = dpi or adaptive_dpi(box.height)
+    scale = dpi / 72
+
+    padding = max(1 / scale, min(box.width, box.height) * padding_ratio)
+    clip = fitz.Rect(
+        box.x0 - padding, box.y0 - padding, box.x1 + padding, box.y1 + padding
+    ) & page.rect
+    if clip.is_empty:
+        return np.zeros((0, 0, 3), dtype=np.uint8), [0, 0, 0, 0]
+
+    pix = page.get_pixmap(dpi=dpi, clip=clip, colorspace=fitz.csRGB, alpha=False)
+    img = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, 3)
+    # 픽스맵 원점(pix.x, pix.y)은 페이지 전체를 dpi로 렌더링했을 때의 픽셀 좌표
+    bbox = [
+        round(box.x0 * scale) - pix.x,
+        round(box.y0 * scale) - pix.y,
+        round(box.x1 * scale) - pix.x,
+        round(box.y1 * scale) - pix.y,
+    ]
+    return cv2.cvtColor(img, cv2.COLOR_RGB2BGR), bbox
+
+
+class PageRasterCache:
+    """래스터화한 페이지 이미지를 (fingerprint, 페이지, dpi) 키로 보관하는 LRU 캐시
+
+    전체 배열 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 페이지부터 제거한다.
+    캐시된 배열은 여러 스타일 조회에서 공유되므로 읽기 전용으로 설정한다.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._images: "OrderedDict[RasterKey, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: RasterKey) -> Optional[np.ndarray]:
+        with self._lock:
+            img = self._images.get(key)
+            if img is None:
+                self._stats["misses"] += 1
+                return None
+            self._images.move_to_end(key)
+            self._stats["hits"] += 1
+            return img
+
+    def put(self, key: RasterKey, img: np.ndarray) -> np.ndarray:
+        img.setflags(write=False)
+        with self._lock:
+            previous = self._images.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._images[key] = img
+            self._bytes += img.nbytes
+            # 방금 넣은 페이지는 max_bytes보다 커도 남겨 둠
+            while self._bytes > self.max_bytes and len(self._images) > 1:
+                _, evicted = self._images.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self._stats["evictions"] += 1
+        return img
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """hits, misses, evictions, pages, bytes"""
+        with self._lock:
+            return {**self._stats, "pages": len(self._images), "bytes": self._bytes}
+
+
+class PageRasterizer:
+    """한 문서의 페이지 이미지를 필요한 페이지만 렌더링해서 제공
+
+    요청 하나에서 모든 스타일 조회가 같은 인스턴스를 사용하면 문서를 한 번만 열고
+    fingerprint도 한 번만 계산한다.
+    """
+
+    def __init__(
+        self,
+        source: Union[bytes, str],
+        cache: Optional[PageRasterCache] = None,
+        dpi: int = DEFAULT_DPI,
+    ):
+        self.source = source
+        self.cache = cache if cache is not None else get_page_raster_cache()
+        self.dpi = dpi
+        self.fingerprint = document_fingerprint(source)
+        self._pdf: Optional[fitz.Document] = None
+        self._lock = threading.Lock()
+
+    def _open(self) -> fitz.Document:
+        if self._pdf is None:
+            if isinstance(self.source, str):
+                self._pdf = fitz.open(self.source)
+            else:
+                self._pdf = fitz.open(stream=self.source, filetype="pdf")
+        return self._pdf
+
+    @property
+    def pdf(self) -> fitz.Document:
+        """열린 원본 문서 (텍스트 레이어 조회 등)"""
+        return self._open()
+
+    def page_image(self, page_num: int, dpi: Optional[int] = None) -> np.ndarray:
+        """페이지 이미지를 캐시에서 찾거나 렌더링
+
+        Args:
+            page_num (int): 페이지 번호 (0부터 시작)
+            dpi (int, optional): 해상도 (기본값: 생성 시 지정한 dpi)
+
+        Returns:
+            np.ndarray: 읽기 전용 BGR 이미지
+        """
+        key = (self.fingerprint, page_num, dpi or self.dpi)
+        img = self.cache.get(key)
+        if img is not None:
+            return img
+        # MuPDF 문서 객체는 스레드 간에 동시에 사용할 수 없음
+        with self._lock:
+            img = render_page_image(self._open(), page_num, key[2])
+        return self.cache.put(key, img)
+
+    def page_rect(self, page_num: int) -> fitz.Rect:
+        """페이지 크기 (PDF 포인트)"""
+        with self._lock:
+            return self._open()[page_num].rect
+
+    def region_image(
+        self, page_num: int, rect: Sequence[float], dpi: Optional[int] = None
+    ) -> Tuple[np.ndarray, List[int]]:
+        """박스 영역만 래스터화 (캐시하지 않음). render_region 참고"""
+        with self._lock:
+            return render_region(self._open(), page_num, rect, dpi)
+
+    def close(self):
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_cache: Optional[PageRasterCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_page_raster_cache() -> PageRasterCache:
+    """프로세스 공유 페이지 이미지 캐시"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PageRasterCache(settings.page_raster_cache_bytes)
+        return _cache
@@ -0,0 +1,143 @@
+from itertools import groupby
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import fitz  # PyMuPDF
+import numpy as np
+
+from app.modules.document_fonts import DocumentFonts
+from app.modules.font_registry import FontFace
+
+
+class _TextRun(NamedTuple):
+    point: Tuple[float, float]
+    text: str
+    fontsize: float
+    face: FontFace
+    color: Sequence[float]
+
+
+class _Layer:
+    """서로 가리지 않는 배경과 텍스트 묶음. 배경을 모두 그린 뒤 텍스트를 그려도 결과가 같음"""
+
+    def __init__(self):
+        self.backgrounds: List[Tuple[fitz.Rect, Tuple[float, ...]]] = []
+        self.texts: List[_TextRun] = []
+        self._text_boxes = np.zeros((0, 4))  # 텍스트가 차지하는 영역 [x0, y0, x1, y1]
+        self._count = 0
+
+    def add_text(self, run: _TextRun, box: Tuple[float, float, float, float]):
+        if self._count == len(self._text_boxes):
+            grown = np.zeros((max(8, self._count * 2), 4))
+            grown[: self._count] = self._text_boxes[: self._count]
+            self._text_boxes = grown
+        self._text_boxes[self._count] = box
+        self._count += 1
+        self.texts.append(run)
+
+    def covers_text(self, rect: fitz.Rect) -> bool:
+        """rect가 이 묶음의 텍스트와 겹치는지 (변이 맞닿는 것은 겹치지 않음)"""
+        boxes = self._text_boxes[: self._count]
+        return bool(
+            np.any(
+                (boxes[:, 0] < rect.x1)
+                & (rect.x0 < boxes[:, 2])
+                & (boxes[:, 1] < rect.y1)
+                & (rect.y0 < boxes[:, 3])
+            )
+        )
+
+
+class PageWriter:
+    """한 페이지의 배경과 텍스트를 모아 두었다가 한 번에 content stream에 기록
+
+    page.draw_rect / page.insert_text를 문단마다 호출하면 호출할 때마다
+    페이지 content stream이 추가되고 정리되므로, 문단이 많은 페이지(표, 재무제표 등)에서는
+    비용이 문단 수에 비례해 커진다. PageWriter는 하나의 fitz.Shape로 모든 그리기를
+    만들고 commit()에서 한 번만 기록한다.
+
+    폰트는 DocumentFonts를 통해 문서당 한 번만 임베드되고 이름으로 참조된다.
+
+    그리는 순서: fitz.Shape는 도형을 모두 그린 뒤 텍스트를 그리므로, 배경은 먼저 추가된 텍스트와
+    겹치지 않는 동안만 같은 묶음(layer)에 모은다. 뒤 문단의 배경이 앞 문단의 텍스트를 덮으면
+    새 묶음을 시작하고 묶음마다 Shape를 따로 기록하므로 문단마다 바로 그린 것과 결과가 같다.
+    (겹치는 문단이 없으면 content stream은 한 번만 기록됨)
+    텍스트 영역은 clip(보통 문단 박스) 안으로 한정한다. 박스 밖으로 조금 나온 글자 끝부분 때문에
+    표의 이웃 행마다 묶음이 나뉘지 않도록 하기 위함이다.
+    """
+
+    def __init__(self, page: fitz.Page, fonts: Optional[DocumentFonts] = None):
+        self.page = page
+        self.fonts = fonts if fonts is not None else DocumentFonts(page.parent)
+        self._layers: List[_Layer] = [_Layer()]
+
+    def __len__(self):
+        return sum(len(layer.backgrounds) + len(layer.texts) for layer in self._layers)
+
+    def draw_background(self, rect: Sequence[float], color: Sequence[float]):
+        """배경 사각형 추가 (테두리 없음)"""
+        rect = fitz.Rect(rect)
+        if self._layers[-1].covers_text(rect):
+            self._layers.append(_Layer())
+        self._layers[-1].backgrounds.append((rect, tuple(color)))
+
+    def insert_text(
+        self,
+        point: Tuple[float, float],
+        text: str,
+        fontsize: float,
+        face: FontFace,
+        color: Sequence[float],
+        clip: Optional[Sequence[float]] = None,
+    ):
+        """텍스트 한 줄 추가. 이전에 추가한 배경 위에 그려짐
+
+        Args:
+            clip (Sequence[float], optional): 뒤 배경과의 겹침을 판단할 때 텍스트 영역을 한정할 사각형
+        """
+        x, y = point
+        box = [
+            x,
+            y - face.metrics.ascender * fontsize,
+            x + face.font.text_length(text, fontsize=fontsize),
+            y - face.metrics.descender * fontsize,
+        ]
+        if clip is not None:
+            box = [
+                max(box[0], clip[0]),
+                max(box[1], clip[1]),
+                min(box[2], clip[2]),
+                min(box[3], clip[3]),
+            ]
+        self._layers[-1].add_text(_TextRun(point, text, fontsize, face, color), box)
+
+    def commit(self) -> int:
+        """모아 둔 내용을 페이지에 묶음마다 한 번씩 기록
+
+        Returns:
+            int: 기록된 배경 path 수 (같은 색이 연속된 사각형은 하나의 path로 합쳐짐)
+        """
+        if not self:
+            return 0
+
+        paths = 0
+        for layer in self._layers:
+            shape = self.page.new_shape()
+            # 그리는 순서를 유지하면서 같은 색이 연속된 사각형들을 하나의 path로 합침
+            for color, group in groupby(layer.backgrounds, key=lambda item: item[1]):
+                for rect, _ in group:
+                    shape.draw_rect(rect)
+                shape.finish(color=None, fill=color)
+                paths += 1
+
+            for run in layer.texts:
+                shape.insert_text(
+                    run.point,
+                    run.text,
+                    fontsize=run.fontsize,
+                    fontname=self.fonts.use(self.page, run.face),
+                    color=run.color,
+                )
+            shape.commit()
+
+        self._layers = [_Layer()]
+        return paths
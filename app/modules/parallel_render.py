@@ -0,0 +1,199 @@
+import asyncio
+import os
+from typing import List, Optional, Sequence, Tuple, Union
+
+import fitz  # PyMuPDF
+
+from app.modules.load_pdf import load_pdf_all
+from app.modules.pdf import Paragraph, open_source, render_plan_to_pdf
+from app.modules.render_plan import RenderPlan, compile_render_plan
+from app.modules.render_pool import render_slot
+from app.modules.save_translated_pdf import export_pdf
+
+
+Shard = Tuple[
+    int, int, str
+]  # (첫 페이지, 마지막 페이지, shard PDF 경로), 페이지는 1부터 시작
+
+
+def count_pages(source: Union[bytes, str]) -> int:
+    """페이지 내용을 읽지 않고 페이지 수만 확인 (바이트 또는 파일 경로)"""
+    with open_source(source) as pdf:
+        return pdf.page_count
+
+
+def write_bytes(path: str, data: bytes):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def plan_shards(
+    plan: RenderPlan, page_count: int, shard_size: int
+) -> List[Tuple[int, int]]:
+    """렌더링할 페이지가 있는 구간만 shard_size 페이지 단위로 나눔
+
+    Args:
+        plan (RenderPlan): 렌더링 계획
+        page_count (int): 원본 문서의 페이지 수
+        shard_size (int): shard 하나의 페이지 수
+
+    Returns:
+        List[Tuple[int, int]]: (첫 페이지, 마지막 페이지) 목록, 페이지 순서대로
+    """
+    shard_size = max(1, shard_size)
+    pages = [page.page_number for page in plan.iter_pages(page_count)]
+    ranges = []
+    for page_number in pages:
+        first = (page_number - 1) // shard_size * shard_size + 1
+        if ranges and ranges[-1][0] == first:
+            continue
+        ranges.append((first, min(first + shard_size - 1, page_count)))
+    return ranges
+
+
+def render_shard(
+    source_path: str,
+    plan: RenderPlan,
+    first_page: int,
+    last_page: int,
+    output_path: str,
+) -> str:
+    """원본을 열어서 한 shard의 페이지만 렌더링하고 별도 PDF로 저장
+
+    프로세스 풀에서 실행되는 작업 단위. 각 워커는 원본 PDF와 폰트 레지스트리를 따로 가진다.
+    """
+    pdf = load_pdf_all(file_path=source_path)
+    if pdf is None:
+        raise ValueError("PDF를 열 수 없습니다.")
+    render_plan_to_pdf(pdf, plan.select_pages(first_page, last_page))
+
+    shard = fitz.open()
+    shard.insert_pdf(pdf, from_page=first_page - 1, to_page=last_page - 1, links=False)
+    pdf.close()
+
+    # 폰트 서브셋은 합친 뒤 문서 전체에서 한 번만 수행 (shard마다 하면 서브셋이 shard 수만큼 임베드됨)
+    shard.save(output_path, garbage=3, deflate=True)
+    shard.close()
+    return output_path
+
+
+def copy_links(source: fitz.Document, output: fitz.Document):
+    """원본 페이지의 링크를 같은 번호의 출력 페이지에 다시 만듦
+
+    insert_pdf는 삽입하는 구간 밖의 페이지를 가리키는 링크를 버리므로, 구간별로 이어 붙인 뒤
+    원본에서 한 번에 옮긴다. 이름 있는 목적지(named destination)로 가는 링크는 해석한 페이지로
+    가는 링크로 바꾼다 (목적지 이름 자체는 옮기지 않으므로 외부에서 #이름으로 여는 것은 지원하지 않음).
+    """
+    for page_number in range(min(len(source), len(output))):
+        page = output[page_number]
+        for link in source[page_number].get_links():
+            if link["kind"] == fitz.LINK_NAMED:
+                if link.get("page", -1) < 0:
+                    continue
+                link = {**link, "kind": fitz.LINK_GOTO}
+            try:
+                page.insert_link(link)
+            except Exception as e:
+                print(f"링크 복사 중 오류 발생: {e}")
+
+
+def stitch_shards(
+    source_path: str,
+    shards: Sequence[Shard],
+    spill_path: Optional[str] = None,
+    spill_threshold: Optional[int] = None,
+) -> Union[bytes, str]:
+    """렌더링된 shard와 작업이 없는 원본 페이지를 원래 순서대로 이어 붙임
+
+    링크는 원본에서 다시 만들고, 폰트 서브셋은 합친 문서에서 한 번만 한다.
+    중간 결과는 shard 파일과 같은 디렉토리에 stitched.pdf로 저장한다.
+
+    Returns:
+        Union[bytes, str]: 결과 PDF 내용, 또는 spill_threshold를 넘어 파일로 저장된 경우 그 경로
+    """
+    source = fitz.open(source_path)
+    output = fitz.open()
+
+    next_page = 1
+    for first_page, last_page, shard_path in shards:
+        if first_page > next_page:
+            output.insert_pdf(
+                source, from_page=next_page - 1, to_page=first_page - 2, links=False
+            )
+        with fitz.open(shard_path) as shard:
+            output.insert_pdf(shard, links=False)
+        next_page = last_page + 1
+    if next_page <= len(source):
+        output.insert_pdf(
+            source, from_page=next_page - 1, to_page=len(source) - 1, links=False
+        )
+
+    output.set_metadata(source.metadata)
+    try:
+        output.set_toc(source.get_toc(simple=False))
+    except Exception as e:
+        print(f"목차 복사 중 오류 발생: {e}")
+    copy_links(source, output)
+    source.close()
+
+    if not shards:
+        return export_pdf(output, spill_path, spill_threshold, subset_fonts=False)
+
+    # garbage=4: 구간마다 따로 복사된 원본 폰트, 이미지와 번역문 폰트를 먼저 하나로 합침
+    # 합치기 전에 서브셋하면 같은 폰트가 복사본마다 다른 서브셋이 되어 다시 합칠 수 없음
+    stitched_path = os.path.join(os.path.dirname(shards[0][2]), "stitched.pdf")
+    output.save(stitched_path, garbage=4, deflate=True)
+    output.close()
+    try:
+        return export_pdf(fitz.open(stitched_path), spill_path, spill_threshold)
+    finally:
+        os.unlink(stitched_path)
+
+
+def _shard_path(work_dir: str, first_page: int) -> str:
+    return os.path.join(work_dir, f"shard_{first_page:05d}.pdf")
+
+
+async def render_pdf_parallel_async(
+    source_path: str,
+    paragraphs: Union[List[Paragraph], RenderPlan],
+    page_number_limit: int,
+    page_count: int,
+    work_dir: str,
+    shard_size: int,
+    spill_path: Optional[str] = None,
+    spill_threshold: Optional[int] = None,
+) -> Union[bytes, str]:
+    """페이지 구간을 렌더링 프로세스 풀의 워커들에 나눠 렌더링하고 하나의 PDF로 합침
+
+    요청 하나가 여러 작업을 제출해도 렌더링 대기열은 한 자리만 사용한다.
+    paragraphs 대신 미리 만든 RenderPlan을 받으면 그대로 사용
+    """
+    async with render_slot() as executor:
+        loop = asyncio.get_running_loop()
+        plan = paragraphs
+        if not isinstance(plan, RenderPlan):
+            plan = await loop.run_in_executor(
+                executor, compile_render_plan, paragraphs, page_number_limit
+            )
+
+        ranges = plan_shards(plan, page_count, shard_size)
+        paths = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    executor,
+                    render_shard,
+                    source_path,
+                    plan.select_pages(first, last),
+                    first,
+                    last,
+                    _shard_path(work_dir, first),
+                )
+                for first, last in ranges
+            )
+        )
+
+        shards = [(first, last, path) for (first, last), path in zip(ranges, paths)]
+        return await loop.run_in_executor(
+            executor, stitch_shards, source_path, shards, spill_path, spill_threshold
+        )
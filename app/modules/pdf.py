@@ -1,9 +1,14 @@
-import json
+import fitz  # PyMuPDF
+
+from app.modules.document_fonts import DocumentFonts
+from app.modules.font_registry import get_face_for_name
 from app.modules.load_pdf import load_pdf_all
-from app.modules.translate_text import (
-    replace_text_in_box_single_line,
-)
-from typing import List, TypedDict
+from app.modules.page_writer import PageWriter
+from app.modules.render_plan import RenderPlan, compile_render_plan
+from app.modules.save_translated_pdf import export_pdf
+from app.modules.text_fitting import fit_font_sizes
+from app.modules.translate_text import write_fitted_text
+from typing import List, Optional, TypedDict, Union
 
 
 class Paragraph(TypedDict):
@@ -14,6 +19,45 @@ class Paragraph(TypedDict):
     style: str
 
 
+def render_plan_to_pdf(pdf: fitz.Document, plan: RenderPlan) -> fitz.Document:
+    """렌더링 계획에 있는 페이지만 순회하며 번역문을 그림
+
+    Args:
+        pdf (fitz.Document): 원본 PDF 문서 객체
+        plan (RenderPlan): compile_render_plan으로 만든 계획
+
+    Returns:
+        fitz.Document: 수정된 PDF 문서 객체
+    """
+    # 폰트는 문서당 한 번만 임베드
+    fonts = DocumentFonts(pdf)
+    for page_plan in plan.iter_pages(len(pdf)):
+        styles = [plan.styles[style_id] for style_id in page_plan.style_ids.tolist()]
+        faces = [get_face_for_name(style.font_name) for style in styles]
+        # 페이지의 모든 문단의 폰트 크기를 한 번에 계산
+        sizes = fit_font_sizes(
+            page_plan.texts,
+            [face.font for face in faces],
+            page_plan.boxes,
+            [style.font_size for style in styles],
+        )
+
+        # 페이지의 모든 배경과 텍스트를 모아서 한 번에 기록
+        writer = PageWriter(pdf[page_plan.page_number - 1], fonts)
+        for rect, text, style, face, size in zip(
+            page_plan.boxes.tolist(), page_plan.texts, styles, faces, sizes
+        ):
+            if size is None:
+                print("텍스트 교체 중 오류 발생: 텍스트를 박스에 맞출 수 없습니다.")
+                continue
+            write_fitted_text(
+                writer, rect, text, size, face, style.color, style.bg_color
+            )
+        writer.commit()
+
+    return pdf
+
+
 def process_pdf_paragraphs_from_api(
     pdf_url: str,
     paragraphs: List[Paragraph],
@@ -22,54 +66,38 @@ def process_pdf_paragraphs_from_api(
     # Load PDF
     pdf = load_pdf_all(url=pdf_url)
 
-    for page_number in range(1, len(pdf) + 1):
-        if page_number > page_number_limit:
-            break
+    # 요청 payload를 한 번만 순회해서 페이지별 계획 생성
+    plan = compile_render_plan(paragraphs, page_number_limit)
 
-        # Process each paragraph
-        for paragraph in paragraphs:
-            if paragraph["pageNum"] != page_number:
-                continue
-            bounding = paragraph["boundingBox"]
-            translated_text = paragraph["translatedText"]
-            font_properties = json.loads(paragraph["style"])
-
-            fontSize = font_properties.get("fontSize", 11)
-            color = font_properties.get("color", [0, 0, 0])
-            bgColor = font_properties.get(
-                "bgColor", [255, 255, 255]
-            )
-            font = font_properties.get(
-                "font", "Helvetica"
-            )  # Assuming Helvetica as default font
-            isBold = font_properties.get("isBold", False)
-            isItalic = font_properties.get("isItalic", False)
-
-            # 딕셔너리 값들을 순서대로 리스트로 변환
-            color = [float(val) / 255.0 for val in color]
-            bgColor = [float(val) / 255.0 for val in bgColor]
-
-            # 폰트 이름 조정
-            if isBold:
-                font_name = font + "-Bold"  # Bold 폰트 이름 조정
-            else:
-                font_name = font
-
-            if isItalic:
-                font_name += "-Italic"  # Italic 폰트 이름 조정
-
-            # Convert bounding box coordinates if needed
-            rect = [float(value) for value in bounding]
-            # Replace text in the PDF
-            pdf = replace_text_in_box_single_line(
-                pdf,
-                page_number,
-                rect,
-                translated_text,
-                fontSize,
-                font_name,
-                color,
-                bgColor,
-            )
+    return render_plan_to_pdf(pdf, plan)
 
-    return pdf
+
+def open_source(source: Union[bytes, str]) -> fitz.Document:
+    """다운로드된 바이트 또는 로컬 파일 경로(캐시)에서 원본 PDF를 엶"""
+    if isinstance(source, str):
+        return load_pdf_all(file_path=source)
+    return load_pdf_all(pdf_bytes=source)
+
+
+def render_pdf(
+    source: Union[bytes, str],
+    paragraphs: Union[List[Paragraph], RenderPlan],
+    page_number_limit: int,
+    spill_path: Optional[str] = None,
+    spill_threshold: Optional[int] = None,
+) -> Union[bytes, str]:
+    """원본 PDF(바이트 또는 파일 경로)에 번역문을 그리고 결과 PDF를 바이트로 반환
+
+    렌더링 프로세스 풀에서 실행되는 작업 단위. 인자와 반환값은 모두 pickle 가능해야 함
+    결과가 spill_threshold보다 크면 spill_path에 저장하고 경로를 반환
+    paragraphs 대신 미리 만든 RenderPlan을 받으면 그대로 사용
+    """
+    pdf = open_source(source)
+    if pdf is None:
+        raise ValueError("PDF를 열 수 없습니다.")
+
+    plan = paragraphs
+    if not isinstance(plan, RenderPlan):
+        plan = compile_render_plan(paragraphs, page_number_limit)
+    render_plan_to_pdf(pdf, plan)
+    return export_pdf(pdf, spill_path, spill_threshold)
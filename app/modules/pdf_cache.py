@@ -0,0 +1,287 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Union
+
+import httpx
+
+from app.config import settings
+from app.modules.download import (
+    SpooledDownload,
+    download_pdf,
+    get_http_client,
+    read_response,
+)
+
+
+class PdfCache:
+    """URL로 받은 원본 PDF를 내용 해시(sha256)로 저장하는 로컬 디스크 캐시
+
+    - 파일은 cache_dir/blobs/<sha256>.pdf 에 저장되고, 같은 내용은 URL이 달라도 한 번만 저장
+    - 캐시된 URL은 ETag / Last-Modified 조건부 요청으로 재검증 (304면 다운로드 생략)
+    - 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 URL부터 제거 (LRU)
+    - 사용 중(pin)인 파일은 제거하지 않음
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.blob_dir = os.path.join(cache_dir, "blobs")
+        os.makedirs(self.blob_dir, exist_ok=True)
+
+        # url -> {"sha256", "size", "etag", "last_modified"}, 앞쪽이 오래 사용하지 않은 항목
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        # sha256 -> 참조하는 URL 수, 참조되는 파일 전체 크기 (같은 내용은 한 번만 계산)
+        self._blob_refs: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._pins: Dict[str, int] = {}
+        self._stats = {"hits": 0, "misses": 0, "bytes_saved": 0, "evictions": 0}
+        # 인덱스 파일은 스레드에서 쓰므로 늦게 끝난 이전 스냅샷이 덮어쓰지 않도록 순번을 둠
+        self._index_lock = threading.Lock()
+        self._index_version = 0
+        self._index_written = 0
+        self._load_index()
+
+    # ------------------------------------------------------------------ 인덱스
+    def _index_path(self) -> str:
+        return os.path.join(self.cache_dir, self.INDEX_FILE)
+
+    def _load_index(self):
+        try:
+            with open(self._index_path(), "r") as f:
+                entries = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        for url, entry in entries:
+            if os.path.exists(self.blob_path(entry["sha256"])):
+                self._add_entry(url, entry)
+
+    async def _save_index(self):
+        """현재 인덱스의 스냅샷을 스레드에서 저장 (이벤트 루프를 막지 않음)"""
+        self._index_version += 1
+        await asyncio.to_thread(
+            self._write_index, self._index_version, list(self._entries.items())
+        )
+
+    def _write_index(self, version: int, entries: list):
+        with self._index_lock:
+            if version <= self._index_written:
+                return
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+            with os.fdopen(fd, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self._index_path())
+            self._index_written = version
+
+    # ------------------------------------------------------------------ 저장소
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.blob_dir, f"{sha256}.pdf")
+
+    def _write_blob(self, data: bytes) -> str:
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(sha256)
+        if not os.path.exists(path):
+            fd, tmp_path = tempfile.mkstemp(dir=self.blob_dir)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return sha256
+
+    def _store_download(self, sink: SpooledDownload) -> str:
+        """다운로드한 임시 파일을 해시 이름으로 옮김. 같은 내용이 이미 있으면 버림"""
+        result = sink.finish()
+        if isinstance(result, bytes):
+            # 빈 응답처럼 임시 파일이 만들어지지 않은 경우
+            return self._write_blob(result)
+        path = self.blob_path(sink.sha256)
+        if os.path.exists(path):
+            sink.cleanup()
+        else:
+            os.replace(result, path)
+        return sink.sha256
+
+    def total_bytes(self) -> int:
+        """캐시에 저장된 파일 전체 크기 (같은 내용은 한 번만 계산)"""
+        return self._total_bytes
+
+    def _add_entry(self, url: str, entry: Dict):
+        """URL 항목을 추가하고 최근 사용으로 옮김 (같은 URL의 이전 항목은 새 항목을 참조한 뒤 제거)"""
+        sha256 = entry["sha256"]
+        if not self._blob_refs.get(sha256):
+            self._total_bytes += entry["size"]
+        self._blob_refs[sha256] = self._blob_refs.get(sha256, 0) + 1
+        if url in self._entries:
+            self._remove_entry(url)
+        self._entries[url] = entry
+
+    def _remove_entry(self, url: str):
+        """URL 항목을 제거하고, 다른 URL이 참조하지 않는 파일은 삭제"""
+        entry = self._entries.pop(url)
+        sha256 = entry["sha256"]
+        self._blob_refs[sha256] -= 1
+        if not self._blob_refs[sha256]:
+            del self._blob_refs[sha256]
+            self._total_bytes -= entry["size"]
+            self._release_blob(sha256)
+
+    def _release_blob(self, sha256: str):
+        """참조하는 URL도 고정도 없는 파일을 삭제 (고정된 파일은 고정이 풀릴 때 삭제)"""
+        if self._blob_refs.get(sha256) or self._pins.get(sha256):
+            return
+        try:
+            os.unlink(self.blob_path(sha256))
+        except FileNotFoundError:
+            pass
+
+    def _pin(self, sha256: str):
+        self._pins[sha256] = self._pins.get(sha256, 0) + 1
+
+    def _unpin(self, sha256: str):
+        self._pins[sha256] -= 1
+        if not self._pins[sha256]:
+            del self._pins[sha256]
+            self._release_blob(sha256)
+
+    def _evict(self):
+        """max_bytes 이하가 될 때까지 오래된 URL부터 제거"""
+        for url in list(self._entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            if self._pins.get(self._entries[url]["sha256"]):
+                continue
+            self._remove_entry(url)
+            self._stats["evictions"] += 1
+
+    # ------------------------------------------------------------------ 조회
+    async def fetch(self, url: str, client: Optional[httpx.AsyncClient] = None) -> str:
+        """URL의 PDF를 캐시에서 찾거나 다운로드해서 로컬 파일 경로를 반환
+
+        반환한 뒤에는 고정하지 않으므로, 파일을 사용하는 동안 제거되지 않게 하려면 open을 사용한다.
+
+        Args:
+            url (str): PDF 파일 URL
+            client (httpx.AsyncClient, optional): 사용할 HTTP 클라이언트 (기본값: 공유 클라이언트)
+
+        Returns:
+            str: 캐시된 PDF 파일 경로
+        """
+        sha256 = await self._fetch_pinned(url, client)
+        self._unpin(sha256)
+        return self.blob_path(sha256)
+
+    async def _fetch_pinned(self, url: str, client: Optional[httpx.AsyncClient]) -> str:
+        """fetch와 같지만 반환한 파일의 고정을 유지함 (호출한 쪽에서 _unpin)
+
+        다른 요청의 _evict가 await 중에 파일을 지우지 않도록, 캐시된 파일은 첫 await 전에,
+        새로 받은 파일은 인덱스에 넣기 전에 고정한다.
+        """
+        client = client or get_http_client()
+        entry = self._entries.get(url)
+
+        headers = {}
+        if entry is not None:
+            self._pin(entry["sha256"])
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            # 본문은 메모리에 올리지 않고 blob 디렉토리의 임시 파일로 받으면서 해시를 계산
+            sink = SpooledDownload(spool_bytes=0, dir=self.blob_dir, hash_content=True)
+            async with client.stream("GET", url, headers=headers) as response:
+                if entry is not None and response.status_code == 304:
+                    self._stats["hits"] += 1
+                    self._stats["bytes_saved"] += entry["size"]
+                    if url in self._entries:
+                        self._entries.move_to_end(url)
+                    else:
+                        # 재검증하는 동안 제거된 항목은 고정된 파일로 다시 추가
+                        self._add_entry(url, entry)
+                    pinned, entry = entry["sha256"], None
+                else:
+                    response.raise_for_status()  # HTTP 오류 발생 시 예외 처리
+                    await read_response(response, sink)
+                    pinned = None
+        finally:
+            # 304가 아니면 이전 내용의 고정을 풂 (참조가 없어진 파일은 여기서 삭제)
+            if entry is not None:
+                self._unpin(entry["sha256"])
+
+        if pinned is None:
+            self._stats["misses"] += 1
+            pinned = await asyncio.to_thread(self._store_download, sink)
+            self._pin(pinned)
+            # 내용이 바뀐 URL이면 이전 파일은 참조가 없을 때 삭제됨
+            self._add_entry(
+                url,
+                {
+                    "sha256": pinned,
+                    "size": sink.size,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                },
+            )
+            self._evict()
+
+        try:
+            await self._save_index()
+        except BaseException:
+            self._unpin(pinned)
+            raise
+        return pinned
+
+    @asynccontextmanager
+    async def open(
+        self, url: str, client: Optional[httpx.AsyncClient] = None
+    ) -> AsyncIterator[str]:
+        """fetch한 파일을 사용하는 동안 캐시에서 제거되지 않도록 고정"""
+        sha256 = await self._fetch_pinned(url, client)
+        try:
+            yield self.blob_path(sha256)
+        finally:
+            self._unpin(sha256)
+
+    def get_stats(self) -> Dict[str, int]:
+        """hits, misses, bytes_saved, evictions, entries, total_bytes"""
+        return {
+            **self._stats,
+            "entries": len(self._entries),
+            "total_bytes": self.total_bytes(),
+        }
+
+
+_cache: Optional[PdfCache] = None
+
+
+def get_pdf_cache() -> Optional[PdfCache]:
+    """설정에 캐시 디렉토리가 있으면 공유 캐시를 반환, 없으면 None"""
+    global _cache
+    if settings.pdf_cache_dir is None:
+        return None
+    if _cache is None or _cache.cache_dir != settings.pdf_cache_dir:
+        _cache = PdfCache(settings.pdf_cache_dir, settings.pdf_cache_max_bytes)
+    return _cache
+
+
+@asynccontextmanager
+async def open_source_pdf(url: str) -> AsyncIterator[Union[bytes, str]]:
+    """원본 PDF를 준비. 캐시가 켜져 있으면 캐시 파일 경로, 아니면 다운로드한 바이트 또는 임시 파일 경로"""
+    cache = get_pdf_cache()
+    if cache is None:
+        download = await download_pdf(url)
+        try:
+            yield download.finish()
+        finally:
+            download.cleanup()
+        return
+
+    async with cache.open(url) as path:
+        yield path
@@ -0,0 +1,191 @@
+import json
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class RenderStyle(NamedTuple):
+    """렌더러가 바로 사용할 수 있도록 정규화된 문단 스타일"""
+
+    font_size: float
+    font_name: str
+    color: Tuple[float, float, float]
+    bg_color: Tuple[float, float, float]
+
+
+def parse_style(style: str) -> RenderStyle:
+    """API로 전달된 style JSON 문자열을 RenderStyle로 변환
+
+    Args:
+        style (str): {"fontSize", "color", "bgColor", "font", "isBold", "isItalic"} JSON
+
+    Returns:
+        RenderStyle: 색상이 0-1 범위로 정규화된 스타일
+    """
+    return style_from_properties(json.loads(style))
+
+
+def style_from_properties(font_properties: dict) -> RenderStyle:
+    fontSize = font_properties.get("fontSize", 11)
+    color = font_properties.get("color", [0, 0, 0])
+    bgColor = font_properties.get("bgColor", [255, 255, 255])
+    font = font_properties.get(
+        "font", "Helvetica"
+    )  # Assuming Helvetica as default font
+    isBold = font_properties.get("isBold", False)
+    isItalic = font_properties.get("isItalic", False)
+
+    # 폰트 이름 조정
+    font_name = font + "-Bold" if isBold else font
+    if isItalic:
+        font_name += "-Italic"
+
+    return RenderStyle(
+        font_size=fontSize,
+        font_name=font_name,
+        color=tuple(float(val) / 255.0 for val in color),
+        bg_color=tuple(float(val) / 255.0 for val in bgColor),
+    )
+
+
+@dataclass
+class PagePlan:
+    """한 페이지에서 그려야 할 문단들 (연속 배열)"""
+
+    page_number: int
+    boxes: np.ndarray  # (N, 4) float64, [x0, y0, x1, y1]
+    texts: List[str]
+    style_ids: np.ndarray  # (N,) int32, RenderPlan.styles 인덱스
+
+    def __len__(self):
+        return len(self.texts)
+
+
+@dataclass
+class RenderPlan:
+    """요청 전체에 대한 페이지별 렌더링 계획"""
+
+    styles: List[RenderStyle]
+    pages: Dict[int, PagePlan] = field(default_factory=dict)
+    skipped: int = 0  # 페이지 번호나 좌표가 잘못되어 제외한 문단 수
+
+    @property
+    def paragraph_count(self) -> int:
+        return sum(len(page) for page in self.pages.values())
+
+    def select_pages(self, first_page: int, last_page: int) -> "RenderPlan":
+        """first_page ~ last_page(포함) 범위의 페이지만 담은 계획. 스타일 목록은 공유"""
+        return RenderPlan(
+            styles=self.styles,
+            skipped=self.skipped,
+            pages={
+                page_number: page
+                for page_number, page in self.pages.items()
+                if first_page <= page_number <= last_page
+            },
+        )
+
+    def iter_pages(self, page_count: Optional[int] = None) -> Iterator[PagePlan]:
+        """작업이 있는 페이지만 페이지 번호 순서대로 반환
+
+        Args:
+            page_count (int, optional): 문서의 페이지 수. 이보다 큰 페이지는 건너뜀
+        """
+        for page_number in sorted(self.pages):
+            if page_number < 1:
+                continue
+            if page_count is not None and page_number > page_count:
+                break
+            yield self.pages[page_number]
+
+
+class RenderPlanBuilder:
+    """문단을 한 번씩 추가하면서 페이지별 계획을 만드는 빌더
+
+    같은 스타일은 한 번만 저장되고 문단은 스타일 id로 참조한다.
+    """
+
+    def __init__(self):
+        self.styles: List[RenderStyle] = []
+        self._style_ids: Dict[Hashable, int] = {}
+        self._boxes: Dict[int, List[Sequence[float]]] = {}
+        self._texts: Dict[int, List[str]] = {}
+        self._style_refs: Dict[int, List[int]] = {}
+        self.skipped = 0
+
+    def intern_style(self, key: Hashable, style: Optional[RenderStyle] = None) -> int:
+        """key에 해당하는 스타일 id를 반환. 처음 보는 key면 style을 등록"""
+        style_id = self._style_ids.get(key)
+        if style_id is None:
+            if style is None:
+                style = parse_style(key)
+            style_id = len(self.styles)
+            self.styles.append(style)
+            self._style_ids[key] = style_id
+        return style_id
+
+    def add(
+        self, page_number: int, box: Sequence[float], text: str, style_id: int
+    ) -> bool:
+        """문단을 추가. 페이지 번호가 1보다 작거나 좌표가 숫자 4개가 아니면 건너뛰고 False 반환
+
+        좌표 개수가 다른 문단이 섞이면 build()에서 (N, 4)로 바꿀 때 뒤의 박스가 모두 어긋나고,
+        숫자가 아닌 좌표가 하나라도 있으면 페이지 전체의 변환이 실패하므로 여기서 걸러낸다.
+        (0 이하의 페이지 번호는 pdf[-1]처럼 마지막 페이지를 가리키게 됨)
+        """
+        try:
+            box = [float(value) for value in box]
+        except (TypeError, ValueError):
+            box = None
+        if page_number < 1 or box is None or len(box) != 4:
+            self.skipped += 1
+            return False
+        if page_number not in self._texts:
+            self._boxes[page_number] = []
+            self._texts[page_number] = []
+            self._style_refs[page_number] = []
+        self._boxes[page_number].append(box)
+        self._texts[page_number].append(text)
+        self._style_refs[page_number].append(style_id)
+        return True
+
+    def build(self) -> RenderPlan:
+        plan = RenderPlan(styles=self.styles, skipped=self.skipped)
+        for page_number in sorted(self._texts):
+            plan.pages[page_number] = PagePlan(
+                page_number=page_number,
+                boxes=np.asarray(self._boxes[page_number], dtype=np.float64).reshape(
+                    -1, 4
+                ),
+                texts=self._texts[page_number],
+                style_ids=np.asarray(self._style_refs[page_number], dtype=np.int32),
+            )
+        return plan
+
+
+def compile_render_plan(
+    paragraphs: Sequence[dict], page_number_limit: Optional[int] = None
+) -> RenderPlan:
+    """요청 payload를 한 번만 순회해서 페이지별 렌더링 계획을 생성
+
+    Args:
+        paragraphs (Sequence[dict]): API로 전달된 Paragraph 목록
+        page_number_limit (int, optional): 이 페이지 번호보다 큰 문단은 제외
+
+    Returns:
+        RenderPlan: 페이지 번호 -> PagePlan (잘못된 문단 수는 skipped)
+    """
+    builder = RenderPlanBuilder()
+    for paragraph in paragraphs:
+        page_number = paragraph["pageNum"]
+        if page_number_limit is not None and page_number > page_number_limit:
+            continue
+        style_id = builder.intern_style(paragraph["style"])
+        builder.add(
+            page_number,
+            paragraph["boundingBox"],
+            paragraph["translatedText"],
+            style_id,
+        )
+    return builder.build()
@@ -0,0 +1,97 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from functools import partial
+from typing import Callable, Optional
+
+from app.config import settings
+
+
+class RenderQueueFull(Exception):
+    """렌더링 대기열이 가득 차서 작업을 받을 수 없음"""
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_in_flight = 0
+_slot_lock = threading.Lock()  # 동기 호출자는 이벤트 루프 밖의 스레드에서 자리를 차지함
+
+
+def get_render_executor() -> ProcessPoolExecutor:
+    """CPU 작업(MuPDF 렌더링, 저장)을 실행할 프로세스 풀 (최초 호출 시 생성)"""
+    global _executor
+    if _executor is None:
+        # 이벤트 루프 스레드가 있는 프로세스를 fork하지 않도록 spawn 사용
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.render_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def get_render_queue_depth() -> int:
+    """실행 중이거나 대기 중인 렌더링 요청 수"""
+    return _in_flight
+
+
+def _acquire_slot():
+    global _in_flight
+    with _slot_lock:
+        if _in_flight >= settings.render_max_queue:
+            raise RenderQueueFull(
+                f"렌더링 대기열이 가득 찼습니다. ({_in_flight}/{settings.render_max_queue})"
+            )
+        _in_flight += 1
+
+
+def _release_slot():
+    global _in_flight
+    with _slot_lock:
+        _in_flight -= 1
+
+
+@asynccontextmanager
+async def render_slot():
+    """렌더링 대기열에서 한 자리를 차지. 요청 하나가 여러 작업을 제출해도 한 자리만 사용
+
+    Raises:
+        RenderQueueFull: 대기 중인 요청이 render_max_queue 이상인 경우
+    """
+    _acquire_slot()
+    try:
+        yield get_render_executor()
+    finally:
+        _release_slot()
+
+
+@contextmanager
+def render_slot_sync():
+    """render_slot의 동기 버전. 스레드나 동기 제너레이터에서 풀을 쓰는 작업용
+
+    Raises:
+        RenderQueueFull: 대기 중인 요청이 render_max_queue 이상인 경우
+    """
+    _acquire_slot()
+    try:
+        yield get_render_executor()
+    finally:
+        _release_slot()
+
+
+async def run_in_render_pool(fn: Callable, *args, **kwargs):
+    """fn을 프로세스 풀에서 실행하고 결과를 기다림. 이벤트 루프는 블로킹되지 않음
+
+    Raises:
+        RenderQueueFull: 대기 중인 작업이 render_max_queue 이상인 경우
+    """
+    async with render_slot() as executor:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, partial(fn, *args, **kwargs))
+
+
+def shutdown_render_pool():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
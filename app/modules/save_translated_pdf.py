@@ -1,20 +1,101 @@
+import logging
+import os
+from typing import Optional, Union
+
 import fitz
 
+from app.modules.document_fonts import subset_document_fonts
+
+logger = logging.getLogger(__name__)
+
 
-def save_pdf(pdf_document: fitz.Document, output_path: str) -> bool:
+def _subset_fonts(pdf_document: fitz.Document):
+    report = subset_document_fonts(pdf_document)
+    logger.debug(
+        "폰트 서브셋: %d -> %d bytes (%d bytes 절감)",
+        report["before"],
+        report["after"],
+        report["saved"],
+    )
+
+
+def save_pdf(
+    pdf_document: fitz.Document, output_path: str, subset_fonts: bool = True
+) -> bool:
     """수정된 PDF를 저장하는 함수
 
     Args:
         pdf_document (fitz.Document): PDF 문서 객체
         output_path (str): 저장할 파일 경로
+        subset_fonts (bool): 임베드된 폰트를 사용된 글리프만 남기도록 서브셋할지 여부
 
     Returns:
         bool: 성공 여부
     """
     try:
-        pdf_document.save(output_path)
+        if subset_fonts:
+            _subset_fonts(pdf_document)
+            # 서브셋 후 사용되지 않는 원본 폰트 스트림 제거
+            pdf_document.save(output_path, garbage=3, deflate=True)
+        else:
+            pdf_document.save(output_path)
         pdf_document.close()
         return True
     except Exception as e:
         print(f"PDF 저장 중 오류 발생: {e}")
         return False
+
+
+def pdf_to_bytes(
+    pdf_document: fitz.Document, subset_fonts: bool = True, garbage: int = 3
+) -> bytes:
+    """수정된 PDF를 파일로 저장하지 않고 바이트로 직렬화하는 함수
+
+    Args:
+        pdf_document (fitz.Document): PDF 문서 객체
+        subset_fonts (bool): 임베드된 폰트를 사용된 글리프만 남기도록 서브셋할지 여부
+        garbage (int): MuPDF garbage collection 레벨 (4는 중복 객체도 합침)
+
+    Returns:
+        bytes: PDF 파일 내용
+    """
+    if subset_fonts:
+        _subset_fonts(pdf_document)
+    data = pdf_document.tobytes(garbage=garbage, deflate=True)
+    pdf_document.close()
+    return data
+
+
+def export_pdf(
+    pdf_document: fitz.Document,
+    spill_path: Optional[str] = None,
+    spill_threshold: Optional[int] = None,
+    subset_fonts: bool = True,
+    garbage: int = 3,
+) -> Union[bytes, str]:
+    """PDF를 직렬화. spill_path가 있으면 파일로 바로 저장하고, 기준보다 작을 때만 바이트로 읽어서 반환
+
+    spill을 사용하면 결과 전체를 워커 메모리에 바이트로 만들지 않는다.
+
+    Args:
+        pdf_document (fitz.Document): PDF 문서 객체
+        spill_path (str, optional): 결과가 클 때 저장할 파일 경로
+        spill_threshold (int, optional): 이 크기(바이트)를 넘으면 spill_path의 파일을 그대로 사용
+
+    Returns:
+        Union[bytes, str]: PDF 내용, 또는 파일로 저장된 경우 그 경로
+    """
+    if not spill_path or spill_threshold is None:
+        return pdf_to_bytes(pdf_document, subset_fonts=subset_fonts, garbage=garbage)
+
+    if subset_fonts:
+        _subset_fonts(pdf_document)
+    pdf_document.save(spill_path, garbage=garbage, deflate=True)
+    pdf_document.close()
+    if os.path.getsize(spill_path) > spill_threshold:
+        return spill_path
+
+    with open(spill_path, "rb") as f:
+        data = f.read()
+    os.unlink(spill_path)
+    return data
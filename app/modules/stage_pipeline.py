@@ -0,0 +1,223 @@
+import asyncio
+import sys
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Sequence,
+    Set,
+    Union,
+)
+
+
+class Stage(NamedTuple):
+    """파이프라인의 한 단계
+
+    fn은 이전 단계의 결과 하나를 받아 다음 단계로 넘길 값을 반환하는 코루틴 함수.
+    concurrency개의 작업자가 동시에 항목을 처리한다.
+    """
+
+    name: str
+    fn: Callable[[Any], Awaitable[Any]]
+    concurrency: int = 1
+
+
+@dataclass
+class StageStats:
+    processed: int = 0
+    busy_seconds: float = 0.0
+    queue_depth: int = 0  # 이 단계 앞에서 대기 중인 항목 수
+    max_queue_depth: int = 0
+
+    def observe_queue(self, depth: int):
+        self.queue_depth = depth
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+
+
+# 단계 이름별 누적 통계 (끝난 실행) 와 실행 중인 파이프라인 (프로세스 전체)
+_lock = threading.Lock()
+_stats: Dict[str, StageStats] = {}
+_active: Set["StagePipeline"] = set()
+
+
+def _merge(total: StageStats, run: StageStats):
+    total.processed += run.processed
+    total.busy_seconds += run.busy_seconds
+    total.max_queue_depth = max(total.max_queue_depth, run.max_queue_depth)
+
+
+def get_pipeline_stats() -> Dict[str, Dict[str, Union[int, float]]]:
+    """단계별 통계 (processed, busy_seconds, queue_depth, max_queue_depth)
+
+    queue_depth는 지금 실행 중인 파이프라인들에서 각 단계 앞에 대기 중인 항목 수의 합
+    """
+    with _lock:
+        merged = {name: StageStats(**asdict(stats)) for name, stats in _stats.items()}
+        for pipeline in _active:
+            for name, run in pipeline.stats.items():
+                total = merged.setdefault(name, StageStats())
+                _merge(total, run)
+                total.queue_depth += run.queue_depth
+        return {name: asdict(stats) for name, stats in merged.items()}
+
+
+def reset_pipeline_stats():
+    """누적 통계를 비움 (테스트용)"""
+    with _lock:
+        _stats.clear()
+
+
+_DONE = object()
+
+
+class StagePipeline:
+    """단계 사이를 크기가 제한된 큐로 연결해서 여러 단계를 겹쳐 실행하는 파이프라인
+
+    앞 단계가 다음 항목을 처리하는 동안 뒷 단계가 이전 항목을 처리한다.
+    큐가 가득 차면 앞 단계가 기다리므로 메모리에 올라가는 중간 결과는 큐 크기로 제한된다.
+    한 단계에서 예외가 나면 나머지 작업을 모두 취소하고 그 예외를 그대로 올린다.
+
+    사용 예:
+        pipeline = StagePipeline([Stage("style", style_batch, 2), Stage("render", render_batch, 2)])
+        results = await pipeline.run(batches)
+    """
+
+    def __init__(self, stages: Sequence[Stage], queue_size: int = 4):
+        if not stages:
+            raise ValueError("단계가 하나 이상 필요합니다.")
+        self.stages = list(stages)
+        self.queue_size = max(1, queue_size)
+        self.stats: Dict[str, StageStats] = {
+            stage.name: StageStats() for stage in self.stages
+        }
+
+    async def _feed(self, items, queue: asyncio.Queue, stats: StageStats, workers: int):
+        async def put(sequence, item):
+            await queue.put((sequence, item))
+            stats.observe_queue(queue.qsize())
+
+        if isinstance(items, AsyncIterable):
+            sequence = 0
+            async for item in items:
+                await put(sequence, item)
+                sequence += 1
+        else:
+            for sequence, item in enumerate(items):
+                await put(sequence, item)
+        for _ in range(workers):
+            await queue.put(_DONE)
+
+    async def run(self, items: Union[Iterable, AsyncIterable]) -> List[Any]:
+        """모든 항목을 단계 순서대로 처리하고 마지막 단계의 결과를 입력 순서대로 반환"""
+        queues = [asyncio.Queue(self.queue_size) for _ in self.stages]
+        workers = [max(1, stage.concurrency) for stage in self.stages]
+        remaining = list(workers)
+        results: Dict[int, Any] = {}
+
+        async def work(index: int):
+            stage, inbox = self.stages[index], queues[index]
+            stats = self.stats[stage.name]
+            last = index == len(self.stages) - 1
+            while True:
+                entry = await inbox.get()
+                stats.queue_depth = inbox.qsize()
+                if entry is _DONE:
+                    break
+                sequence, item = entry
+                started = time.perf_counter()
+                result = await stage.fn(item)
+                stats.busy_seconds += time.perf_counter() - started
+                stats.processed += 1
+                if last:
+                    results[sequence] = result
+                else:
+                    await queues[index + 1].put((sequence, result))
+                    self.stats[self.stages[index + 1].name].observe_queue(
+                        queues[index + 1].qsize()
+                    )
+
+            # 이 단계의 마지막 작업자가 끝나면 다음 단계 작업자들에게 종료를 알림
+            remaining[index] -= 1
+            if remaining[index] == 0 and not last:
+                for _ in range(workers[index + 1]):
+                    await queues[index + 1].put(_DONE)
+
+        tasks = [
+            asyncio.create_task(
+                self._feed(
+                    items, queues[0], self.stats[self.stages[0].name], workers[0]
+                )
+            )
+        ]
+        for index, count in enumerate(workers):
+            tasks.extend(asyncio.create_task(work(index)) for _ in range(count))
+
+        with _lock:
+            _active.add(self)
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            with _lock:
+                _active.discard(self)
+                for name, stats in self.stats.items():
+                    _merge(_stats.setdefault(name, StageStats()), stats)
+
+        return [results[sequence] for sequence in sorted(results)]
+
+
+async def _exit_prefetched(
+    entered: "asyncio.Task", context: AsyncContextManager, exc_info
+) -> bool:
+    """진입 Task를 정리하고 진입했으면 context를 닫음. context가 예외를 삼켰으면 True
+
+    진입이 실패했는데 블록이 그 결과를 await하지 않고 끝났으면 진입 예외를 올린다.
+    """
+    if not entered.done():
+        entered.cancel()
+    try:
+        await entered
+    except asyncio.CancelledError:
+        # 블록이 결과를 기다리지 않고 끝나서 취소한 진입은 닫을 것도 없음
+        if entered.cancelled():
+            return False
+        raise
+    except Exception:
+        if exc_info[0] is None:
+            raise
+        # 블록의 예외(보통 await한 진입 예외 그 자체)를 그대로 올림
+        return False
+    return bool(await context.__aexit__(*exc_info))
+
+
+@asynccontextmanager
+async def prefetch(context: AsyncContextManager) -> AsyncIterator["asyncio.Task"]:
+    """context 진입(원본 다운로드 등)을 백그라운드에서 시작하고 진입 결과의 Task를 반환
+
+    블록 안에서 다른 작업을 하다가 결과가 필요할 때 await한다.
+    블록을 나갈 때 진입이 끝났으면 블록의 예외와 함께 context를 닫고, 아직이면 취소한다.
+    블록이 await하지 않은 진입 예외(다운로드 오류 등)는 블록을 나갈 때 올린다.
+    """
+    entered = asyncio.create_task(context.__aenter__())
+    try:
+        yield entered
+    except BaseException:
+        if not await _exit_prefetched(entered, context, sys.exc_info()):
+            raise
+    else:
+        await _exit_prefetched(entered, context, (None, None, None))
@@ -0,0 +1,304 @@
+import asyncio
+import os
+import tempfile
+from collections import defaultdict
+from typing import Dict, List, NotRequired, Optional, Sequence, Tuple, TypedDict, Union
+
+import cv2
+import numpy as np
+
+from app.config import settings
+from app.modules.extract_text_style import extract_text_and_background_colors
+from app.modules.page_raster import DEFAULT_DPI, PageRasterCache, PageRasterizer
+from app.modules.render_pool import render_slot
+from app.modules.text_layer_style import text_layer_styles
+
+
+# 글자 잉크 높이(어센더 ~ 디센더)가 폰트 크기에서 차지하는 비율
+INK_HEIGHT_RATIO = 0.92
+# 획 두께가 폰트 크기의 이 비율 이상이면 굵은 글씨로 판단
+BOLD_STROKE_RATIO = 0.095
+# 배경과 이 거리(RGB) 이상 떨어진 픽셀이 없으면 글자 획이 없는 것으로 봄
+CORE_MIN_DISTANCE = 40
+
+
+class StyleBox(TypedDict):
+    pageNum: int  # 1부터 시작
+    boundingBox: List[float]  # [x0, y0, x1, y1], PDF 포인트
+
+
+class BoxStyle(TypedDict):
+    fontSize: float
+    color: List[int]  # RGB 0-255
+    bgColor: List[int]  # RGB 0-255
+    isBold: bool
+    font: NotRequired[str]  # 텍스트 레이어에서 찾은 경우만
+    method: str  # text_layer, raster, hybrid
+
+
+def _bgr_to_rgb255(color: Sequence[float]) -> List[int]:
+    """extract_text_and_background_colors의 BGR 0-1 색상을 style JSON의 RGB 0-255로 변환"""
+    return [int(round(c * 255)) for c in reversed(color)]
+
+
+def _ink_mask(roi: np.ndarray, text_color: np.ndarray, bg_color: np.ndarray) -> np.ndarray:
+    """배경색보다 텍스트 색에 가까운 픽셀"""
+    pixels = roi.astype(np.int32)
+    to_text = ((pixels - text_color) ** 2).sum(axis=2)
+    to_bg = ((pixels - bg_color) ** 2).sum(axis=2)
+    return to_text < to_bg
+
+
+def _stroke_core_color(roi: np.ndarray, bg_color: np.ndarray, text_color: np.ndarray) -> np.ndarray:
+    """글자 획 안쪽(배경에서 가장 먼 픽셀들)의 평균 색상
+
+    텍스트 마스크의 평균은 안티앨리어싱된 가장자리와 주변 배경이 섞인 색이므로
+    배경과의 거리가 최대값의 75% 이상인 픽셀만 사용한다.
+    """
+    distance = np.sqrt(((roi.astype(np.float64) - bg_color) ** 2).sum(axis=2))
+    if distance.max() < CORE_MIN_DISTANCE:
+        return text_color
+    return roi[distance >= distance.max() * 0.75].mean(axis=0)
+
+
+def measure_text_geometry(ink: np.ndarray, scale: float) -> Optional[Tuple[float, float]]:
+    """잉크 마스크에서 글자 크기와 획 두께를 추정
+
+    Args:
+        ink (np.ndarray): (높이, 너비) bool 마스크
+        scale (float): 픽셀 / 포인트
+
+    Returns:
+        Tuple[float, float]: (폰트 크기 pt, 폰트 크기 대비 획 두께), 잉크가 없으면 None
+    """
+    rows = ink.any(axis=1)
+    if not rows.any():
+        return None
+
+    # 잉크가 있는 연속된 행 묶음 = 텍스트 줄. 여러 줄이면 중앙값 사용
+    edges = np.diff(np.concatenate(([0], rows.astype(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    line_height = float(np.median(ends - starts)) / scale
+    font_size = line_height / INK_HEIGHT_RATIO
+
+    # 획 두께 = 2 * 면적 / 경계 픽셀 수 (가는 획의 양쪽 경계 길이 합으로 나눔)
+    area = int(ink.sum())
+    interior = cv2.erode(ink.astype(np.uint8), np.ones((3, 3), np.uint8))
+    perimeter = max(area - int(interior.sum()), 1)
+    stroke = 2 * area / perimeter / scale
+    return font_size, stroke / font_size
+
+
+def raster_style(img: np.ndarray, pixel_box: Sequence[int], box: Sequence[float], scale: float) -> BoxStyle:
+    """박스 영역 이미지에서 fontSize, color, bgColor, isBold를 추정
+
+    Args:
+        img (np.ndarray): 박스를 포함하는 BGR 이미지
+        pixel_box (Sequence[int]): 이미지 안에서의 박스 픽셀 좌표
+        box (Sequence[float]): [x0, y0, x1, y1] PDF 포인트 박스
+        scale (float): 픽셀 / 포인트
+    """
+    color = extract_text_and_background_colors(img, pixel_box)
+    text_color = np.array(color["text_color"]) * 255
+    bg_color = np.array(color["background_color"]) * 255
+    x0, y0, x1, y1 = pixel_box
+    roi = img[max(0, y0) : max(0, y1), max(0, x0) : max(0, x1)]
+
+    geometry = None
+    if roi.size:
+        text_color = _stroke_core_color(roi, bg_color, text_color)
+        geometry = measure_text_geometry(_ink_mask(roi, text_color, bg_color), scale)
+    if geometry is None:
+        # 잉크가 없으면 박스 높이를 최대 크기로 사용 (렌더링 시 박스에 맞게 줄어듦)
+        font_size, stroke_ratio = max(box[3] - box[1], 1), 0.0
+    else:
+        font_size, stroke_ratio = geometry
+
+    return {
+        "fontSize": round(font_size * 2) / 2,
+        "color": _bgr_to_rgb255(text_color / 255),
+        "bgColor": _bgr_to_rgb255(color["background_color"]),
+        "isBold": bool(stroke_ratio >= BOLD_STROKE_RATIO),
+        "method": "raster",
+    }
+
+
+def raster_styles(
+    rasterizer: PageRasterizer, page_num: int, boxes: Sequence[Sequence[float]]
+) -> List[BoxStyle]:
+    """박스 주변 영역만 래스터화해서 박스들의 스타일을 추정 (페이지 전체는 래스터화하지 않음)
+
+    Args:
+        rasterizer (PageRasterizer): 원본 문서, 영역은 rasterizer.dpi로 래스터화
+        page_num (int): 페이지 번호 (1부터 시작)
+        boxes (Sequence[Sequence[float]]): [x0, y0, x1, y1] PDF 포인트 박스 목록
+
+    Returns:
+        List[BoxStyle]: 박스 순서대로 fontSize, color, bgColor, isBold
+    """
+    scale = rasterizer.dpi / 72
+    styles = []
+    for box in boxes:
+        img, pixel_box = rasterizer.region_image(page_num - 1, box, rasterizer.dpi)
+        styles.append(raster_style(img, pixel_box, box, scale))
+    return styles
+
+
+def extract_page_styles(
+    rasterizer: PageRasterizer,
+    page_num: int,
+    boxes: Sequence[Sequence[float]],
+    use_text_layer: bool = True,
+) -> List[BoxStyle]:
+    """한 페이지의 박스들 스타일을 추출
+
+    텍스트 레이어에 글자가 있는 박스는 스팬의 폰트/크기/색상/굵기를 그대로 사용하고(text_layer),
+    글자가 없는 박스(스캔 페이지, 이미지)만 래스터로 추정한다(raster).
+    이미지 위의 텍스트는 배경색만 래스터에서 가져온다(hybrid).
+    래스터는 필요한 박스 주변만 래스터화한다.
+    """
+    styles: List[Optional[BoxStyle]] = [None] * len(boxes)
+    needs_background = set()
+    if use_text_layer:
+        page = rasterizer.pdf[page_num - 1]
+        for index, (style, raster_background) in enumerate(text_layer_styles(page, boxes)):
+            if style is not None:
+                styles[index] = {**style, "method": "text_layer"}
+                if raster_background:
+                    needs_background.add(index)
+
+    pending = [i for i, style in enumerate(styles) if style is None or i in needs_background]
+    if pending:
+        estimated = raster_styles(rasterizer, page_num, [boxes[i] for i in pending])
+        for index, style in zip(pending, estimated):
+            if styles[index] is None:
+                styles[index] = style
+            else:
+                styles[index]["bgColor"] = style["bgColor"]
+                styles[index]["method"] = "hybrid"
+    return styles
+
+
+def extract_pages_styles(
+    source: Union[bytes, str],
+    pages: Sequence[Tuple[int, Sequence[Sequence[float]]]],
+    dpi: int = DEFAULT_DPI,
+    use_text_layer: bool = True,
+) -> List[List[BoxStyle]]:
+    """여러 페이지의 스타일을 추정. 프로세스 풀에서 실행되는 작업 단위
+
+    Args:
+        source (Union[bytes, str]): 원본 PDF 바이트 또는 파일 경로
+        pages (Sequence[Tuple[int, boxes]]): (페이지 번호, 박스 목록) 목록
+        dpi (int): 박스 영역 래스터화 해상도
+
+    Returns:
+        List[List[BoxStyle]]: pages 순서대로 페이지별 박스 스타일
+    """
+    # 영역 이미지는 캐시하지 않으므로 공유 캐시도 쓰지 않음
+    with PageRasterizer(source, cache=PageRasterCache(0), dpi=dpi) as rasterizer:
+        return [
+            extract_page_styles(rasterizer, page_num, boxes, use_text_layer)
+            for page_num, boxes in pages
+        ]
+
+
+def group_boxes_by_page(boxes: Sequence[StyleBox]) -> Dict[int, List[int]]:
+    """페이지 번호 -> 해당 페이지 박스들의 입력 인덱스 (페이지 번호 순)"""
+    groups = defaultdict(list)
+    for index, box in enumerate(boxes):
+        groups[int(box["pageNum"])].append(index)
+    return dict(sorted(groups.items()))
+
+
+def split_pages(page_numbers: Sequence[int], parts: int) -> List[List[int]]:
+    """페이지 목록을 최대 parts개의 연속된 묶음으로 나눔"""
+    if not page_numbers:
+        return []
+    parts = max(1, min(parts, len(page_numbers)))
+    size = -(-len(page_numbers) // parts)
+    return [list(page_numbers[i : i + size]) for i in range(0, len(page_numbers), size)]
+
+
+def plan_style_tasks(
+    boxes: Sequence[StyleBox], parts: int
+) -> Tuple[Dict[int, List[int]], List[List[Tuple[int, List[Sequence[float]]]]]]:
+    """박스를 페이지별로 묶고, 페이지들을 최대 parts개의 작업(extract_pages_styles 인자)으로 나눔"""
+    groups = group_boxes_by_page(boxes)
+    tasks = [
+        [(page_num, [boxes[i]["boundingBox"] for i in groups[page_num]]) for page_num in chunk]
+        for chunk in split_pages(list(groups), parts)
+    ]
+    return groups, tasks
+
+
+def _assemble_styles(count, groups, tasks, results) -> List[BoxStyle]:
+    """작업별 결과를 입력 박스 순서로 되돌림"""
+    styles: List[Optional[BoxStyle]] = [None] * count
+    for task, task_styles in zip(tasks, results):
+        for (page_num, _), page_styles in zip(task, task_styles):
+            for index, style in zip(groups[page_num], page_styles):
+                styles[index] = style
+    return styles
+
+
+def extract_styles(
+    source: Union[bytes, str],
+    boxes: Sequence[StyleBox],
+    dpi: int = DEFAULT_DPI,
+    use_text_layer: bool = True,
+) -> List[BoxStyle]:
+    """문서 전체 박스의 스타일을 페이지별로 묶어서 추정 (현재 프로세스에서 실행)
+
+    Args:
+        source (Union[bytes, str]): 원본 PDF 바이트 또는 파일 경로
+        boxes (Sequence[StyleBox]): pageNum, boundingBox 목록
+        dpi (int): 박스 영역 래스터화 해상도
+        use_text_layer (bool): 텍스트 레이어를 먼저 사용할지 여부 (False면 모두 래스터로 추정)
+
+    Returns:
+        List[BoxStyle]: 입력 순서대로 박스 스타일
+    """
+    groups, tasks = plan_style_tasks(boxes, 1)
+    results = [extract_pages_styles(source, task, dpi, use_text_layer) for task in tasks]
+    return _assemble_styles(len(boxes), groups, tasks, results)
+
+
+async def extract_styles_async(
+    source: Union[bytes, str],
+    boxes: Sequence[StyleBox],
+    dpi: int = DEFAULT_DPI,
+    use_text_layer: bool = True,
+) -> List[BoxStyle]:
+    """extract_styles의 비동기 버전. 여러 페이지는 렌더링 프로세스 풀의 워커들에 나눠 처리
+
+    바이트 원본은 작업마다 pickle해서 보내지 않도록 임시 파일에 한 번만 쓰고 경로를 넘긴다.
+    """
+    groups, tasks = plan_style_tasks(boxes, settings.render_workers)
+    async with render_slot() as executor:
+        spool_path = None
+        if isinstance(source, bytes):
+            spool_path = await asyncio.to_thread(spool_source, source)
+            source = spool_path
+        try:
+            loop = asyncio.get_running_loop()
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        executor, extract_pages_styles, source, task, dpi, use_text_layer
+                    )
+                    for task in tasks
+                )
+            )
+        finally:
+            if spool_path is not None:
+                os.unlink(spool_path)
+    return _assemble_styles(len(boxes), groups, tasks, results)
+
+
+def spool_source(source: bytes) -> str:
+    """원본 바이트를 임시 PDF 파일로 쓰고 경로를 반환 (호출한 쪽에서 삭제)"""
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    with os.fdopen(fd, "wb") as f:
+        f.write(source)
+    return path
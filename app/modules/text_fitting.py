@@ -0,0 +1,112 @@
+from typing import List, Optional, Sequence
+
+import fitz  # PyMuPDF
+import numpy as np
+
+
+MIN_FONT_SIZE = 1
+
+
+def measure_unit_width(text: str, font: fitz.Font) -> float:
+    """폰트 크기 1pt 기준의 텍스트 너비를 측정
+
+    font.text_length는 폰트 크기에 정비례하므로 한 번의 측정으로
+    모든 폰트 크기에서의 너비를 계산할 수 있다.
+    """
+    return font.text_length(text, fontsize=1)
+
+
+def measure_unit_widths(texts: Sequence[str], fonts: Sequence[fitz.Font]) -> np.ndarray:
+    """여러 문단의 1pt 기준 텍스트 너비를 한 번에 측정
+
+    Args:
+        texts (Sequence[str]): 문단 텍스트 목록
+        fonts (Sequence[fitz.Font]): 문단별 폰트 (texts와 같은 길이)
+
+    Returns:
+        np.ndarray: 문단별 1pt 기준 너비
+    """
+    return np.fromiter(
+        (font.text_length(text, fontsize=1) for text, font in zip(texts, fonts)),
+        dtype=np.float64,
+        count=len(texts),
+    )
+
+
+def solve_font_size(
+    unit_width: float,
+    box_width: float,
+    box_height: float,
+    max_font_size: float,
+    min_font_size: float = MIN_FONT_SIZE,
+) -> Optional[float]:
+    """박스에 한 줄로 들어가는 가장 큰 폰트 크기를 계산
+
+    너비 조건(unit_width * size <= box_width), 높이 조건(size <= box_height),
+    요청된 최대 크기(size <= max_font_size)를 동시에 만족하는 최댓값을 구한다.
+
+    Args:
+        unit_width (float): 1pt 기준 텍스트 너비
+        box_width (float): 박스 너비
+        box_height (float): 박스 높이
+        max_font_size (float): 스타일에서 요청한 폰트 크기 (최대값)
+        min_font_size (float): 허용하는 최소 폰트 크기
+
+    Returns:
+        Optional[float]: 최적 폰트 크기, 최소 크기로도 맞출 수 없으면 None
+    """
+    size = min(max_font_size, box_height)
+    if unit_width > 0:
+        size = min(size, box_width / unit_width)
+
+    if size < min_font_size:
+        return None
+    return size
+
+
+def solve_font_sizes(
+    unit_widths: Sequence[float],
+    box_widths: Sequence[float],
+    box_heights: Sequence[float],
+    max_font_sizes: Sequence[float],
+    min_font_size: float = MIN_FONT_SIZE,
+) -> np.ndarray:
+    """solve_font_size의 벡터 버전. 한 페이지의 모든 문단을 한 번에 계산
+
+    Returns:
+        np.ndarray: 문단별 최적 폰트 크기, 맞출 수 없는 문단은 NaN
+    """
+    unit_widths = np.asarray(unit_widths, dtype=np.float64)
+    box_widths = np.asarray(box_widths, dtype=np.float64)
+
+    width_limit = np.full(unit_widths.shape, np.inf)
+    np.divide(box_widths, unit_widths, out=width_limit, where=unit_widths > 0)
+
+    sizes = np.minimum.reduce(
+        [
+            width_limit,
+            np.asarray(box_heights, dtype=np.float64),
+            np.broadcast_to(
+                np.asarray(max_font_sizes, dtype=np.float64), unit_widths.shape
+            ),
+        ]
+    )
+    sizes[sizes < min_font_size] = np.nan
+    return sizes
+
+
+def fit_font_sizes(
+    texts: Sequence[str],
+    fonts: Sequence[fitz.Font],
+    rects: np.ndarray,
+    max_font_sizes: Sequence[float],
+) -> List[Optional[float]]:
+    """텍스트와 박스 목록(N x 4, x0 y0 x1 y1)에 대한 최적 폰트 크기 목록"""
+    rects = np.asarray(rects, dtype=np.float64).reshape(-1, 4)
+    sizes = solve_font_sizes(
+        measure_unit_widths(texts, fonts),
+        rects[:, 2] - rects[:, 0],
+        rects[:, 3] - rects[:, 1],
+        max_font_sizes,
+    )
+    return [None if np.isnan(size) else float(size) for size in sizes]
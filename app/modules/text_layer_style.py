@@ -0,0 +1,125 @@
+from collections import defaultdict
+from typing import List, Optional, Sequence, Tuple
+
+import fitz  # PyMuPDF
+
+
+# 스팬 영역의 이 비율 이상이 박스 안에 있으면 박스에 속한 것으로 봄
+SPAN_OVERLAP_RATIO = 0.5
+BOLD_FONT_NAMES = ("Bold", "Black", "Heavy", "Semibold", "SemiBold")
+DEFAULT_BACKGROUND = [255, 255, 255]
+
+
+def _srgb_to_rgb(color: int) -> List[int]:
+    """get_text("dict")의 sRGB 정수 색상을 [r, g, b] 0-255로 변환"""
+    return [(color >> 16) & 255, (color >> 8) & 255, color & 255]
+
+
+def _fill_to_rgb(fill: Sequence[float]) -> List[int]:
+    """get_drawings()의 0-1 채움 색상(Gray, RGB, CMYK)을 [r, g, b] 0-255로 변환"""
+    if len(fill) == 1:
+        fill = (fill[0],) * 3
+    elif len(fill) == 4:
+        c, m, y, k = fill
+        fill = ((1 - c) * (1 - k), (1 - m) * (1 - k), (1 - y) * (1 - k))
+    return [int(round(v * 255)) for v in fill]
+
+
+def _is_bold(span: dict) -> bool:
+    return bool(span["flags"] & fitz.TEXT_FONT_BOLD) or any(
+        name in span["font"] for name in BOLD_FONT_NAMES
+    )
+
+
+def page_spans(page: fitz.Page) -> List[dict]:
+    """페이지의 텍스트 스팬 목록 (공백만 있는 스팬 제외)"""
+    text = page.get_text("dict", flags=fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES)
+    return [
+        span
+        for block in text["blocks"]
+        for line in block.get("lines", [])
+        for span in line["spans"]
+        if span["text"].strip()
+    ]
+
+
+def _spans_in_box(spans: Sequence[dict], box: fitz.Rect) -> List[dict]:
+    selected = []
+    for span in spans:
+        rect = fitz.Rect(span["bbox"])
+        area = rect.get_area()
+        if area and (rect & box).get_area() >= area * SPAN_OVERLAP_RATIO:
+            selected.append(span)
+    return selected
+
+
+def aggregate_spans(spans: Sequence[dict]) -> dict:
+    """박스 안 스팬들의 대표 스타일. 글자 수가 가장 많은 값을 사용
+
+    Returns:
+        dict: fontSize, color, font, isBold
+    """
+    sizes, colors, fonts = defaultdict(int), defaultdict(int), defaultdict(int)
+    bold_chars = total_chars = 0
+    for span in spans:
+        chars = len(span["text"].strip())
+        sizes[round(span["size"], 1)] += chars
+        colors[span["color"]] += chars
+        fonts[span["font"]] += chars
+        bold_chars += chars if _is_bold(span) else 0
+        total_chars += chars
+
+    return {
+        "fontSize": max(sizes, key=sizes.get),
+        "color": _srgb_to_rgb(max(colors, key=colors.get)),
+        "font": max(fonts, key=fonts.get),
+        "isBold": bold_chars * 2 > total_chars,
+    }
+
+
+def vector_background(drawings: Sequence[dict], box: fitz.Rect) -> Optional[List[int]]:
+    """박스 중심을 덮는 채움 도형 중 가장 나중에(위에) 그려진 것의 색상"""
+    center = fitz.Point((box.x0 + box.x1) / 2, (box.y0 + box.y1) / 2)
+    background = None
+    for drawing in drawings:
+        if drawing.get("fill") is not None and drawing["rect"].contains(center):
+            background = _fill_to_rgb(drawing["fill"])
+    return background
+
+
+def text_layer_styles(
+    page: fitz.Page, boxes: Sequence[Sequence[float]]
+) -> List[Tuple[Optional[dict], bool]]:
+    """텍스트 레이어에서 박스별 스타일을 추출
+
+    Args:
+        page (fitz.Page): PDF 페이지
+        boxes (Sequence[Sequence[float]]): [x0, y0, x1, y1] PDF 포인트 박스 목록
+
+    Returns:
+        List[Tuple[Optional[dict], bool]]: 박스별 (fontSize, color, bgColor, font, isBold 스타일,
+            배경색을 래스터에서 확인해야 하는지 여부). 박스 안에 텍스트가 없으면 스타일은 None
+    """
+    spans = page_spans(page)
+    if not spans:
+        # 스캔 페이지 등 텍스트 레이어가 없음
+        return [(None, False)] * len(boxes)
+
+    drawings = None
+    image_rects = [fitz.Rect(info["bbox"]) for info in page.get_image_info()]
+
+    results = []
+    for box in boxes:
+        rect = fitz.Rect(box)
+        box_spans = _spans_in_box(spans, rect)
+        if not box_spans:
+            results.append((None, False))
+            continue
+
+        if drawings is None:
+            drawings = page.get_drawings()
+        style = aggregate_spans(box_spans)
+        style["bgColor"] = vector_background(drawings, rect) or DEFAULT_BACKGROUND
+        # 이미지 위의 텍스트는 배경색을 도형에서 알 수 없음
+        results.append((style, any(rect.intersects(image) for image in image_rects)))
+    return results
@@ -1,6 +1,10 @@
 import fitz  # PyMuPDF
 
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+
+from app.modules.font_registry import FontFace, get_face_for_name
+from app.modules.page_writer import PageWriter
+from app.modules.text_fitting import MIN_FONT_SIZE, measure_unit_width, solve_font_size
 
 
 # def replace_text_in_box(
@@ -373,6 +377,53 @@ from typing import List, Tuple
 #         return None
 
 
+def text_origin(
+    font: fitz.Font,
+    box_rect: Tuple[float, float, float, float],
+    text: str,
+    font_size: float,
+    align: str = "left",
+) -> Tuple[float, float]:
+    """박스 안에서 가로 정렬, 세로 중앙 정렬한 텍스트 기준점 (x, y)"""
+    box_width = box_rect[2] - box_rect[0]
+    box_height = box_rect[3] - box_rect[1]
+    text_width = font.text_length(text, fontsize=font_size)
+
+    # 가로 정렬 위치 계산
+    if align == "left":
+        x_position = box_rect[0]
+    elif align == "center":
+        x_position = box_rect[0] + (box_width - text_width) / 2
+    else:  # right
+        x_position = box_rect[0] + (box_width - text_width)
+
+    # 세로 중앙 정렬 위치 계산
+    y_position = box_rect[1] + (box_height + font_size) / 2 - (font_size * 0.11)
+    return x_position, y_position
+
+
+def write_fitted_text(
+    writer: PageWriter,
+    box_rect: Tuple[float, float, float, float],
+    text: str,
+    font_size: float,
+    face: FontFace,
+    text_color: Tuple[float, float, float] = (0, 0, 0),
+    bg_color: Tuple[float, float, float] = (1.0, 1.0, 1.0),
+    align: str = "left",
+):
+    """이미 박스에 맞춘 폰트 크기로 배경과 텍스트 한 줄을 writer에 추가"""
+    writer.draw_background(box_rect, bg_color)
+    writer.insert_text(
+        text_origin(face.font, box_rect, text, font_size, align),
+        text,
+        font_size,
+        face,
+        text_color,
+        clip=box_rect,
+    )
+
+
 def replace_text_in_box_single_line(
     doc: fitz.Document,
     page_number: int,
@@ -383,74 +434,52 @@ def replace_text_in_box_single_line(
     text_color: Tuple[float, float, float] = (0, 0, 0),
     bg_color: Tuple[float, float, float] = (1.0, 1.0, 1.0),
     align: str = "left",
+    writer: Optional[PageWriter] = None,
 ) -> fitz.Document:
     """PDF 페이지의 특정 영역의 텍스트를 한 줄로 새로운 텍스트로 교체하고 변경된 PDF 반환
     텍스트 크기를 자동으로 조절하여 박스에 맞춤, 가로 정렬 및 세로 중앙 정렬 지원
     입력받은 font_size를 최대 크기로 제한
-    """
-    MIN_FONT_SIZE = 1
-    EPSILON = 0.5
 
+    writer가 주어지면 페이지에 바로 그리지 않고 writer에 추가만 하며,
+    실제 기록은 호출한 쪽에서 writer.commit()으로 페이지당 한 번 수행한다.
+    """
     try:
         if align not in ["left", "center", "right"]:
             raise ValueError(
                 "align 매개변수는 'left', 'center', 'right' 중 하나여야 합니다."
             )
 
-        font_path = "./fonts/KoPubWorld Dotum_Pro_Medium.otf"
-        if "Bold" in font_name:
-            font_path = "./fonts/KoPubWorld Dotum_Pro_Bold.otf"
-        
+        face = get_face_for_name(font_name)
+        font = face.font
+        font_path = face.path
+
         page = doc[page_number - 1]
 
         box_width = box_rect[2] - box_rect[0]
         box_height = box_rect[3] - box_rect[1]
 
-        def try_text_fitting(current_font_size: float) -> bool:
-            """주어진 폰트 크기로 텍스트가 박스에 맞는지 확인"""
-            if current_font_size < MIN_FONT_SIZE or current_font_size > font_size:
-                return False
-
-            font = fitz.Font(fontfile=font_path)
-            text_width = font.text_length(new_text, fontsize=current_font_size)
-            text_height = current_font_size
-
-            return text_width <= box_width and text_height <= box_height
-
-        # 이진 탐색으로 적절한 폰트 크기 찾기
-        left = MIN_FONT_SIZE
-        right = font_size
-        optimal_font_size = MIN_FONT_SIZE
+        # 텍스트 너비는 폰트 크기에 비례하므로 1pt 기준 너비로 최적 크기를 바로 계산
+        optimal_font_size = solve_font_size(
+            measure_unit_width(new_text, font),
+            box_width,
+            box_height,
+            font_size,
+            MIN_FONT_SIZE,
+        )
+        if optimal_font_size is None:
+            raise ValueError("텍스트를 박스에 맞출 수 없습니다.")
 
-        while (right - left) > EPSILON:
-            mid = (left + right) / 2
-            if try_text_fitting(mid):
-                optimal_font_size = mid
-                left = mid
-            else:
-                right = mid
+        if writer is not None:
+            write_fitted_text(
+                writer, box_rect, new_text, optimal_font_size, face, text_color, bg_color, align
+            )
+            return doc
 
-        if not try_text_fitting(optimal_font_size):
-            raise ValueError("텍스트를 박스에 맞출 수 없습니다.")
+        x_position, y_position = text_origin(font, box_rect, new_text, optimal_font_size, align)
 
         # 배경 사각형 그리기
         page.draw_rect(box_rect, color=None, fill=bg_color)
 
-        # 텍스트 정렬 및 삽입
-        font = fitz.Font(fontfile=font_path)
-        text_width = font.text_length(new_text, fontsize=optimal_font_size)
-
-        # 가로 정렬 위치 계산
-        if align == "left":
-            x_position = box_rect[0]
-        elif align == "center":
-            x_position = box_rect[0] + (box_width - text_width) / 2
-        else:  # right
-            x_position = box_rect[0] + (box_width - text_width)
-
-        # 세로 중앙 정렬 위치 계산
-        y_position = box_rect[1] + (box_height + optimal_font_size) / 2 - (optimal_font_size * 0.11)
-
         page.insert_text(
             point=(x_position, y_position),
             text=new_text,
@@ -1,10 +1,10 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
-from app.modules.extract_text_style import (
-    convert_pdf_to_image,
-    extract_text_and_background_colors,
-)
-from app.modules.google_document import GoogleDocumentBoundingPoly
+import numpy as np
+
+from app.modules.extract_text_style import extract_text_and_background_colors
+from app.modules.google_document import GoogleDocumentBoundingPoly, LayoutElements
+from app.modules.page_raster import PageRasterizer
 
 
 def normalize_to_point_coords(
@@ -76,6 +76,11 @@ def get_paragraph_text(pdf_metadata, paragraph):
     return pdf_metadata.text[int(textPart.startIndex) : int(textPart.endIndex)]
 
 
+def get_page_paragraph_texts(pdf_metadata, page) -> List[str]:
+    """페이지의 모든 문단 텍스트를 문단 객체를 만들지 않고 오프셋 배열로 한 번에 잘라냄"""
+    return page.paragraphs.texts(pdf_metadata.text)
+
+
 def get_rect_from_paragraph(pdf_metadata_dimension, pdf_dimension, paragraph):
     normalized_vertices = paragraph.layout.boundingPoly
     # 정규화된 좌표를 픽셀 좌표로 변환 -> 0.1 => 150
@@ -89,6 +94,85 @@ def get_rect_from_paragraph(pdf_metadata_dimension, pdf_dimension, paragraph):
     return [int(coord * scale) for coord in rect_vertices]
 
 
+def bounding_polys_to_rects(
+    vertices: np.ndarray,
+    page_width_pixels: float,
+    page_height_pixels: float,
+    scale: float = 1.0,
+    counts: Optional[np.ndarray] = None,
+    normalized: bool = True,
+) -> np.ndarray:
+    """여러 요소의 꼭짓점 배열을 한 번에 (x0, y0, x1, y1) 사각형으로 변환
+
+    요소별로 normalize_to_point_coords -> calculate_rect_from_coords -> scale 배 한 것과 같다.
+
+    Args:
+        vertices (np.ndarray): (N, V, 2) 꼭짓점 배열 (LayoutElements.normalized_vertices 또는 vertices)
+        page_width_pixels (float): 페이지의 너비 (픽셀)
+        page_height_pixels (float): 페이지의 높이 (픽셀)
+        scale (float): 픽셀 좌표에 곱할 값 (PDF 포인트 / 픽셀)
+        counts (Optional[np.ndarray]): (N,) 요소별 실제 꼭짓점 수. 이후의 채움 좌표는 무시
+        normalized (bool): 정규화 좌표이면 True (픽셀로 변환 후 반올림), 픽셀 좌표이면 False
+
+    Returns:
+        np.ndarray: (N, 4) float64 사각형. 꼭짓점이 없는 요소는 0
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    if normalized:
+        # round와 같은 짝수 반올림
+        vertices = np.round(vertices * (page_width_pixels, page_height_pixels))
+
+    if vertices.shape[1] == 0:
+        return np.zeros((len(vertices), 4))
+
+    if counts is not None:
+        counts = np.asarray(counts)
+    if counts is None or (counts == vertices.shape[1]).all():
+        lower, upper = vertices.min(axis=1), vertices.max(axis=1)
+    else:
+        valid = (np.arange(vertices.shape[1]) < counts[:, None])[..., None]
+        lower = np.where(valid, vertices, np.inf).min(axis=1)
+        upper = np.where(valid, vertices, -np.inf).max(axis=1)
+        lower[counts == 0] = upper[counts == 0] = 0
+
+    return np.concatenate((lower, upper), axis=1) * scale
+
+
+def get_rects_from_elements(
+    pdf_metadata_dimension, pdf_dimension, elements: LayoutElements
+) -> np.ndarray:
+    """페이지의 모든 문단(줄, 블록)에 대한 get_rect_from_paragraph를 한 번에 계산
+
+    Returns:
+        np.ndarray: (N, 4) int64 PDF 포인트 사각형 (소수점 버림)
+    """
+    rects = bounding_polys_to_rects(
+        elements.normalized_vertices,
+        pdf_metadata_dimension.width,
+        pdf_metadata_dimension.height,
+        scale=pdf_dimension[0] / pdf_metadata_dimension.width,
+        counts=elements.normalized_counts,
+    )
+    return np.trunc(rects).astype(np.int64)
+
+
+def get_point_rects_from_elements(
+    pdf_metadata_dimension, page_width_points: float, elements: LayoutElements
+) -> np.ndarray:
+    """스타일 추출용 PDF 포인트 사각형 (get_rect_style_from_paragraph와 같은 계산, 버림 없음)
+
+    Returns:
+        np.ndarray: (N, 4) float64, StyleBox의 boundingBox로 사용
+    """
+    return bounding_polys_to_rects(
+        elements.normalized_vertices,
+        pdf_metadata_dimension.width,
+        pdf_metadata_dimension.height,
+        scale=page_width_points / pdf_metadata_dimension.width,
+        counts=elements.normalized_counts,
+    )
+
+
 def get_rect(paragraph, pdf_metadata_dimension):
     normalized_vertices = paragraph.layout.boundingPoly
     # 정규화된 좌표를 픽셀 좌표로 변환 -> 0.1 => 150
@@ -100,11 +184,25 @@ def get_rect(paragraph, pdf_metadata_dimension):
 
 
 def get_rect_style_from_paragraph(
-    pdf_path: str, page_num, paragraph, pdf_metadata_dimension
+    pdf_path: str,
+    page_num,
+    paragraph,
+    pdf_metadata_dimension,
+    rasterizer: Optional[PageRasterizer] = None,
 ):
-    img = convert_pdf_to_image(pdf_path, page_num)
-    rect = get_rect(paragraph, pdf_metadata_dimension)
-    styles = extract_text_and_background_colors(img, rect)
+    # 같은 요청의 조회끼리 rasterizer를 공유하면 문서를 한 번만 열게 됨
+    owns_rasterizer = rasterizer is None
+    if owns_rasterizer:
+        rasterizer = PageRasterizer(pdf_path)
+    try:
+        # 페이지 전체 대신 박스 주변만 박스 높이에 맞는 해상도로 래스터화
+        scale = rasterizer.page_rect(page_num).width / pdf_metadata_dimension.width
+        rect = [coord * scale for coord in get_rect(paragraph, pdf_metadata_dimension)]
+        img, bbox = rasterizer.region_image(page_num, rect)
+    finally:
+        if owns_rasterizer:
+            rasterizer.close()
+    styles = extract_text_and_background_colors(img, bbox)
 
     result = {
         "text_color": styles["text_color"],
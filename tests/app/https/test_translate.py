@@ -0,0 +1,242 @@
+import functools
+import json
+import os
+import tempfile
+import threading
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+
+import fitz  # PyMuPDF
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.modules.pdf_cache import get_pdf_cache
+
+
+SAMPLE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "sample_files",
+)
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def pdf_server():
+    handler = functools.partial(QuietHandler, directory=SAMPLE_DIR)
+    server = HTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def make_payload(pdf_url):
+    return {
+        "original_pdf": pdf_url,
+        "output_filename": "translated.pdf",
+        "paragraphs": [
+            {
+                "pageNum": 1,
+                "boundingBox": ["50", "50", "400", "80"],
+                "originalText": "original",
+                "translatedText": "translated paragraph",
+                "style": json.dumps({"fontSize": 14}),
+            }
+        ],
+    }
+
+
+def test_process_pdf_v2_renders_in_pool(client, pdf_server):
+    response = client.post("/process_pdf_v2", json=make_payload(f"{pdf_server}/1.pdf"))
+
+    assert response.status_code == 200
+    assert response.headers["content-length"] == str(len(response.content))
+    assert response.headers["content-disposition"] == 'attachment; filename="translated.pdf"'
+    with fitz.open(stream=response.content, filetype="pdf") as doc:
+        assert "translated paragraph" in doc[0].get_text()
+
+
+def test_process_pdf_v2_spills_large_output_and_cleans_up(
+    client, pdf_server, monkeypatch
+):
+    monkeypatch.setattr(settings, "response_spill_bytes", 1)
+    created = []
+    original_mkdtemp = tempfile.mkdtemp
+
+    def tracking_mkdtemp(*args, **kwargs):
+        created.append(original_mkdtemp(*args, **kwargs))
+        return created[-1]
+
+    monkeypatch.setattr(tempfile, "mkdtemp", tracking_mkdtemp)
+
+    response = client.post("/process_pdf_v2", json=make_payload(f"{pdf_server}/1.pdf"))
+
+    assert response.status_code == 200
+    with fitz.open(stream=response.content, filetype="pdf") as doc:
+        assert "translated paragraph" in doc[0].get_text()
+    assert len(created) == 1
+    assert not os.path.exists(created[0])
+
+
+def test_process_pdf_v2_rejects_when_queue_is_full(client, pdf_server, monkeypatch):
+    monkeypatch.setattr(settings, "render_max_queue", 0)
+
+    response = client.post("/process_pdf_v2", json=make_payload(f"{pdf_server}/1.pdf"))
+
+    assert response.status_code == 503
+
+
+def test_process_pdf_v2_uses_source_cache(client, pdf_server, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "pdf_cache_dir", str(tmp_path))
+
+    for _ in range(2):
+        response = client.post(
+            "/process_pdf_v2", json=make_payload(f"{pdf_server}/1.pdf")
+        )
+        assert response.status_code == 200
+
+    stats = get_pdf_cache().get_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_extract_styles_returns_style_per_box(client, pdf_server):
+    with fitz.open(os.path.join(SAMPLE_DIR, "1.pdf")) as doc:
+        blocks = [list(block[:4]) for block in doc[0].get_text("blocks")[:3]]
+    payload = {
+        "original_pdf": f"{pdf_server}/1.pdf",
+        "boxes": [{"pageNum": 1, "boundingBox": block} for block in blocks],
+    }
+    response = client.post("/extract_styles", json=payload)
+
+    assert response.status_code == 200
+    styles = response.json()["styles"]
+    assert len(styles) == len(blocks)
+    for style in styles:
+        assert {"fontSize", "color", "bgColor", "isBold", "method"} <= set(style)
+        assert style["fontSize"] > 0
+
+
+def test_extract_styles_with_no_boxes(client, pdf_server):
+    payload = {"original_pdf": f"{pdf_server}/1.pdf", "boxes": []}
+    response = client.post("/extract_styles", json=payload)
+    assert response.status_code == 200
+    assert response.json() == {"styles": []}
+
+
+def test_extract_styles_rejects_unknown_page(client, pdf_server):
+    payload = {
+        "original_pdf": f"{pdf_server}/1.pdf",
+        "boxes": [{"pageNum": 999, "boundingBox": [0, 0, 10, 10]}],
+    }
+    response = client.post("/extract_styles", json=payload)
+    assert response.status_code == 400
+
+
+def test_process_pdf_ocr_renders_from_document_ai_json(client, pdf_server):
+    vertices = [{"x": 0.1, "y": 0.1}, {"x": 0.6, "y": 0.1}, {"x": 0.6, "y": 0.14}, {"x": 0.1, "y": 0.14}]
+    ocr_result = {
+        "text": "original\n",
+        "pages": [
+            {
+                "pageNumber": 1,
+                "dimension": {"width": 1758, "height": 2275, "unit": "pixels"},
+                "paragraphs": [
+                    {
+                        "layout": {
+                            "textAnchor": {"textSegments": [{"endIndex": "9"}]},
+                            "boundingPoly": {"normalizedVertices": vertices},
+                        }
+                    }
+                ],
+            }
+        ],
+    }
+    payload = {
+        "original_pdf": f"{pdf_server}/1.pdf",
+        "ocr_result": json.dumps(ocr_result),
+        "translations": [["translated from ocr"]],
+        "output_filename": "translated.pdf",
+    }
+    response = client.post("/process_pdf_ocr", json=payload)
+
+    assert response.status_code == 200
+    with fitz.open(stream=response.content, filetype="pdf") as doc:
+        assert "translated from ocr" in doc[0].get_text()
+
+    response = client.post("/process_pdf_ocr", json={**payload, "ocr_result": ""})
+    assert response.status_code == 400
+
+
+def test_process_pdf_ocr_pipelined_reports_stage_stats(client, pdf_server, monkeypatch):
+    monkeypatch.setattr(settings, "parallel_render_min_pages", 1)
+    vertices = [{"x": 0.1, "y": 0.1}, {"x": 0.6, "y": 0.1}, {"x": 0.6, "y": 0.14}, {"x": 0.1, "y": 0.14}]
+    paragraph = {"layout": {"boundingPoly": {"normalizedVertices": vertices}}}
+    ocr_result = {
+        "text": "",
+        "pages": [
+            {"dimension": {"width": 1758, "height": 2275, "unit": "pixels"}, "paragraphs": [paragraph]}
+        ],
+    }
+    payload = {
+        "original_pdf": f"{pdf_server}/1.pdf",
+        "ocr_result": json.dumps(ocr_result),
+        "translations": [["pipelined translation"]],
+        "output_filename": "translated.pdf",
+    }
+    response = client.post("/process_pdf_ocr", json=payload)
+
+    assert response.status_code == 200
+    with fitz.open(stream=response.content, filetype="pdf") as doc:
+        assert "pipelined translation" in doc[0].get_text()
+    stages = client.get("/pipeline_stats").json()["stages"]
+    assert stages["style"]["processed"] >= 1
+    assert stages["render"]["processed"] >= 1
+
+
+def test_classify_pages_returns_text_layer_paragraphs(client, pdf_server):
+    response = client.post("/classify_pages", json={"original_pdf": f"{pdf_server}/1.pdf"})
+
+    assert response.status_code == 200
+    result = response.json()
+    assert [page["kind"] for page in result["pages"]] == ["text_layer"] * 6
+    assert result["ocrPages"] == []
+    paragraph = result["paragraphs"][0]
+    assert set(paragraph) == {"pageNum", "boundingBox", "originalText", "translatedText", "style"}
+
+    # 번역문만 채우면 /process_pdf_v2에 그대로 보낼 수 있음
+    paragraph["translatedText"] = "translated"
+    payload = {
+        "original_pdf": f"{pdf_server}/1.pdf",
+        "output_filename": "translated.pdf",
+        "paragraphs": [paragraph],
+    }
+    assert client.post("/process_pdf_v2", json=payload).status_code == 200
+
+
+def test_classify_pages_marks_scanned_pages_for_ocr(client, pdf_server):
+    response = client.post(
+        "/classify_pages", json={"original_pdf": f"{pdf_server}/2.pdf", "page_number_limit": 3}
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["ocrPages"] == [1, 2, 3]
+    assert result["paragraphs"] == []
+
+
+def test_translation_memory_stats(client):
+    response = client.get("/translation_memory_stats")
+
+    assert response.status_code == 200
+    assert {"lookups", "lru_hits", "db_hits", "misses", "hit_rate"} <= set(response.json())
@@ -0,0 +1,93 @@
+import os
+
+import fitz  # PyMuPDF
+
+from app.modules.document_fonts import (
+    DocumentFonts,
+    embedded_font_bytes,
+    subset_document_fonts,
+)
+from app.modules.font_registry import get_face
+from app.modules.page_writer import PageWriter
+from app.modules.save_translated_pdf import save_pdf
+
+
+SAMPLE_PDF = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "sample_files",
+    "6.pdf",
+)
+
+
+def write_pages(doc, fonts):
+    for page in doc:
+        writer = PageWriter(page, fonts)
+        writer.insert_text((50, 100), "번역 text", 12, get_face(), (0, 0, 0))
+        writer.insert_text(
+            (50, 130), "굵게 bold", 12, get_face(weight="Bold"), (0, 0, 0)
+        )
+        writer.commit()
+
+
+def test_font_is_embedded_once_per_document():
+    doc = fitz.open(SAMPLE_PDF)
+    write_pages(doc, DocumentFonts(doc))
+
+    names = {"KoPubWorldDotum-Medium", "KoPubWorldDotum-Bold"}
+    xrefs = {font[0] for page in doc for font in page.get_fonts() if font[4] in names}
+    assert len(xrefs) == 2
+    assert all("text" in page.get_text() for page in doc)
+
+
+def test_page_fonts_are_read_once_per_page(monkeypatch):
+    doc = fitz.open()
+    for _ in range(3):
+        doc.new_page()
+    calls = []
+    get_fonts = fitz.Page.get_fonts
+
+    def counting_get_fonts(page, *args, **kwargs):
+        calls.append(page.number)
+        return get_fonts(page, *args, **kwargs)
+
+    monkeypatch.setattr(fitz.Page, "get_fonts", counting_get_fonts)
+    fonts = DocumentFonts(doc)
+    for page in doc:
+        fonts.use(page, get_face())
+    # 첫 임베드(insert_font) 안에서의 호출을 빼면 페이지마다 한 번
+    assert calls.count(1) == calls.count(2) == 1
+
+    calls.clear()
+    for page in doc:
+        for _ in range(20):
+            fonts.use(page, get_face())
+    assert calls == []
+
+
+def test_subset_reports_saved_bytes(tmp_path):
+    doc = fitz.open()
+    for _ in range(3):
+        doc.new_page()
+    write_pages(doc, DocumentFonts(doc))
+
+    before = embedded_font_bytes(doc)
+    report = subset_document_fonts(doc)
+
+    assert report["before"] == before
+    assert 0 < report["after"] < before
+    assert report["saved"] == before - report["after"]
+
+
+def test_save_pdf_subsets_fonts(tmp_path):
+    doc = fitz.open()
+    doc.new_page()
+    write_pages(doc, DocumentFonts(doc))
+    full_path = tmp_path / "full.pdf"
+    doc.save(full_path)
+
+    output_path = tmp_path / "subset.pdf"
+    assert save_pdf(doc, str(output_path))
+
+    assert os.path.getsize(output_path) < os.path.getsize(full_path) / 10
+    with fitz.open(output_path) as saved:
+        assert "bold" in saved[0].get_text()
@@ -0,0 +1,117 @@
+import os
+import time
+from collections import Counter
+
+import fitz  # PyMuPDF
+import numpy as np
+import pytest
+from sklearn.cluster import KMeans
+
+from app.modules.dominant_colors import dominant_colors, quantize_colors
+from app.modules.extract_text_style import (
+    _split_text_background,
+    extract_text_and_background_colors,
+    extract_text_and_background_colors_batch,
+)
+from app.modules.page_raster import render_page_image
+
+
+SAMPLE_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "sample_files")
+
+
+def get_dominant_colors(roi, n_colors=2, min_pixels=10):
+    """이전 구현의 대표 색상 추출 (KMeans, 비교용)"""
+    if len(roi) < min_pixels:
+        if len(roi) == 0:
+            return None
+        return [np.mean(roi, axis=0)]
+
+    try:
+        pixels = roi.reshape(-1, 3)
+        kmeans = KMeans(n_clusters=min(n_colors, len(pixels)), random_state=42, n_init=10)
+        kmeans.fit(pixels)
+
+        count = Counter(kmeans.labels_)
+        colors = [(count[i], color) for i, color in enumerate(kmeans.cluster_centers_)]
+        colors.sort(key=lambda item: item[0], reverse=True)
+        return [color for _, color in colors]
+    except Exception:
+        return [np.mean(roi, axis=0)]
+
+
+def test_mean_matches_single_cluster_kmeans():
+    rng = np.random.default_rng(0)
+    groups = [rng.integers(0, 256, size=(n, 3), dtype=np.uint8) for n in (50, 400, 3)]
+    colors = dominant_colors(groups)
+    for group, color in zip(groups, colors):
+        assert np.allclose(color, get_dominant_colors(group, n_colors=1)[0])
+
+
+def test_mode_picks_most_frequent_color():
+    # 흰 배경 70%, 빨간 글자 30% -> 평균은 분홍색이지만 mode는 흰색
+    pixels = np.array([[255, 255, 255]] * 70 + [[0, 0, 250]] * 30, dtype=np.uint8)
+    mean, mode = dominant_colors([pixels], "mean")[0], dominant_colors([pixels], "mode")[0]
+    assert mean == pytest.approx([178.5, 178.5, 253.5])
+    assert mode == pytest.approx([255, 255, 255])
+
+
+def test_empty_groups_return_none():
+    empty = np.zeros((0, 3), dtype=np.uint8)
+    assert dominant_colors([empty, np.full((4, 3), 9, np.uint8)])[0] is None
+    assert dominant_colors([empty]) == [None]
+    assert quantize_colors(np.array([[255, 0, 16]], np.uint8)).tolist() == [15 << 8 | 1]
+
+
+def test_batch_matches_single_box_calls():
+    img = np.full((60, 200, 3), 240, dtype=np.uint8)
+    img[20:40, 10:90] = (20, 20, 200)
+    boxes = [[0, 10, 100, 50], [150, 10, 151, 50], [120, 0, 200, 60]]
+    batch = extract_text_and_background_colors_batch(img, boxes)
+    assert batch == [extract_text_and_background_colors(img, box) for box in boxes]
+    assert batch[1]["method_used"] == "fallback_size_too_small"
+
+
+def kmeans_colors(img, box):
+    """이전 구현: 박스마다 텍스트/배경 픽셀에 KMeans(n_init=10)"""
+    x0, y0, x1, y1 = box
+    split = _split_text_background(img[y0:y1, x0:x1])
+    if split is None:
+        return None
+    text, background, _ = split
+    return (
+        get_dominant_colors(text, n_colors=1)[0],
+        get_dominant_colors(background, n_colors=1)[0],
+    )
+
+
+@pytest.mark.parametrize("sample", ["1.pdf", "3.pdf"])
+def test_parity_with_kmeans_on_sample_pages(sample):
+    """샘플 페이지의 텍스트 블록으로 기존 KMeans 결과와 비교하고 속도를 출력"""
+    with fitz.open(os.path.join(SAMPLE_DIR, sample)) as pdf:
+        page = pdf[0]
+        img = render_page_image(pdf, 0, 100)
+        scale = 100 / 72
+        boxes = [
+            [int(b[0] * scale), int(b[1] * scale), int(b[2] * scale), int(b[3] * scale)]
+            for b in page.get_text("blocks")
+        ][:40]
+    assert boxes
+
+    start = time.perf_counter()
+    expected = [kmeans_colors(img, box) for box in boxes]
+    kmeans_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = extract_text_and_background_colors_batch(img, boxes)
+    batch_seconds = time.perf_counter() - start
+
+    print(
+        f"\n{sample}: {len(boxes)} boxes, KMeans {kmeans_seconds * 1000:.1f}ms, "
+        f"batch {batch_seconds * 1000:.1f}ms ({kmeans_seconds / batch_seconds:.0f}x)"
+    )
+    for result, colors in zip(results, expected):
+        if colors is None:
+            continue
+        text, background = colors
+        assert result["text_color"] == pytest.approx(tuple(text / 255), abs=0.002)
+        assert result["background_color"] == pytest.approx(tuple(background / 255), abs=0.002)
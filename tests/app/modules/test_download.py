@@ -0,0 +1,127 @@
+import asyncio
+import gc
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import fitz  # PyMuPDF
+import pytest
+
+from app.modules import download
+from app.modules.download import (
+    DownloadTooLarge,
+    SpooledDownload,
+    download_pdf,
+    download_pdf_sync,
+)
+from app.modules.load_pdf import load_pdf_all
+
+
+def make_pdf(pages):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((50, 50), f"page {i + 1}")
+    return doc.tobytes()
+
+
+class PdfServer:
+    """/sized 는 Content-Length를 보내고, /chunked 는 보내지 않는 테스트 서버"""
+
+    def __init__(self, body):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                if self.path == "/sized":
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                for start in range(0, len(body), 1000):
+                    self.wfile.write(body[start : start + 1000])
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = HTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server.server_port}{path}"
+
+
+@pytest.fixture
+def pdf_body():
+    return make_pdf(3)
+
+
+@pytest.fixture
+def server(pdf_body):
+    server = PdfServer(pdf_body)
+    yield server
+    server.server.shutdown()
+
+
+async def fetch(url, sink):
+    # 테스트마다 새 이벤트 루프를 쓰므로 클라이언트도 새로 만듦
+    download._client = None
+    try:
+        return await download_pdf(url, sink)
+    finally:
+        await download.close_http_client()
+
+
+def test_small_download_stays_in_memory(server, pdf_body):
+    sink = asyncio.run(fetch(server.url("/sized"), SpooledDownload(spool_bytes=len(pdf_body))))
+    assert sink.finish() == pdf_body
+    assert sink.path is None
+
+
+def test_large_download_spools_to_file(server, pdf_body, tmp_path):
+    sink = SpooledDownload(spool_bytes=500, dir=str(tmp_path), hash_content=True)
+    asyncio.run(fetch(server.url("/chunked"), sink))
+    path = sink.finish()
+
+    assert isinstance(path, str) and os.path.dirname(path) == str(tmp_path)
+    with open(path, "rb") as f:
+        assert f.read() == pdf_body
+    assert sink.size == len(pdf_body)
+    assert sink.sha256 == hashlib.sha256(pdf_body).hexdigest()
+
+    sink.cleanup()
+    assert not os.listdir(tmp_path)
+
+
+@pytest.mark.parametrize("path", ["/sized", "/chunked"])
+def test_size_limit(server, pdf_body, tmp_path, path):
+    # Content-Length가 있으면 미리, 없으면 받는 도중에 거절하고 임시 파일을 남기지 않음
+    sink = SpooledDownload(max_bytes=len(pdf_body) - 1, spool_bytes=0, dir=str(tmp_path))
+    with pytest.raises(DownloadTooLarge):
+        asyncio.run(fetch(server.url(path), sink))
+    assert not os.listdir(tmp_path)
+
+
+def test_sync_download_matches_async(server, pdf_body):
+    sink = download_pdf_sync(server.url("/chunked"), SpooledDownload(spool_bytes=0))
+    path = sink.finish()
+    with open(path, "rb") as f:
+        assert f.read() == pdf_body
+    sink.cleanup()
+
+
+def test_load_pdf_from_url_removes_spooled_file(server, monkeypatch, tmp_path):
+    monkeypatch.setattr(download.settings, "download_spool_bytes", 0)
+    monkeypatch.setattr(download.tempfile, "tempdir", str(tmp_path))
+
+    pdf = load_pdf_all(url=server.url("/sized"))
+    # 문서가 열려 있는 동안은 임시 파일을 남겨 두고, 닫을 때 삭제
+    assert len(os.listdir(tmp_path)) == 1
+    assert pdf.page_count == 3
+    assert pdf[2].get_text().strip() == "page 3"
+    pdf.close()
+    assert not os.listdir(tmp_path)
+
+    # 닫지 않고 버린 문서도 GC될 때 삭제
+    pdf = load_pdf_all(url=server.url("/sized"))
+    assert len(os.listdir(tmp_path)) == 1
+    del pdf
+    gc.collect()
+    assert not os.listdir(tmp_path)
@@ -0,0 +1,72 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+from google.api_core.exceptions import InvalidArgument
+
+from app.config import settings
+from app.modules import extract_text, render_pool
+from app.modules.extract_text import google_detect_pdf_text
+from app.modules.ocr_client import OCRError
+from app.modules.page_images import iter_page_images
+from app.modules.render_pool import get_render_queue_depth
+
+
+SAMPLE_PDF = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "sample_files",
+    "1.pdf",
+)
+
+
+class FakeVisionClient:
+    def __init__(self):
+        self.images = []
+
+    def batch_annotate_images(self, requests):
+        responses = []
+        for request in requests:
+            self.images.append(request.image.content)
+            annotation = SimpleNamespace(description=f"text {len(self.images)}")
+            responses.append(
+                SimpleNamespace(text_annotations=[annotation], error=SimpleNamespace(message="", code=0))
+            )
+        return SimpleNamespace(responses=responses)
+
+
+def test_google_detect_pdf_text_sends_page_images_without_files():
+    client = FakeVisionClient()
+    with ThreadPoolExecutor(2) as executor:
+        texts = list(
+            google_detect_pdf_text(SAMPLE_PDF, client, pages=[0, 1, 2], dpi=36, executor=executor)
+        )
+
+    assert texts == [(0, "text 1"), (1, "text 2"), (2, "text 3")]
+    assert all(content.startswith(b"\x89PNG") for content in client.images)
+
+
+def test_ocr_error_closes_page_images_and_releases_render_slot(monkeypatch):
+    executor = ThreadPoolExecutor(2)
+    monkeypatch.setattr(render_pool, "get_render_executor", lambda: executor)
+    opened = []
+
+    def held_page_images(*args, **kwargs):
+        # 테스트가 참조를 갖고 있어서 GC로는 닫히지 않음
+        opened.append(iter_page_images(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(extract_text, "iter_page_images", held_page_images)
+    # 첫 페이지의 오류가 나머지 페이지를 읽기 전에 올라오도록 요청을 하나씩 보냄
+    monkeypatch.setattr(settings, "ocr_batch_size", 1)
+    monkeypatch.setattr(settings, "ocr_max_in_flight", 1)
+
+    class FailingClient:
+        def batch_annotate_images(self, requests):
+            raise InvalidArgument("bad image")
+
+    texts = google_detect_pdf_text(SAMPLE_PDF, FailingClient(), dpi=36)
+    with pytest.raises(OCRError):
+        next(texts)
+    assert opened[0].gi_frame is None
+    assert get_render_queue_depth() == 0
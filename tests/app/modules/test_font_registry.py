@@ -0,0 +1,44 @@
+import fitz  # PyMuPDF
+
+from app.modules.font_registry import (
+    get_face,
+    get_face_for_name,
+    get_registry_stats,
+    reset_registry,
+    resolve_face,
+)
+from app.modules.translate_text import replace_text_in_box_single_line
+
+
+def setup_function(function):
+    reset_registry()
+
+
+def test_resolve_face_by_font_name():
+    assert resolve_face("Helvetica") == ("KoPubWorld Dotum", "Medium")
+    assert resolve_face("Helvetica-Bold") == ("KoPubWorld Dotum", "Bold")
+    assert resolve_face("Helvetica-Bold-Italic") == ("KoPubWorld Dotum", "Bold")
+    assert resolve_face("NanumGothicCoding") == ("NanumGothicCoding", "Regular")
+
+
+def test_face_is_loaded_once_and_shared():
+    first = get_face("KoPubWorld Dotum", "Bold")
+    second = get_face_for_name("Arial-Bold")
+
+    assert first.font is second.font
+    assert first.metrics.space_width > 0
+    assert get_registry_stats() == {"hits": 1, "loads": 1, "faces": 1}
+
+
+def test_renderer_reuses_registry_fonts():
+    doc = fitz.open()
+    doc.new_page()
+
+    for i in range(5):
+        replace_text_in_box_single_line(
+            doc, 1, (10, 10 + i * 20, 200, 25 + i * 20), f"문단 {i}", 12
+        )
+
+    stats = get_registry_stats()
+    assert stats["loads"] == 1
+    assert stats["hits"] == 4
@@ -0,0 +1,235 @@
+import random
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.models.document import (
+    Base,
+    Document,
+    DocumentLine,
+    DocumentLineTranslation,
+    DocumentPage,
+)
+from app.modules import fuzzy_memory
+from app.modules.fuzzy_memory import (
+    FuzzyMemoryIndex,
+    load_fuzzy_index,
+    mask_segment,
+    mask_translation,
+)
+from app.modules.translation_memory import (
+    TranslationMemory,
+    get_translation_memory_stats,
+    reset_translation_memory_stats,
+)
+
+
+def test_masking_numbers_and_placeholders():
+    segment = mask_segment("Table 7 of 12: total {name} on 2024-11-06")
+    assert segment.values == ("7", "12", "{name}", "2024-11-06")
+    assert mask_segment("TABLE 3 of 4: Total {x} on 1/2").text == segment.text
+
+    # 다른 숫자의 일부는 바꾸지 않음
+    masked = mask_translation("12개 중 표 7 (1)", ("7", "12"))
+    assert masked == "\ue0011\ue002개 중 표 \ue0010\ue002 (1)"
+    # 값 위치를 확정할 수 없는 번역문
+    assert mask_translation("표 7, 행 7", ("7", "7")) is None
+    assert mask_translation("1000페이지", ("1,000",)) is None
+    assert mask_translation("7번 표 (7)", ("7",)) is None
+
+
+def test_numbers_only_difference_reuses_translation():
+    index = FuzzyMemoryIndex("en", "ko")
+    index.add_many(
+        [
+            ("Table 7", "표 7"),
+            ("See page 12 of 30", "30페이지 중 12페이지 참조"),
+            ("Net revenue for the year 2023", "2023년 순매출"),
+        ]
+    )
+
+    match = index.lookup("Table 12")
+    assert match.source == "Table 7"
+    assert match.translation == "표 12"
+    assert match.score == 1.0
+    # 어순이 바뀌어도 값은 원문 순서대로 채움
+    assert index.lookup("See page 3 of 4").translation == "4페이지 중 3페이지 참조"
+
+
+def test_ambiguous_values_are_not_reused():
+    index = FuzzyMemoryIndex("en", "ko")
+    index.add_many(
+        [
+            ("Table 7, row 7", "표 7, 행 7"),
+            ("Page 1,000", "1000페이지"),
+        ]
+    )
+
+    # 같은 값이 여러 번 나오면 어느 자리인지 알 수 없음
+    assert index.lookup("Table 12, row 3") is None
+    # 형식이 바뀐 숫자는 번역문에서 찾을 수 없음
+    assert index.lookup("Page 2,000") is None
+    # 값이 모두 같으면 번역문을 그대로 재사용
+    assert index.lookup("Table 7, row 7").translation == "표 7, 행 7"
+    assert index.lookup("page 1,000").translation == "1000페이지"
+
+    # 같은 원문을 값 위치를 알 수 있는 번역으로 추가하면 그 번역을 사용
+    index.add("Table 1, row 2", "표 1의 2행")
+    assert index.lookup("Table 12, row 3").translation == "표 12의 3행"
+
+
+def test_near_duplicate_scores_below_one():
+    index = FuzzyMemoryIndex("en", "ko")
+    index.add_many(
+        [
+            ("Net revenue for the year 2023", "2023년 순매출"),
+            (
+                "Operating expenses were higher than expected",
+                "영업비용이 예상보다 많았다",
+            ),
+        ]
+    )
+
+    match = index.lookup("Net revenues for the fiscal year 2024", min_score=0.5)
+    assert match.source == "Net revenue for the year 2023"
+    assert match.translation == "2024년 순매출"
+    assert 0.5 <= match.score < 1
+    assert index.lookup("Completely unrelated sentence", min_score=0.5) is None
+    assert index.lookup("Net revenues for the fiscal year 2024", min_score=0.95) is None
+
+
+def test_single_adds_are_found_before_and_after_merge(monkeypatch):
+    monkeypatch.setattr(fuzzy_memory, "MERGE_THRESHOLD", 3)
+    index = FuzzyMemoryIndex("en", "ko")
+    index.add_many([("Figure 1", "그림 1")])
+    for n, word in enumerate(["Appendix", "Chapter", "Section", "Exhibit"]):
+        index.add(f"{word} {n}", f"{word} 번역 {n}")
+
+    assert len(index) == 5
+    assert index.lookup("Figure 9").translation == "그림 9"
+    assert index.lookup("Exhibit 8").translation == "Exhibit 번역 8"
+    assert index.lookup("Appendix 5").translation == "Appendix 번역 5"
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'documents.db'}")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def test_loads_document_line_translations_and_memory(engine):
+    with Session(engine) as session:
+        document = Document(name="manual", filename="manual.pdf")
+        session.add(document)
+        session.flush()
+        page = DocumentPage(document_id=document.id, page_number=1)
+        session.add(page)
+        session.flush()
+        line = DocumentLine(
+            page_id=page.id, line_idx=0, text="Step 4: Tighten the screw"
+        )
+        session.add(line)
+        session.flush()
+        session.add(
+            DocumentLineTranslation(
+                line_id=line.id,
+                from_lang="en",
+                to_lang="ko",
+                text="Step 4: Tighten the screw",
+                translation="4단계: 나사를 조입니다",
+            )
+        )
+        session.commit()
+    TranslationMemory(engine).put_many(
+        "en", "ko", [("Warning: hot surface", "경고: 뜨거운 표면")]
+    )
+
+    index = load_fuzzy_index(engine, "en", "ko")
+
+    assert len(index) == 2
+    assert (
+        index.lookup("Step 9: Tighten the screw").translation
+        == "9단계: 나사를 조입니다"
+    )
+    assert index.lookup("Warning: hot surface!").source == "Warning: hot surface"
+    assert len(load_fuzzy_index(engine, "en", "ja")) == 0
+
+
+def test_translation_memory_skips_translator_for_fuzzy_hits(engine):
+    memory = TranslationMemory(engine)
+    calls = []
+
+    def translator(from_lang, to_lang, texts):
+        calls.append(list(texts))
+        return [f"[{to_lang}] {text}" for text in texts]
+
+    reset_translation_memory_stats()
+    assert memory.translate("en", "ko", ["Table 7", "Header"], translator, fuzzy=True) == [
+        "[ko] Table 7",
+        "[ko] Header",
+    ]
+    assert memory.translate(
+        "en", "ko", ["Table 12", "Header", "Footer"], translator, fuzzy=True
+    ) == [
+        "[ko] Table 12",
+        "[ko] Header",
+        "[ko] Footer",
+    ]
+    assert calls == [["Table 7", "Header"], ["Footer"]]
+    assert get_translation_memory_stats()["fuzzy_hits"] == 1
+    # 색인은 언어 쌍마다 한 번만 만들고 새 번역을 추가해서 재사용
+    assert memory.fuzzy_index("en", "ko") is memory.fuzzy_index("en", "ko")
+    assert len(memory.fuzzy_index("en", "ko")) == 3
+    # 재사용한 번역은 정확히 일치하는 항목으로 저장하지 않음
+    assert memory.get_many("en", "ko", ["Table 12", "Footer"]) == [None, "[ko] Footer"]
+
+    # 값 위치를 확정할 수 없는 번역은 재사용하지 않고 번역기로 보냄
+    memory.translate("en", "ko", ["Table 7, row 7"], translator, fuzzy=True)
+    assert memory.translate("en", "ko", ["Table 12, row 3"], translator, fuzzy=True) == [
+        "[ko] Table 12, row 3"
+    ]
+    assert calls[-1] == ["Table 12, row 3"]
+
+
+def test_lookup_benchmark():
+    """비슷한 원문 조회 속도 (문장 수가 많아져도 후보 몇 개만 비교)"""
+    rng = random.Random(0)
+    words = [
+        "".join(
+            rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9))
+        )
+        for _ in range(3000)
+    ]
+    segments = [
+        " ".join(rng.choice(words) for _ in range(rng.randint(6, 14))) + f" {n}"
+        for n in range(20000)
+    ]
+    index = FuzzyMemoryIndex("en", "ko")
+
+    start = time.perf_counter()
+    index.add_many((segment, segment.upper()) for segment in segments)
+    build_seconds = time.perf_counter() - start
+
+    queries = [segment.replace(" ", "  ", 1) + " ok" for segment in segments[:500]]
+    start = time.perf_counter()
+    matches = [index.lookup(query) for query in queries]
+    lookup_seconds = (time.perf_counter() - start) / len(queries)
+
+    print(
+        f"\n{len(segments)} segments: build {build_seconds:.2f}s, "
+        f"lookup {lookup_seconds * 1000:.3f}ms"
+    )
+    assert [match.source for match in matches] == segments[:500]
+
+
+def test_translation_memory_loads_fuzzy_index_from_database(engine):
+    TranslationMemory(engine).put_many("en", "ko", [("Figure 3", "그림 3")])
+    memory = TranslationMemory(engine)
+
+    def translator(from_lang, to_lang, texts):
+        raise AssertionError("번역기를 호출함")
+
+    assert memory.translate("en", "ko", ["Figure 8"], translator, fuzzy=True) == ["그림 8"]
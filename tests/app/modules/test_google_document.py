@@ -0,0 +1,127 @@
+import orjson
+import pytest
+
+from app.modules.google_document import GoogleDocument, GoogleDocumentParagraph
+from app.utils.dimension import (
+    get_page_paragraph_texts,
+    get_paragraph_text,
+    get_rect_from_paragraph,
+)
+
+
+TEXT = "Hello world\nSecond paragraph\nPage two\n"
+
+
+def element(start, end, box, orientation="PAGE_UP", languages=("en",)):
+    x0, y0, x1, y1 = box
+    segment = {"endIndex": str(end)}
+    if start:
+        segment["startIndex"] = str(start)  # Document AI는 0이면 startIndex를 생략
+    return {
+        "layout": {
+            "textAnchor": {"textSegments": [segment]},
+            "boundingPoly": {
+                "vertices": [
+                    {"x": int(x0 * 1000), "y": int(y0 * 1000)},
+                    {"x": int(x1 * 1000), "y": int(y0 * 1000)},
+                    {"x": int(x1 * 1000), "y": int(y1 * 1000)},
+                    {"x": int(x0 * 1000)},
+                ],
+                "normalizedVertices": [
+                    {"x": x0, "y": y0},
+                    {"x": x1, "y": y0},
+                    {"x": x1, "y": y1},
+                    {"x": x0, "y": y1},
+                ],
+            },
+            "orientation": orientation,
+        },
+        "detectedLanguages": [{"languageCode": code, "confidence": 0.9} for code in languages],
+    }
+
+
+def page(number, paragraphs):
+    return {
+        "pageNumber": number,
+        "dimension": {"width": 1758, "height": 2275, "unit": "pixels"},
+        "layout": element(0, 0, (0, 0, 1, 1))["layout"],
+        "blocks": paragraphs,
+        "paragraphs": paragraphs,
+        "lines": paragraphs,
+    }
+
+
+@pytest.fixture
+def document_json():
+    first = [
+        element(0, 12, (0.1, 0.1, 0.5, 0.12)),
+        element(12, 29, (0.1, 0.2, 0.6, 0.25), orientation="PAGE_RIGHT", languages=()),
+    ]
+    second = [element(29, 38, (0.2, 0.3, 0.4, 0.35))]
+    return orjson.dumps(
+        {"uri": "", "mimeType": "application/pdf", "text": TEXT, "pages": [page(1, first), page(2, second)]}
+    )
+
+
+def test_pages_are_materialized_lazily(document_json):
+    document = GoogleDocument.from_json(document_json)
+    assert len(document.pages) == 2
+    assert document.pages.materialized == 0
+
+    assert document.pages[1].page_number == 2
+    assert document.pages.materialized == 1
+    assert document.pages[1] is document.pages[-1]
+
+
+def test_paragraph_text_is_an_offset_slice(document_json):
+    document = GoogleDocument.from_json(document_json)
+    paragraphs = document.pages[0].paragraphs
+
+    assert paragraphs.text_offsets.tolist() == [[0, 12], [12, 29]]
+    assert get_page_paragraph_texts(document, document.pages[0]) == [
+        "Hello world\n",
+        "Second paragraph\n",
+    ]
+    assert [get_paragraph_text(document, p) for p in paragraphs] == paragraphs.texts(TEXT)
+
+
+def test_vertices_are_float_arrays(document_json):
+    paragraphs = GoogleDocument.from_json(document_json).pages[0].paragraphs
+    assert paragraphs.normalized_vertices.shape == (2, 4, 2)
+    assert paragraphs.normalized_vertices[1, 2].tolist() == [0.6, 0.25]
+    # 없는 좌표는 0
+    assert paragraphs.vertices[0, 3].tolist() == [100, 0]
+
+
+def test_polygons_with_many_vertices():
+    paragraph = element(0, 11, (0.1, 0.1, 0.5, 0.12))
+    polygon = [{"x": i / 200, "y": 0.5} for i in range(200)]
+    paragraph["layout"]["boundingPoly"]["normalizedVertices"] = polygon
+    document = orjson.dumps({"uri": "", "mimeType": "application/pdf", "text": TEXT, "pages": [page(1, [paragraph])]})
+
+    paragraphs = GoogleDocument.from_json(document).pages[0].paragraphs
+    assert paragraphs.normalized_counts.tolist() == [200]
+    assert len(paragraphs[0].layout.boundingPoly.normalizedVerticies) == 200
+
+
+def test_element_views_match_eager_objects(document_json):
+    raw = orjson.loads(document_json)["pages"][0]["paragraphs"]
+    document = GoogleDocument.from_json(document_json)
+    page = document.pages[0]
+
+    for view, data in zip(page.paragraphs, raw):
+        eager = GoogleDocumentParagraph.from_dict(data)
+        assert isinstance(view, GoogleDocumentParagraph)
+        assert repr(view) == repr(eager)
+        assert get_rect_from_paragraph(page.dimension, [612, 792], view) == get_rect_from_paragraph(
+            page.dimension, [612, 792], eager
+        )
+    assert page.paragraphs[1].layout.orientation == "PAGE_RIGHT"
+    assert page.paragraphs[1].detectedLanguages == []
+
+
+def test_objects_use_slots(document_json):
+    page = GoogleDocument.from_json(document_json).pages[0]
+    paragraph = page.paragraphs[0]
+    for obj in (page, paragraph, paragraph.layout, paragraph.layout.boundingPoly.normalizedVerticies[0]):
+        assert not hasattr(obj, "__dict__")
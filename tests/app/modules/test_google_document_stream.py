@@ -0,0 +1,104 @@
+import io
+
+import orjson
+import pytest
+
+from app.modules.google_document import GoogleDocument
+from app.modules.google_document_stream import GoogleDocumentReader, iter_document_pages
+
+
+# 괄호, 따옴표, 이스케이프가 문자열 안에 있어도 경계를 잘못 찾지 않아야 함
+TEXT = 'Say "hi" {not] json}\n\\ 한글 문단\n'
+
+
+def paragraph(start, end):
+    return {
+        "layout": {
+            "textAnchor": {"textSegments": [{"startIndex": str(start), "endIndex": str(end)}]},
+            "boundingPoly": {"normalizedVertices": [{"x": 0.1, "y": 0.1}, {"x": 0.5, "y": 0.1},
+                                                    {"x": 0.5, "y": 0.2}, {"x": 0.1, "y": 0.2}]},
+            "orientation": "PAGE_UP",
+        },
+    }
+
+
+def page(number):
+    return {
+        "pageNumber": number,
+        "dimension": {"width": 1758, "height": 2275, "unit": "pixels"},
+        "layout": paragraph(0, 0)["layout"],
+        "blocks": [],
+        "paragraphs": [paragraph(0, 21), paragraph(21, len(TEXT))],
+        "lines": [],
+        "tokens": [{"layout": {"orientation": "PAGE_UP"}, "note": "}]\"["}] * 3,
+    }
+
+
+def document(text_last=False, page_count=3):
+    pages = [page(n) for n in range(1, page_count + 1)]
+    if text_last:
+        data = {"pages": pages, "entities": [{"a": [1, 2.5, None, True]}], "text": TEXT, "uri": ""}
+    else:
+        data = {"uri": "", "mimeType": "application/pdf", "text": TEXT, "pages": pages}
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+
+class Unseekable(io.RawIOBase):
+    """파이프나 HTTP 응답처럼 seek할 수 없는 스트림"""
+
+    def __init__(self, data):
+        self._data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        return self._data.read(size)
+
+
+@pytest.mark.parametrize("text_last", [False, True])
+@pytest.mark.parametrize("chunk_size", [7, 1024 * 1024])
+def test_pages_match_eager_document(text_last, chunk_size):
+    data = document(text_last)
+    expected = GoogleDocument.from_json(data)
+
+    with GoogleDocumentReader(data, chunk_size=chunk_size) as reader:
+        pages = list(reader.pages())
+        assert reader.text == TEXT
+        assert reader.page_count == 3
+
+    assert [p.page_number for p in pages] == [1, 2, 3]
+    for streamed, eager in zip(pages, expected.pages):
+        assert repr(streamed) == repr(eager)
+        assert streamed.paragraphs.texts(TEXT) == ['Say "hi" {not] json}\n', "\\ 한글 문단\n"]
+
+
+@pytest.mark.parametrize("text_last", [False, True])
+def test_reads_unseekable_streams(text_last):
+    pages = list(iter_document_pages(Unseekable(document(text_last)), chunk_size=5))
+    assert [(text, p.page_number) for text, p in pages] == [(TEXT, 1), (TEXT, 2), (TEXT, 3)]
+
+
+def test_reads_from_path(tmp_path):
+    path = tmp_path / "document.json"
+    path.write_bytes(document(text_last=True, page_count=200))
+
+    with GoogleDocumentReader(str(path), chunk_size=4096) as reader:
+        for index, streamed in enumerate(reader.pages()):
+            assert streamed.page_number == index + 1
+        assert reader.page_count == 200
+        assert reader.uri == ""
+    assert reader._file.closed
+
+
+def test_text_is_known_before_first_page():
+    reader = GoogleDocumentReader(document(text_last=True))
+    pages = reader.pages()
+    next(pages)
+    assert reader.text == TEXT
+
+
+@pytest.mark.parametrize("data", [document()[:-40], b'{"text" 1}', b"[]"])
+def test_malformed_json_raises(data):
+    with pytest.raises(ValueError):
+        list(GoogleDocumentReader(data).pages())
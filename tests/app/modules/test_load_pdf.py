@@ -0,0 +1,24 @@
+import os
+
+from PIL import Image
+
+from app.modules.load_pdf import pdf_to_images
+from app.modules.render_pool import shutdown_render_pool
+
+
+SAMPLE_PDF = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "sample_files",
+    "1.pdf",
+)
+
+
+def test_pdf_to_images_writes_page_files(tmp_path):
+    try:
+        paths = pdf_to_images(SAMPLE_PDF, str(tmp_path))
+    finally:
+        shutdown_render_pool()
+
+    assert paths == [str(tmp_path / f"page_{i}.png") for i in range(1, 7)]
+    # pdf2image 기본값과 같은 200dpi
+    assert Image.open(paths[0]).size == (1700, 2200)
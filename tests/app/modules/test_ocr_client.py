@@ -0,0 +1,190 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from google.api_core.exceptions import InvalidArgument, ServiceUnavailable
+
+from app.modules.ocr_client import (
+    FakeOCRBackend,
+    OCRBackend,
+    OCRError,
+    OCRExecutor,
+    VisionOCRBackend,
+    get_ocr_stats,
+    reset_ocr_stats,
+)
+
+
+def make_pages(count):
+    return [(page_num, f"image {page_num}".encode()) for page_num in range(count)]
+
+
+def test_results_in_page_order_with_batches():
+    reset_ocr_stats()
+    pages = make_pages(23)
+    backend = FakeOCRBackend(max_batch_size=5)
+
+    with OCRExecutor(backend, max_in_flight=3, batch_size=8, retry_backoff=0) as ocr:
+        results = ocr.detect(pages)
+
+    assert [result.page_num for result in results] == list(range(23))
+    assert [result.text for result in results] == [FakeOCRBackend.text_for(c) for _, c in pages]
+    # 백엔드의 최대 묶음 크기를 넘지 않음
+    assert backend.calls == [5, 5, 5, 5, 3]
+    assert all(result.latency >= 0 and result.attempts == 1 for result in results)
+    stats = get_ocr_stats()
+    assert stats["pages"] == 23
+    assert stats["requests"] == 5
+
+
+class BarrierOCRBackend(FakeOCRBackend):
+    """요청 4개가 동시에 진행 중이어야 응답하는 백엔드 (순차로 보내면 시간 초과)"""
+
+    def __init__(self):
+        super().__init__(max_batch_size=1)
+        self.barrier = threading.Barrier(4, timeout=5)
+
+    def detect_batch(self, contents):
+        self.barrier.wait()
+        return super().detect_batch(contents)
+
+
+def test_requests_run_concurrently_up_to_in_flight_limit():
+    backend = BarrierOCRBackend()
+
+    with OCRExecutor(backend, max_in_flight=4, retry_backoff=0) as ocr:
+        results = ocr.detect(make_pages(16))
+
+    assert [result.page_num for result in results] == list(range(16))
+    assert len(backend.calls) == 16
+    assert backend.max_in_flight <= 4
+
+
+def test_reads_input_lazily():
+    consumed = []
+
+    def pages():
+        for page_num, content in make_pages(20):
+            consumed.append(page_num)
+            yield page_num, content
+
+    backend = FakeOCRBackend(max_batch_size=2, latency=0.01)
+    with OCRExecutor(backend, max_in_flight=2, retry_backoff=0) as ocr:
+        results = ocr.iter_results(pages())
+        assert next(results).page_num == 0
+        # 응답을 기다리는 요청 2개 분량만 읽음
+        assert len(consumed) == 4
+        results.close()
+
+
+def test_retries_transient_errors():
+    reset_ocr_stats()
+    backend = FakeOCRBackend(max_batch_size=4, fail_times=2)
+
+    with OCRExecutor(backend, max_in_flight=1, max_retries=3, retry_backoff=0) as ocr:
+        results = ocr.detect(make_pages(4))
+
+    assert [result.attempts for result in results] == [3] * 4
+    assert get_ocr_stats()["retries"] == 2
+
+
+def test_gives_up_after_max_retries():
+    reset_ocr_stats()
+    backend = FakeOCRBackend(fail_times=10)
+
+    with OCRExecutor(backend, max_retries=2, retry_backoff=0) as ocr:
+        with pytest.raises(OCRError):
+            ocr.detect(make_pages(3))
+
+    assert len(backend.calls) == 3
+    assert get_ocr_stats()["failures"] == 1
+
+
+class FakeVisionClient:
+    """errors: 요청 전체의 오류, image_errors: 이미지 내용 -> 차례로 돌려줄 gRPC 오류 코드"""
+
+    def __init__(self, errors=(), image_errors=None):
+        self.errors = list(errors)
+        self.image_errors = {content: list(codes) for content, codes in (image_errors or {}).items()}
+        self.calls = 0
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def response_for(self, content):
+        codes = self.image_errors.get(content)
+        if codes:
+            return SimpleNamespace(
+                text_annotations=[], error=SimpleNamespace(message="image error", code=codes.pop(0))
+            )
+        return SimpleNamespace(
+            text_annotations=[SimpleNamespace(description=content.decode())],
+            error=SimpleNamespace(message="", code=0),
+        )
+
+    def batch_annotate_images(self, requests):
+        with self.lock:
+            self.calls += 1
+            self.batches.append([request.image.content for request in requests])
+            if self.errors:
+                raise self.errors.pop(0)
+            responses = [self.response_for(request.image.content) for request in requests]
+        return SimpleNamespace(responses=responses)
+
+
+def test_vision_backend_uses_batch_annotate_and_retries_unavailable():
+    client = FakeVisionClient([ServiceUnavailable("busy")])
+
+    with OCRExecutor(VisionOCRBackend(client), batch_size=16, retry_backoff=0) as ocr:
+        results = ocr.detect(make_pages(20))
+
+    assert [result.text for result in results] == [f"image {i}" for i in range(20)]
+    # 16 + 4 페이지 요청, 첫 요청은 한 번 재시도
+    assert client.calls == 3
+
+
+def test_vision_backend_does_not_retry_invalid_request():
+    client = FakeVisionClient([InvalidArgument("bad image")])
+
+    with OCRExecutor(VisionOCRBackend(client), retry_backoff=0) as ocr:
+        with pytest.raises(OCRError):
+            ocr.detect(make_pages(1))
+
+    assert client.calls == 1
+
+
+def test_vision_backend_retries_only_failed_images():
+    reset_ocr_stats()
+    # 14: UNAVAILABLE (재시도 가능)
+    client = FakeVisionClient(image_errors={b"image 1": [14, 14], b"image 3": [14]})
+
+    with OCRExecutor(VisionOCRBackend(client), batch_size=16, retry_backoff=0) as ocr:
+        results = ocr.detect(make_pages(5))
+
+    assert [result.text for result in results] == [f"image {i}" for i in range(5)]
+    assert client.batches == [
+        [f"image {i}".encode() for i in range(5)],
+        [b"image 1", b"image 3"],
+        [b"image 1"],
+    ]
+    assert [result.attempts for result in results] == [1, 3, 1, 2, 1]
+    stats = get_ocr_stats()
+    assert (stats["pages"], stats["requests"], stats["retries"]) == (5, 3, 2)
+
+
+def test_vision_backend_image_error_that_is_not_retryable_fails_request():
+    # 3: INVALID_ARGUMENT
+    client = FakeVisionClient(image_errors={b"image 2": [3]})
+
+    with OCRExecutor(VisionOCRBackend(client), batch_size=16, retry_backoff=0) as ocr:
+        with pytest.raises(OCRError, match="image error"):
+            ocr.detect(make_pages(4))
+
+    assert client.calls == 1
+
+
+def test_backend_must_implement_detect_batch():
+    class Incomplete(OCRBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,129 @@
+import asyncio
+
+import fitz  # PyMuPDF
+import orjson
+import pytest
+
+from app.config import settings
+from app.modules.ocr_pipeline import (
+    build_ocr_render_plan,
+    render_ocr_pdf,
+    render_ocr_pdf_pipelined,
+)
+
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+TEXT = "Hello red\nOn blue\nPage two\n"
+
+
+def paragraph(start, end, rect):
+    x0, y0, x1, y1 = rect
+    corners = [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+    return {
+        "layout": {
+            "textAnchor": {"textSegments": [{"startIndex": str(start), "endIndex": str(end)}]},
+            "boundingPoly": {
+                "normalizedVertices": [{"x": x / PAGE_WIDTH, "y": y / PAGE_HEIGHT} for x, y in corners]
+            },
+            "orientation": "PAGE_UP",
+        }
+    }
+
+
+def ocr_page(number, paragraphs):
+    return {
+        "pageNumber": number,
+        "dimension": {"width": 1758, "height": 2275, "unit": "pixels"},
+        "paragraphs": paragraphs,
+    }
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    doc = fitz.open()
+    page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+    page.insert_text((72, 100), "Hello red", fontsize=20, color=(1, 0, 0))
+    page.draw_rect(fitz.Rect(60, 200, 400, 260), color=None, fill=(0, 0, 1))
+    page.insert_text((72, 240), "On blue", fontsize=24, color=(1, 1, 1))
+    page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+    page.insert_text((72, 100), "Page two", fontsize=12)
+    path = tmp_path / "source.pdf"
+    doc.save(path)
+    return str(path)
+
+
+@pytest.fixture
+def ocr_json():
+    return orjson.dumps(
+        {
+            "text": TEXT,
+            "pages": [
+                ocr_page(1, [paragraph(0, 10, (70, 82, 180, 106)), paragraph(10, 18, (70, 218, 180, 246))]),
+                ocr_page(2, [paragraph(18, 27, (70, 90, 150, 104))]),
+            ],
+        }
+    )
+
+
+def test_plan_uses_ocr_rects_and_text_layer_styles(pdf_path, ocr_json):
+    translations = [["Bonjour rouge", "Sur bleu"], ["Page deux"]]
+    plan = build_ocr_render_plan(pdf_path, ocr_json, translations)
+
+    assert sorted(plan.pages) == [1, 2]
+    first = plan.pages[1]
+    assert first.texts == ["Bonjour rouge", "Sur bleu"]
+    # round(70 / 612 * 1758) = 201 -> 201 * 612 / 1758 = 69.97 -> 69
+    assert first.boxes[0].tolist() == [69, 82, 179, 105]
+
+    red, blue = (plan.styles[i] for i in first.style_ids.tolist())
+    assert red.color == (1.0, 0.0, 0.0)
+    assert red.bg_color == (1.0, 1.0, 1.0)
+    assert red.font_size == 20
+    assert blue.color == (1.0, 1.0, 1.0)
+    assert blue.bg_color == (0.0, 0.0, 1.0)
+
+
+def test_paragraphs_without_translation_are_skipped(pdf_path, ocr_json):
+    # 두 번째 문단은 번역문이 비어 있고, 2페이지는 번역문이 없으며, 남는 번역문은 무시
+    plan = build_ocr_render_plan(pdf_path, ocr_json, [["Only first", " ", "extra", "more"]])
+    assert list(plan.pages) == [1]
+    assert plan.pages[1].texts == ["Only first"]
+
+    assert list(build_ocr_render_plan(pdf_path, ocr_json, [["a"], ["b"]], page_number_limit=1).pages) == [1]
+
+
+def test_render_ocr_pdf_draws_translations(pdf_path, ocr_json):
+    result = render_ocr_pdf(pdf_path, ocr_json, [["Bonjour rouge", "Sur bleu"], ["Page deux"]])
+
+    with fitz.open(stream=result, filetype="pdf") as doc:
+        first = doc[0].get_text()
+        assert "Bonjour rouge" in first and "Sur bleu" in first
+        assert "Page deux" in doc[1].get_text()
+        # 번역문은 OCR 문단 위치에 그려짐
+        [hit] = doc[0].search_for("Bonjour")
+        assert fitz.Rect(69, 82, 179, 105).contains(hit.tl)
+
+
+def test_pipelined_render_matches_single_process(pdf_path, ocr_json, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "pipeline_batch_pages", 1)
+    translations = [["Bonjour rouge", "Sur bleu"], ["Page deux"]]
+
+    async def download():
+        # 다운로드가 끝나기 전에 OCR 파싱이 시작됨
+        await asyncio.sleep(0.05)
+        with open(pdf_path, "rb") as f:
+            return f.read()
+
+    async def main():
+        return await render_ocr_pdf_pipelined(
+            asyncio.ensure_future(download()), ocr_json, translations, None, str(tmp_path)
+        )
+
+    result = asyncio.run(main())
+    expected = render_ocr_pdf(pdf_path, ocr_json, translations)
+
+    with fitz.open(stream=result, filetype="pdf") as doc, fitz.open(stream=expected, filetype="pdf") as ref:
+        assert len(doc) == len(ref) == 2
+        for page, ref_page in zip(doc, ref):
+            assert page.get_text() == ref_page.get_text()
+    assert sorted(p.name for p in tmp_path.glob("shard_*.pdf")) == ["shard_00001.pdf", "shard_00002.pdf"]
@@ -0,0 +1,87 @@
+import json
+
+import fitz  # PyMuPDF
+import pytest
+
+from app.modules.page_classification import (
+    HYBRID,
+    OCR,
+    TEXT_LAYER,
+    PageSignals,
+    classify_pages,
+    decide_page_kind,
+    glyph_validity,
+    iter_page_classifications,
+)
+
+
+def image_pixmap(width, height):
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, width, height), False)
+    pix.set_rect(pix.irect, (200, 200, 200))
+    return pix
+
+
+@pytest.fixture
+def mixed_pdf(tmp_path):
+    doc = fitz.open()
+    # 1: 텍스트만 있는 페이지
+    page = doc.new_page(width=500, height=400)
+    page.draw_rect(fitz.Rect(30, 40, 300, 90), color=None, fill=(0, 0, 0.6))
+    page.insert_text((40, 70), "Native heading", fontname="hebo", fontsize=20, color=(1, 1, 1))
+    page.insert_text((40, 150), "Body text on the page", fontsize=12)
+    # 2: 페이지 전체를 덮는 이미지 + 페이지 번호만 있는 스캔 페이지
+    page = doc.new_page(width=500, height=400)
+    page.insert_image(page.rect, pixmap=image_pixmap(50, 40))
+    page.insert_text((240, 390), "2", fontsize=8)
+    # 3: 텍스트 + 텍스트 없는 큰 그림
+    page = doc.new_page(width=500, height=400)
+    page.insert_text((40, 50), "Caption for the figure below", fontsize=12)
+    page.insert_image(fitz.Rect(40, 100, 340, 300), pixmap=image_pixmap(30, 20))
+    # 4: 이미지 위에 텍스트 레이어가 있는 검색 가능한 스캔
+    page = doc.new_page(width=500, height=400)
+    page.insert_image(page.rect, pixmap=image_pixmap(50, 40))
+    for y in range(60, 380, 40):
+        page.insert_text((40, y), "Searchable scan text line", fontsize=14, render_mode=3)
+    path = tmp_path / "mixed.pdf"
+    doc.save(path)
+    return str(path)
+
+
+def test_classifies_each_page(mixed_pdf):
+    results = list(iter_page_classifications(mixed_pdf))
+
+    assert [result.kind for result in results] == [TEXT_LAYER, OCR, HYBRID, TEXT_LAYER]
+    assert results[1].paragraphs == []
+    assert results[1].ocr_regions == [[0, 0, 500, 400]]
+    assert results[2].ocr_regions == [[40, 100, 340, 300]]
+    assert results[3].signals.image_coverage == 0
+
+
+def test_text_layer_paragraphs_have_render_shape(mixed_pdf):
+    heading, body = next(iter_page_classifications(mixed_pdf)).paragraphs
+
+    assert heading["pageNum"] == 1
+    assert heading["originalText"] == "Native heading"
+    assert body["originalText"] == "Body text on the page"
+    x0, y0, x1, y1 = map(float, heading["boundingBox"])
+    assert 38 < x0 < 42 and 40 < y0 < y1 < 90
+    style = json.loads(heading["style"])
+    assert style["isBold"] is True
+    assert style["fontSize"] == 20
+    assert style["color"] == [255, 255, 255]
+    assert style["bgColor"] == [0, 0, 153]
+
+
+def test_classify_pages_lists_ocr_pages(mixed_pdf):
+    result = classify_pages(mixed_pdf, page_number_limit=3)
+
+    assert [page["kind"] for page in result["pages"]] == [TEXT_LAYER, OCR, HYBRID]
+    assert result["ocrPages"] == [2, 3]
+    assert {paragraph["pageNum"] for paragraph in result["paragraphs"]} == {1, 2, 3} - {2}
+
+
+def test_unmapped_glyphs_need_ocr():
+    assert glyph_validity("abc ��") == pytest.approx(0.6)
+    assert glyph_validity("  ") == 0
+    signals = PageSignals(word_count=10, text_coverage=0.3, image_coverage=0, glyph_validity=0.5)
+    assert decide_page_kind(signals) == OCR
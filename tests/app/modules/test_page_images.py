@@ -0,0 +1,156 @@
+import io
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+import fitz  # PyMuPDF
+import pytest
+from PIL import Image
+
+from app.config import settings
+from app.modules import render_pool
+from app.modules.page_images import encode_page_images, iter_page_images
+from app.modules.render_pool import RenderQueueFull, get_render_queue_depth
+
+
+SAMPLE_PDF = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "sample_files",
+    "1.pdf",
+)
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """제출됐지만 아직 결과를 가져가지 않은 작업 수를 기록하는 스레드 풀"""
+
+    def __init__(self):
+        super().__init__(2)
+        self.outstanding = 0
+        self.max_outstanding = 0
+
+    def submit(self, fn, *args, **kwargs):
+        self.outstanding += 1
+        self.max_outstanding = max(self.max_outstanding, self.outstanding)
+        future = super().submit(fn, *args, **kwargs)
+        result = future.result
+
+        def counted_result(timeout=None):
+            self.outstanding -= 1
+            return result(timeout)
+
+        future.result = counted_result
+        return future
+
+
+@pytest.mark.parametrize("fmt, magic", [("png", b"\x89PNG"), ("jpeg", b"\xff\xd8"), ("webp", b"RIFF")])
+def test_formats_decode_to_page_size(fmt, magic):
+    with ThreadPoolExecutor(2) as executor:
+        images = list(iter_page_images(SAMPLE_PDF, [0, 1], dpi=72, fmt=fmt, executor=executor))
+
+    assert [page_num for page_num, _ in images] == [0, 1]
+    for _, content in images:
+        assert content.startswith(magic)
+        # 612 x 792pt 페이지를 72dpi로 렌더링
+        assert Image.open(io.BytesIO(content)).size == (612, 792)
+
+
+def test_matches_serial_render_in_page_order():
+    with open(SAMPLE_PDF, "rb") as f:
+        source = f.read()
+    expected = encode_page_images(source, range(6), dpi=50)
+
+    with CountingExecutor() as executor:
+        images = list(
+            iter_page_images(source, dpi=50, executor=executor, pages_per_task=2, max_pending=2)
+        )
+
+    assert [page_num for page_num, _ in images] == list(range(6))
+    assert [content for _, content in images] == expected
+    # 메모리에는 max_pending개의 작업 결과만 올라감
+    assert executor.max_outstanding == 2
+
+
+def test_stopping_early_cancels_pending_work():
+    with CountingExecutor() as executor:
+        images = iter_page_images(SAMPLE_PDF, dpi=36, executor=executor, max_pending=2, pages_per_task=1)
+        assert next(images)[0] == 0
+        images.close()
+        assert executor.max_outstanding == 2
+
+
+def test_process_pool_spools_bytes_source_once():
+    with open(SAMPLE_PDF, "rb") as f:
+        source = f.read()
+    before = set(os.listdir(tempfile.gettempdir()))
+
+    with ProcessPoolExecutor(2, mp_context=multiprocessing.get_context("spawn")) as executor:
+        images = list(iter_page_images(source, [4, 2], dpi=36, fmt="jpeg", executor=executor))
+
+    assert [page_num for page_num, _ in images] == [4, 2]
+    pdf = fitz.open(SAMPLE_PDF)
+    assert Image.open(io.BytesIO(images[0][1])).size == tuple(
+        round(v / 2) for v in pdf[4].rect[2:]
+    )
+    # 임시 파일은 끝나면 지움
+    assert set(os.listdir(tempfile.gettempdir())) - before == set()
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        list(iter_page_images(SAMPLE_PDF, [0], fmt="tiff", executor=ThreadPoolExecutor(1)))
+
+
+def test_shared_pool_takes_render_slot(monkeypatch):
+    executor = ThreadPoolExecutor(1)
+    monkeypatch.setattr(render_pool, "get_render_executor", lambda: executor)
+
+    images = iter_page_images(SAMPLE_PDF, [0, 1], dpi=36)
+    next(images)
+    # 이미지를 읽는 동안 렌더링 대기열 한 자리를 차지하고, 끝나면 돌려줌
+    assert get_render_queue_depth() == 1
+    images.close()
+    assert get_render_queue_depth() == 0
+
+    monkeypatch.setattr(settings, "render_max_queue", 0)
+    with pytest.raises(RenderQueueFull):
+        next(iter_page_images(SAMPLE_PDF, [0], dpi=36))
+    # 풀을 직접 넘기면 대기열 제한을 받지 않음
+    assert len(list(iter_page_images(SAMPLE_PDF, [0], dpi=36, executor=executor))) == 1
+
+
+class HeldExecutor(Executor):
+    """첫 작업만 바로 실행하고 나머지는 release가 될 때까지 붙잡아 두는 풀 (스레드 풀이 아님)"""
+
+    def __init__(self):
+        self.pool = ThreadPoolExecutor(2)
+        self.release = threading.Event()
+        self.finished = []
+        self.submitted = 0
+
+    def submit(self, fn, *args, **kwargs):
+        first = self.submitted == 0
+        self.submitted += 1
+
+        def run():
+            if not first:
+                self.release.wait(5)
+            result = fn(*args, **kwargs)
+            self.finished.append(args[1])
+            return result
+
+        return self.pool.submit(run)
+
+
+def test_close_waits_for_running_tasks_before_removing_spool():
+    with open(SAMPLE_PDF, "rb") as f:
+        source = f.read()
+    executor = HeldExecutor()
+
+    images = iter_page_images(source, [0, 1], dpi=36, executor=executor, pages_per_task=1, max_pending=2)
+    assert next(images)[0] == 0
+    # 두 번째 작업은 실행 중이라 취소되지 않음. 닫을 때 끝날 때까지 기다린 뒤 임시 파일을 지움
+    threading.Timer(0.05, executor.release.set).start()
+    images.close()
+    assert executor.finished == [[0], [1]]
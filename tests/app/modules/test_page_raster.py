@@ -0,0 +1,122 @@
+import fitz  # PyMuPDF
+import numpy as np
+import pytest
+
+from app.modules.extract_text_style import (
+    convert_pdf_to_image,
+    extract_text_and_background_colors,
+)
+from app.modules.page_raster import (
+    PageRasterCache,
+    PageRasterizer,
+    adaptive_dpi,
+    render_page_image,
+)
+
+
+def make_pdf(path, pages=3):
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page(width=200, height=100)
+        # 페이지마다 다른 배경색을 칠해서 어느 페이지가 렌더링됐는지 구분
+        page.draw_rect(page.rect, color=None, fill=(i / pages, 1, 1))
+        page.insert_text((20, 50), f"page {i + 1}", fontsize=20, color=(1, 0, 0))
+    doc.save(path)
+    return str(path)
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    return make_pdf(tmp_path / "sample.pdf")
+
+
+def test_renders_only_requested_page(pdf_path):
+    cache = PageRasterCache(max_bytes=10 * 1024 * 1024)
+    with PageRasterizer(pdf_path, cache=cache, dpi=72) as rasterizer:
+        img = rasterizer.page_image(2)
+
+    assert img.shape == (100, 200, 3)
+    # BGR: 빨간색 채널이 마지막, 세 번째 페이지 배경은 R = 2/3
+    assert tuple(img[5, 5]) == (255, 255, round(2 / 3 * 255))
+    assert not img.flags.writeable
+    assert cache.get_stats()["pages"] == 1
+
+
+def test_cache_shared_between_rasterizers(pdf_path):
+    cache = PageRasterCache(max_bytes=10 * 1024 * 1024)
+    first = PageRasterizer(pdf_path, cache=cache, dpi=72).page_image(0)
+    again = PageRasterizer(pdf_path, cache=cache, dpi=72).page_image(0)
+    other_dpi = PageRasterizer(pdf_path, cache=cache, dpi=144).page_image(0)
+
+    assert again is first
+    assert other_dpi.shape == (200, 400, 3)
+    assert cache.get_stats()["hits"] == 1
+    assert cache.get_stats()["misses"] == 2
+
+
+def test_bytes_and_path_sources_render_the_same(pdf_path):
+    with open(pdf_path, "rb") as f:
+        data = f.read()
+    cache = PageRasterCache(max_bytes=10 * 1024 * 1024)
+    from_bytes = PageRasterizer(data, cache=cache, dpi=72).page_image(1)
+    from_path = PageRasterizer(pdf_path, cache=cache, dpi=72).page_image(1)
+    assert np.array_equal(from_bytes, from_path)
+
+
+def test_lru_eviction_by_bytes(pdf_path):
+    page_bytes = 100 * 200 * 3
+    cache = PageRasterCache(max_bytes=2 * page_bytes)
+    rasterizer = PageRasterizer(pdf_path, cache=cache, dpi=72)
+    rasterizer.page_image(0)
+    rasterizer.page_image(1)
+    rasterizer.page_image(0)  # 0번 페이지를 최근 사용으로
+    rasterizer.page_image(2)  # 1번 페이지가 제거됨
+
+    stats = cache.get_stats()
+    assert stats == {"hits": 1, "misses": 3, "evictions": 1, "pages": 2, "bytes": 2 * page_bytes}
+    assert cache.get((rasterizer.fingerprint, 1, 72)) is None
+    assert cache.get((rasterizer.fingerprint, 0, 72)) is not None
+
+
+def test_convert_pdf_to_image_feeds_color_extraction(pdf_path):
+    img = convert_pdf_to_image(pdf_path, 0)
+    # 기본 200dpi: 200pt x 100pt 페이지
+    assert img.shape == (278, 556, 3)
+
+    styles = extract_text_and_background_colors(img, [40, 80, 300, 150])
+    assert styles["background_color"] == pytest.approx((1, 1, 0), abs=0.05)
+    # 텍스트 마스크는 글자 주변까지 포함하므로 빨간색 쪽으로 치우친 정도만 확인
+    assert styles["text_color"][2] > styles["background_color"][2] + 0.3
+
+
+def test_adaptive_dpi_follows_box_height():
+    assert adaptive_dpi(8) == 300  # 각주: 최대 dpi로 제한
+    assert adaptive_dpi(64) == 72  # 큰 제목: 최소 dpi 이상
+    assert adaptive_dpi(32) == 144
+
+
+def test_region_image_covers_only_padded_box(pdf_path):
+    rasterizer = PageRasterizer(pdf_path, cache=PageRasterCache(0))
+    box = (15, 30, 95, 60)
+    img, bbox = rasterizer.region_image(0, box, dpi=144)
+    rasterizer.close()
+
+    # 패딩: 짧은 변(30pt)의 20% = 6pt, 양쪽에 추가
+    assert img.shape[:2] == pytest.approx(((30 + 12) * 2, (80 + 12) * 2), abs=2)
+    assert bbox == [12, 12, 12 + 160, 12 + 60]
+
+    # 전체 페이지를 같은 dpi로 렌더링한 결과의 같은 영역과 일치
+    with fitz.open(pdf_path) as pdf:
+        page = render_page_image(pdf, 0, 144)
+    x0, y0 = 15 * 2 - bbox[0], 30 * 2 - bbox[1]
+    assert np.array_equal(img, page[y0 : y0 + img.shape[0], x0 : x0 + img.shape[1]])
+
+
+def test_region_colors_match_full_page(pdf_path):
+    rasterizer = PageRasterizer(pdf_path, cache=PageRasterCache(0))
+    img, bbox = rasterizer.region_image(0, (15, 30, 95, 60))
+    rasterizer.close()
+
+    styles = extract_text_and_background_colors(img, bbox)
+    assert styles["background_color"] == pytest.approx((1, 1, 0), abs=0.05)
+    assert img.nbytes < 100 * 1024
@@ -0,0 +1,104 @@
+import fitz  # PyMuPDF
+
+from app.modules.page_writer import PageWriter
+from app.modules.translate_text import replace_text_in_box_single_line
+
+
+def test_commit_merges_consecutive_same_colored_backgrounds():
+    doc = fitz.open()
+    page = doc.new_page()
+    writer = PageWriter(page)
+
+    writer.draw_background((0, 0, 10, 10), (1, 1, 1))
+    writer.draw_background((10, 0, 20, 10), (1, 1, 1))
+    writer.draw_background((20, 0, 30, 10), (1, 0, 0))
+    writer.draw_background((30, 0, 40, 10), (1, 1, 1))
+
+    assert writer.commit() == 3
+    fills = [path["fill"] for path in page.get_drawings()]
+    assert fills == [(1.0, 1.0, 1.0), (1.0, 0.0, 0.0), (1.0, 1.0, 1.0)]
+    assert len(writer) == 0
+
+
+def test_commit_writes_content_stream_once():
+    doc = fitz.open()
+    page = doc.new_page()
+    writer = PageWriter(page)
+
+    for i in range(50):
+        replace_text_in_box_single_line(
+            doc, 1, (10, i * 15, 300, i * 15 + 12), f"row {i}", 10, writer=writer
+        )
+    assert page.get_text() == ""
+
+    writer.commit()
+
+    assert len(page.get_contents()) == 1
+    text = page.get_text()
+    assert "row 0" in text and "row 49" in text
+
+
+def test_batched_output_matches_direct_drawing():
+    direct = fitz.open()
+    direct.new_page()
+    batched = fitz.open()
+    batched_page = batched.new_page()
+    writer = PageWriter(batched_page)
+
+    for i, text in enumerate(["first", "second", "third"]):
+        box = (20, 20 + i * 30, 220, 40 + i * 30)
+        replace_text_in_box_single_line(
+            direct, 1, box, text, 12, bg_color=(0.9, 0.9, 0.9)
+        )
+        replace_text_in_box_single_line(
+            batched, 1, box, text, 12, bg_color=(0.9, 0.9, 0.9), writer=writer
+        )
+    writer.commit()
+
+    def words(page):
+        return [(round(w[0], 1), round(w[1], 1), w[4]) for w in page.get_text("words")]
+
+    assert words(direct[0]) == words(batched_page)
+
+
+def test_later_background_covers_earlier_text():
+    doc = fitz.open()
+    page = doc.new_page()
+    writer = PageWriter(page)
+
+    # 겹치지 않는 두 문단은 배경을 먼저 모아서 그림
+    replace_text_in_box_single_line(
+        doc, 1, (20, 20, 220, 40), "first", 12, writer=writer
+    )
+    replace_text_in_box_single_line(
+        doc, 1, (20, 50, 220, 70), "second", 12, writer=writer
+    )
+    # 앞 문단 텍스트 위에 놓이는 배경은 그 텍스트보다 나중에 그려야 함
+    replace_text_in_box_single_line(
+        doc, 1, (20, 15, 220, 45), "cover", 12, writer=writer
+    )
+    assert writer.commit() == 2
+
+    kinds = [kind for kind, _ in page.get_bboxlog()]
+    assert kinds == [
+        "fill-path",
+        "fill-text",
+        "fill-text",
+        "fill-path",
+        "fill-text",
+    ]
+    # 묶음마다 content stream 하나
+    assert len(page.get_contents()) == 2
+
+
+def test_adjacent_table_rows_stay_in_one_layer():
+    doc = fitz.open()
+    page = doc.new_page()
+    writer = PageWriter(page)
+
+    # 맞닿은 행은 글자 끝부분이 박스를 조금 벗어나도 겹치는 것으로 보지 않음
+    for i in range(20):
+        box = (20, 20 + i * 12, 220, 32 + i * 12)
+        replace_text_in_box_single_line(doc, 1, box, f"row {i}", 12, writer=writer)
+    assert writer.commit() == 1
+    assert len(page.get_contents()) == 1
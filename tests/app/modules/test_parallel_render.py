@@ -0,0 +1,118 @@
+import asyncio
+import json
+import os
+
+import fitz  # PyMuPDF
+
+from app.config import settings
+from app.modules.parallel_render import plan_shards, render_pdf_parallel_async
+from app.modules.pdf import render_plan_to_pdf
+from app.modules.render_plan import compile_render_plan
+from app.modules.render_pool import shutdown_render_pool
+
+
+SAMPLE_PDF = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "sample_files",
+    "7.pdf",
+)
+
+
+def make_paragraphs(pages):
+    return [
+        {
+            "pageNum": page,
+            "boundingBox": ["40", "40", "400", "70"],
+            "originalText": "",
+            "translatedText": f"번역된 페이지 {page}",
+            "style": json.dumps({"fontSize": 14}),
+        }
+        for page in pages
+    ]
+
+
+def render_parallel(monkeypatch, source_path, plan, page_count, work_dir, shard_size):
+    monkeypatch.setattr(settings, "render_workers", 2)
+    shutdown_render_pool()
+    try:
+        return asyncio.run(
+            render_pdf_parallel_async(
+                source_path, plan, 0, page_count, work_dir, shard_size
+            )
+        )
+    finally:
+        shutdown_render_pool()
+
+
+def test_plan_shards_skips_ranges_without_work():
+    plan = compile_render_plan(make_paragraphs([1, 2, 9, 31]))
+
+    assert plan_shards(plan, 32, 5) == [(1, 5), (6, 10), (31, 32)]
+    assert plan_shards(plan, 30, 5) == [(1, 5), (6, 10)]
+
+
+def test_parallel_render_matches_sequential(tmp_path, monkeypatch):
+    pages = [1, 3, 7, 12, 13, 30]
+    plan = compile_render_plan(make_paragraphs(pages))
+
+    sequential = fitz.open(SAMPLE_PDF)
+    render_plan_to_pdf(sequential, plan)
+
+    result = render_parallel(
+        monkeypatch, SAMPLE_PDF, plan, sequential.page_count, str(tmp_path), 4
+    )
+
+    with fitz.open(stream=result, filetype="pdf") as parallel:
+        assert parallel.page_count == sequential.page_count
+        for page_number in range(parallel.page_count):
+            assert (
+                parallel[page_number].get_text() == sequential[page_number].get_text()
+            )
+
+        # 번역문 폰트는 shard 수와 관계없이 서브셋 하나만 임베드
+        translated_fonts = {
+            font[3]
+            for page_number in pages
+            for font in parallel[page_number - 1].get_fonts()
+            if "KoPub" in font[3]
+        }
+        assert len(translated_fonts) == 1
+        assert "+" in translated_fonts.pop()
+    # 중간 파일은 남기지 않음
+    assert not (tmp_path / "stitched.pdf").exists()
+
+
+def test_links_across_shards_are_kept(tmp_path, monkeypatch):
+    doc = fitz.open()
+    for page_number in range(6):
+        doc.new_page().insert_text((50, 50), f"page {page_number + 1}")
+    doc[0].insert_link(
+        {
+            "kind": fitz.LINK_GOTO,
+            "from": fitz.Rect(10, 10, 100, 30),
+            "page": 5,
+            "to": fitz.Point(0, 100),
+        }
+    )
+    doc[1].insert_link(
+        {"kind": fitz.LINK_URI, "from": fitz.Rect(10, 10, 100, 30), "uri": "https://a"}
+    )
+    # 카탈로그의 /Dests에 등록한 이름 있는 목적지
+    dests = doc.get_new_xref()
+    doc.update_object(dests, f"<< /chapter [{doc[4].xref} 0 R /XYZ 0 700 0] >>")
+    doc.xref_set_key(doc.pdf_catalog(), "Dests", f"{dests} 0 R")
+    doc[2].insert_link(
+        {"kind": fitz.LINK_NAMED, "from": fitz.Rect(10, 10, 100, 30), "name": "chapter"}
+    )
+    source_path = str(tmp_path / "links.pdf")
+    doc.save(source_path)
+
+    plan = compile_render_plan(make_paragraphs([1, 3, 5]))
+    result = render_parallel(monkeypatch, source_path, plan, 6, str(tmp_path), 2)
+
+    with fitz.open(stream=result, filetype="pdf") as output:
+        links = [output[i].get_links() for i in range(3)]
+    assert [(link["kind"], link["page"]) for link in links[0]] == [(fitz.LINK_GOTO, 5)]
+    assert [link["uri"] for link in links[1]] == ["https://a"]
+    # 이름 있는 목적지는 해석한 페이지로 가는 링크로 바뀜
+    assert [(link["kind"], link["page"]) for link in links[2]] == [(fitz.LINK_GOTO, 4)]
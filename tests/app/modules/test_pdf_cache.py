@@ -0,0 +1,194 @@
+import asyncio
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import fitz  # PyMuPDF
+import httpx
+import pytest
+
+from app.modules.pdf_cache import PdfCache
+
+
+def make_pdf(text):
+    doc = fitz.open()
+    doc.new_page().insert_text((50, 50), text)
+    return doc.tobytes()
+
+
+class StubPdfServer:
+    """ETag 조건부 요청을 지원하는 테스트용 HTTP 서버"""
+
+    def __init__(self):
+        self.files = {}
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = stub.files[self.path]
+                etag = '"%s"' % hashlib.md5(body).hexdigest()
+                stub.requests.append((self.path, self.headers.get("If-None-Match")))
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = HTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server.server_port}{path}"
+
+
+@pytest.fixture
+def stub():
+    server = StubPdfServer()
+    yield server
+    server.server.shutdown()
+
+
+def fetch(cache, url):
+    async def run():
+        async with httpx.AsyncClient() as client:
+            return await cache.fetch(url, client)
+
+    return asyncio.run(run())
+
+
+def test_revalidates_with_etag_and_counts_hits(stub, tmp_path):
+    stub.files["/a.pdf"] = make_pdf("first")
+    cache = PdfCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+
+    first = fetch(cache, stub.url("/a.pdf"))
+    second = fetch(cache, stub.url("/a.pdf"))
+
+    assert first == second
+    assert fitz.open(first)[0].get_text().strip() == "first"
+    assert stub.requests[1][1] is not None
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["bytes_saved"] == len(stub.files["/a.pdf"])
+
+
+def test_changed_content_is_downloaded_again(stub, tmp_path):
+    stub.files["/a.pdf"] = make_pdf("old")
+    cache = PdfCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+    old_path = fetch(cache, stub.url("/a.pdf"))
+
+    stub.files["/a.pdf"] = make_pdf("new")
+    new_path = fetch(cache, stub.url("/a.pdf"))
+
+    assert new_path != old_path
+    assert fitz.open(new_path)[0].get_text().strip() == "new"
+    assert cache.get_stats()["misses"] == 2
+
+
+def test_same_content_is_stored_once_and_index_persists(stub, tmp_path):
+    stub.files["/a.pdf"] = stub.files["/copy.pdf"] = make_pdf("same")
+    cache = PdfCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+
+    assert fetch(cache, stub.url("/a.pdf")) == fetch(cache, stub.url("/copy.pdf"))
+    assert cache.total_bytes() == len(stub.files["/a.pdf"])
+
+    reopened = PdfCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+    fetch(reopened, stub.url("/a.pdf"))
+    assert reopened.get_stats()["hits"] == 1
+
+
+def test_evicts_least_recently_used(stub, tmp_path):
+    for name in ("a", "b", "c"):
+        stub.files[f"/{name}.pdf"] = make_pdf(name * 100)
+    size = len(stub.files["/a.pdf"])
+    cache = PdfCache(str(tmp_path), max_bytes=size * 2 + size // 2)
+
+    path_a = fetch(cache, stub.url("/a.pdf"))
+    fetch(cache, stub.url("/b.pdf"))
+    fetch(cache, stub.url("/a.pdf"))  # a를 최근 사용으로
+    fetch(cache, stub.url("/c.pdf"))
+
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 2
+    assert cache.total_bytes() <= cache.max_bytes
+    assert fitz.open(path_a).page_count == 1
+
+
+def test_changed_content_removes_unreferenced_blob(stub, tmp_path):
+    stub.files["/a.pdf"] = stub.files["/copy.pdf"] = make_pdf("old")
+    cache = PdfCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+    old_path = fetch(cache, stub.url("/a.pdf"))
+    fetch(cache, stub.url("/copy.pdf"))
+
+    # 다른 URL이 같은 파일을 참조하면 남김
+    stub.files["/a.pdf"] = make_pdf("new")
+    new_path = fetch(cache, stub.url("/a.pdf"))
+    assert os.path.exists(old_path)
+    assert cache.total_bytes() == len(stub.files["/a.pdf"]) + len(
+        stub.files["/copy.pdf"]
+    )
+
+    # 참조가 없어진 파일은 삭제하고 크기에서도 뺌
+    stub.files["/copy.pdf"] = stub.files["/a.pdf"]
+    assert fetch(cache, stub.url("/copy.pdf")) == new_path
+    assert not os.path.exists(old_path)
+    assert cache.total_bytes() == len(stub.files["/a.pdf"])
+    assert sorted(os.listdir(cache.blob_dir)) == [os.path.basename(new_path)]
+
+    # 내용은 같고 ETag만 바뀐 경우에도 파일을 지우지 않음
+    cache._entries[stub.url("/a.pdf")]["etag"] = '"stale"'
+    assert fetch(cache, stub.url("/a.pdf")) == new_path
+    assert os.path.exists(new_path)
+
+
+def test_pinned_old_blob_is_removed_after_release(stub, tmp_path):
+    stub.files["/a.pdf"] = make_pdf("old")
+    cache = PdfCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+
+    async def run():
+        async with httpx.AsyncClient() as client:
+            old_path = await cache.fetch(stub.url("/a.pdf"), client)
+            cache._pin(os.path.splitext(os.path.basename(old_path))[0])
+            stub.files["/a.pdf"] = make_pdf("new")
+            await cache.fetch(stub.url("/a.pdf"), client)
+            # 사용 중인 이전 파일은 고정이 풀릴 때까지 남김
+            assert os.path.exists(old_path)
+            cache._unpin(os.path.splitext(os.path.basename(old_path))[0])
+            assert not os.path.exists(old_path)
+
+    asyncio.run(run())
+
+
+def test_concurrent_fetches_do_not_evict_files_in_use(stub, tmp_path):
+    stub.files["/a.pdf"] = make_pdf("a")
+    stub.files["/b.pdf"] = make_pdf("b")
+    # 파일 하나도 들어가지 않는 크기라 각 요청이 다른 요청의 파일을 제거하려 함
+    cache = PdfCache(str(tmp_path), max_bytes=1)
+
+    async def run():
+        barrier = asyncio.Barrier(2)
+
+        async def use(client, name):
+            async with cache.open(stub.url(f"/{name}.pdf"), client) as path:
+                # 두 요청이 모두 받을 때까지 파일을 사용 중으로 유지
+                await barrier.wait()
+                with fitz.open(path) as pdf:
+                    return pdf[0].get_text().strip()
+
+        async with httpx.AsyncClient() as client:
+            # 두 번째는 304 재검증 경로
+            for _ in range(2):
+                assert await asyncio.gather(use(client, "a"), use(client, "b")) == ["a", "b"]
+
+    asyncio.run(run())
+    assert cache.get_stats()["hits"] == 2
@@ -0,0 +1,126 @@
+import json
+
+import fitz  # PyMuPDF
+import numpy as np
+
+from app.modules import pdf as pdf_module
+from app.modules.pdf import render_plan_to_pdf
+from app.modules.render_plan import compile_render_plan, parse_style
+
+
+BOLD_STYLE = json.dumps(
+    {"fontSize": 14, "color": [255, 0, 0], "bgColor": [0, 0, 255], "isBold": True}
+)
+PLAIN_STYLE = json.dumps({"fontSize": 10})
+
+
+def make_paragraph(page, box, text, style):
+    return {
+        "pageNum": page,
+        "boundingBox": box,
+        "originalText": "",
+        "translatedText": text,
+        "style": style,
+    }
+
+
+def test_parse_style_normalizes_colors_and_font_name():
+    style = parse_style(BOLD_STYLE)
+
+    assert style.font_size == 14
+    assert style.font_name == "Helvetica-Bold"
+    assert style.color == (1.0, 0.0, 0.0)
+    assert style.bg_color == (0.0, 0.0, 1.0)
+
+
+def test_compile_groups_by_page_and_interns_styles():
+    paragraphs = [
+        make_paragraph(3, ["10", "20", "110", "40"], "c", PLAIN_STYLE),
+        make_paragraph(1, ["1.5", "2", "3", "4"], "a", BOLD_STYLE),
+        make_paragraph(3, [0, 0, 5, 5], "d", BOLD_STYLE),
+        make_paragraph(20, [0, 0, 5, 5], "over limit", PLAIN_STYLE),
+    ]
+
+    plan = compile_render_plan(paragraphs, page_number_limit=15)
+
+    assert [page.page_number for page in plan.iter_pages()] == [1, 3]
+    assert len(plan.styles) == 2
+    page3 = plan.pages[3]
+    assert page3.texts == ["c", "d"]
+    assert page3.boxes.dtype == np.float64
+    assert page3.boxes.tolist() == [[10, 20, 110, 40], [0, 0, 5, 5]]
+    assert plan.styles[page3.style_ids[1]] == plan.styles[plan.pages[1].style_ids[0]]
+
+
+def test_render_plan_only_touches_existing_pages():
+    doc = fitz.open()
+    doc.new_page()
+    paragraphs = [
+        make_paragraph(1, [50, 50, 300, 80], "translated text", PLAIN_STYLE),
+        make_paragraph(2, [50, 50, 300, 80], "no such page", PLAIN_STYLE),
+    ]
+
+    render_plan_to_pdf(doc, compile_render_plan(paragraphs))
+
+    assert "translated text" in doc[0].get_text()
+
+
+def test_invalid_paragraphs_are_skipped():
+    paragraphs = [
+        make_paragraph(0, [0, 0, 5, 5], "page zero", PLAIN_STYLE),
+        make_paragraph(-1, [0, 0, 5, 5], "negative page", PLAIN_STYLE),
+        make_paragraph(1, [0, 0, 5], "three coordinates", PLAIN_STYLE),
+        make_paragraph(1, [0, 0, 5, 5, 9], "five coordinates", PLAIN_STYLE),
+        make_paragraph(1, ["0", "0", "five", "5"], "non-numeric", PLAIN_STYLE),
+        make_paragraph(1, [0, None, 5, 5], "null coordinate", PLAIN_STYLE),
+        make_paragraph(1, None, "no box", PLAIN_STYLE),
+        make_paragraph(1, ["1", "2", "3", "4"], "ok", PLAIN_STYLE),
+        make_paragraph(1, [5, 6, 7, 8], "also ok", PLAIN_STYLE),
+    ]
+
+    plan = compile_render_plan(paragraphs)
+
+    assert plan.skipped == 7
+    assert list(plan.pages) == [1]
+    # 잘못된 박스가 있어도 뒤 문단의 좌표가 어긋나지 않음
+    assert plan.pages[1].boxes.tolist() == [[1, 2, 3, 4], [5, 6, 7, 8]]
+    assert plan.pages[1].texts == ["ok", "also ok"]
+
+
+def test_page_zero_does_not_draw_on_last_page():
+    doc = fitz.open()
+    doc.new_page()
+    doc.new_page()
+    paragraphs = [make_paragraph(0, [50, 50, 300, 80], "page zero", PLAIN_STYLE)]
+
+    render_plan_to_pdf(doc, compile_render_plan(paragraphs))
+
+    assert "page zero" not in doc[-1].get_text()
+
+
+def test_font_sizes_are_fitted_once_per_page(monkeypatch):
+    doc = fitz.open()
+    doc.new_page()
+    doc.new_page()
+    paragraphs = [
+        make_paragraph(1, [50, 50, 300, 80], "first", PLAIN_STYLE),
+        make_paragraph(1, [50, 100, 300, 130], "second", BOLD_STYLE),
+        make_paragraph(1, [50, 150, 52, 151], "does not fit", PLAIN_STYLE),
+        make_paragraph(2, [50, 50, 300, 80], "third", PLAIN_STYLE),
+    ]
+    calls = []
+    fit_font_sizes = pdf_module.fit_font_sizes
+
+    def counted(texts, *args):
+        calls.append(list(texts))
+        return fit_font_sizes(texts, *args)
+
+    monkeypatch.setattr(pdf_module, "fit_font_sizes", counted)
+    render_plan_to_pdf(doc, compile_render_plan(paragraphs))
+
+    assert calls == [["first", "second", "does not fit"], ["third"]]
+    text = doc[0].get_text()
+    assert "first" in text and "second" in text
+    # 박스에 맞출 수 없는 문단은 그리지 않음
+    assert "does not fit" not in text
+    assert "third" in doc[1].get_text()
@@ -0,0 +1,44 @@
+import fitz  # PyMuPDF
+import pytest
+
+from app.modules.save_translated_pdf import export_pdf
+
+
+def make_pdf(pages=1):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((50, 50), f"page {i + 1}")
+    return doc
+
+
+def test_export_without_spill_returns_bytes():
+    data = export_pdf(make_pdf(), subset_fonts=False)
+
+    assert isinstance(data, bytes)
+    assert fitz.open(stream=data, filetype="pdf").page_count == 1
+
+
+def test_large_result_is_saved_directly_to_spill_path(tmp_path, monkeypatch):
+    spill_path = str(tmp_path / "output.pdf")
+    # spill을 사용하면 전체 결과를 바이트로 만들지 않음
+    monkeypatch.setattr(
+        fitz.Document,
+        "tobytes",
+        lambda *args, **kwargs: pytest.fail("tobytes should not be called"),
+    )
+
+    result = export_pdf(make_pdf(20), spill_path, spill_threshold=100)
+
+    assert result == spill_path
+    assert fitz.open(spill_path).page_count == 20
+
+
+def test_small_result_is_read_back_and_spill_file_removed(tmp_path):
+    spill_path = tmp_path / "output.pdf"
+
+    result = export_pdf(make_pdf(), str(spill_path), spill_threshold=10 * 1024 * 1024)
+
+    assert isinstance(result, bytes)
+    assert fitz.open(stream=result, filetype="pdf").page_count == 1
+    assert not spill_path.exists()
+
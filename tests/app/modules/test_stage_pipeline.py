@@ -0,0 +1,159 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.modules.stage_pipeline import (
+    Stage,
+    StagePipeline,
+    get_pipeline_stats,
+    prefetch,
+    reset_pipeline_stats,
+)
+
+
+def sleeper(seconds, transform=lambda x: x):
+    async def stage(item):
+        await asyncio.sleep(seconds(item) if callable(seconds) else seconds)
+        return transform(item)
+
+    return stage
+
+
+def test_results_keep_input_order_with_concurrent_workers():
+    # 앞 항목일수록 오래 걸리므로 완료 순서는 입력과 반대
+    pipeline = StagePipeline(
+        [
+            Stage(
+                "slow",
+                sleeper(lambda x: (10 - x) * 0.005, lambda x: x * 2),
+                concurrency=4,
+            ),
+            Stage("fast", sleeper(0, lambda x: x + 1), concurrency=2),
+        ]
+    )
+    assert asyncio.run(pipeline.run(range(10))) == [x * 2 + 1 for x in range(10)]
+    assert pipeline.stats["slow"].processed == pipeline.stats["fast"].processed == 10
+
+
+def test_stages_overlap():
+    # a가 1번 항목을 시작하려면 b가 0번을 처리 중이어야 하고, b는 a가 1번을 시작해야 끝남
+    # 단계가 겹쳐서 실행되지 않으면 둘 다 기다리다가 시간 초과
+    b_started = asyncio.Event()
+    a_started = asyncio.Event()
+
+    async def a(item):
+        if item == 1:
+            a_started.set()
+            await asyncio.wait_for(b_started.wait(), 5)
+        return item
+
+    async def b(item):
+        if item == 0:
+            b_started.set()
+            await asyncio.wait_for(a_started.wait(), 5)
+        return item
+
+    stages = [Stage("a", a), Stage("b", b)]
+    assert asyncio.run(StagePipeline(stages).run(range(6))) == list(range(6))
+
+
+def test_queue_depth_is_bounded():
+    pipeline = StagePipeline([Stage("consumer", sleeper(0.01))], queue_size=2)
+
+    async def items():
+        for i in range(20):
+            yield i
+
+    asyncio.run(pipeline.run(items()))
+    assert 1 <= pipeline.stats["consumer"].max_queue_depth <= 2
+
+
+def test_failure_cancels_other_stages():
+    finished = []
+
+    async def fail(item):
+        if item == 3:
+            raise ValueError("bad page")
+        return item
+
+    async def record(item):
+        await asyncio.sleep(0.01)
+        finished.append(item)
+        return item
+
+    pipeline = StagePipeline([Stage("check", fail), Stage("record", record)])
+    with pytest.raises(ValueError, match="bad page"):
+        asyncio.run(pipeline.run(range(100)))
+    assert len(finished) < 10
+
+
+def test_stats_are_accumulated_per_stage():
+    reset_pipeline_stats()
+    for _ in range(2):
+        asyncio.run(
+            StagePipeline([Stage("double", sleeper(0, lambda x: x * 2))]).run([1, 2, 3])
+        )
+
+    stats = get_pipeline_stats()["double"]
+    assert stats["processed"] == 6
+    assert stats["queue_depth"] == 0
+    assert set(stats) == {"processed", "busy_seconds", "queue_depth", "max_queue_depth"}
+
+
+def test_prefetch_enters_in_background_and_closes():
+    events = []
+
+    @asynccontextmanager
+    async def resource():
+        events.append("enter")
+        await asyncio.sleep(0.01)
+        yield "data"
+        events.append("exit")
+
+    async def main():
+        async with prefetch(resource()) as entered:
+            events.append("other work")
+            assert await entered == "data"
+        # 아직 시작하지 않은 진입은 취소되고 닫지 않음
+        async with prefetch(resource()):
+            pass
+
+    asyncio.run(main())
+    assert events == ["other work", "enter", "exit"]
+
+
+def test_prefetch_passes_block_exception_to_context():
+    exits = []
+
+    @asynccontextmanager
+    async def resource():
+        try:
+            yield "data"
+        except ValueError as e:
+            exits.append(e)
+            raise
+
+    async def main():
+        async with prefetch(resource()) as entered:
+            await entered
+            raise ValueError("render failed")
+
+    with pytest.raises(ValueError, match="render failed"):
+        asyncio.run(main())
+    assert [str(e) for e in exits] == ["render failed"]
+
+
+def test_prefetch_raises_download_error_the_block_did_not_await():
+    @asynccontextmanager
+    async def failing():
+        raise ConnectionError("download failed")
+        yield
+
+    async def main():
+        async with prefetch(failing()) as entered:
+            # 진입 예외가 먼저 끝나도록 기다림 (결과는 await하지 않음)
+            await asyncio.wait({entered})
+
+    with pytest.raises(ConnectionError, match="download failed"):
+        asyncio.run(main())
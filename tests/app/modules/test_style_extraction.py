@@ -0,0 +1,152 @@
+import asyncio
+import os
+import tempfile
+
+import fitz  # PyMuPDF
+import pytest
+
+from app.config import settings
+from app.modules import page_raster, style_extraction
+from app.modules.style_extraction import (
+    extract_styles,
+    extract_styles_async,
+    plan_style_tasks,
+)
+
+
+TEXT = "The quick brown fox jumps over"
+
+
+def write_line(page, y, fontname, fontsize, color, fill):
+    width = fitz.get_text_length(TEXT, fontname, fontsize)
+    box = fitz.Rect(40, y - fontsize, 40 + width + 4, y + fontsize * 0.35)
+    page.draw_rect(box + (-6, -6, 6, 6), color=None, fill=fill)
+    page.insert_text((42, y), TEXT, fontname=fontname, fontsize=fontsize, color=color)
+    return list(box)
+
+
+@pytest.fixture
+def sample(tmp_path):
+    doc = fitz.open()
+    boxes = []
+    first = doc.new_page(width=500, height=400)
+    boxes.append({"pageNum": 1, "boundingBox": write_line(first, 80, "helv", 16, (0, 0, 0), (1, 1, 1))})
+    boxes.append({"pageNum": 1, "boundingBox": write_line(first, 180, "hebo", 16, (1, 1, 1), (0, 0, 0.6))})
+    last = write_line(first, 300, "hebo", 24, (0, 0, 0), (1, 1, 1))
+    second = doc.new_page(width=500, height=400)
+    boxes.append({"pageNum": 2, "boundingBox": write_line(second, 100, "helv", 28, (0.8, 0, 0), (1, 1, 0.8))})
+    # 입력 순서와 페이지 순서가 달라도 결과는 입력 순서대로
+    boxes.append({"pageNum": 1, "boundingBox": last})
+    path = tmp_path / "styles.pdf"
+    doc.save(path)
+    return str(path), boxes
+
+
+def test_raster_styles_per_box(sample):
+    path, boxes = sample
+    styles = extract_styles(path, boxes, use_text_layer=False)
+    assert {style["method"] for style in styles} == {"raster"}
+
+    assert [style["isBold"] for style in styles] == [False, True, False, True]
+    assert [style["fontSize"] for style in styles] == pytest.approx([16, 16, 28, 24], abs=1.5)
+
+    assert styles[0]["color"] == pytest.approx([0, 0, 0], abs=30)
+    assert styles[0]["bgColor"] == [255, 255, 255]
+    assert styles[1]["color"] == pytest.approx([255, 255, 255], abs=30)
+    assert styles[1]["bgColor"] == pytest.approx([0, 0, 153], abs=15)
+    assert styles[2]["bgColor"] == pytest.approx([255, 255, 204], abs=15)
+    assert styles[2]["color"][0] > 150 and styles[2]["color"][1] < 80
+
+
+def test_tasks_group_boxes_by_page(sample):
+    _, boxes = sample
+    groups, tasks = plan_style_tasks(boxes, 4)
+    assert groups == {1: [0, 1, 3], 2: [2]}
+    # 페이지 수보다 많은 작업은 만들지 않음
+    assert [[page_num for page_num, _ in task] for task in tasks] == [[1], [2]]
+    assert len(plan_style_tasks(boxes, 1)[1]) == 1
+
+
+def test_text_layer_styles_are_exact(sample):
+    path, boxes = sample
+    styles = extract_styles(path, boxes)
+
+    assert [style["method"] for style in styles] == ["text_layer"] * 4
+    assert [style["fontSize"] for style in styles] == [16, 16, 28, 24]
+    assert [style["isBold"] for style in styles] == [False, True, False, True]
+    assert [style["font"] for style in styles] == [
+        "Helvetica", "Helvetica-Bold", "Helvetica", "Helvetica-Bold"
+    ]
+    assert styles[1]["color"] == [255, 255, 255]
+    assert styles[1]["bgColor"] == [0, 0, 153]
+    assert styles[2]["color"] == [204, 0, 0]
+    assert styles[2]["bgColor"] == [255, 255, 204]
+
+
+def test_scanned_page_falls_back_to_raster(sample, tmp_path):
+    path, boxes = sample
+    # 1페이지를 이미지로만 된 페이지로 바꿈 (텍스트 레이어 없음)
+    with fitz.open(path) as doc:
+        pix = doc[0].get_pixmap(dpi=150)
+        scanned = fitz.open()
+        page = scanned.new_page(width=500, height=400)
+        page.insert_image(page.rect, pixmap=pix)
+        page.insert_text((300, 380), "caption", fontsize=10)
+        scanned.insert_pdf(doc, from_page=1, to_page=1)
+        scanned_path = str(tmp_path / "scanned.pdf")
+        scanned.save(scanned_path)
+
+    caption = {"pageNum": 1, "boundingBox": [298, 370, 340, 384]}
+    styles = extract_styles(scanned_path, boxes + [caption])
+
+    assert [style["method"] for style in styles] == [
+        "raster", "raster", "text_layer", "raster", "hybrid"
+    ]
+    assert [style["isBold"] for style in styles[:2]] == [False, True]
+    # 이미지 위의 텍스트: 글자 스타일은 텍스트 레이어, 배경색은 래스터
+    assert styles[4]["fontSize"] == 10
+    assert styles[4]["bgColor"] == [255, 255, 255]
+
+
+def test_async_pool_matches_in_process(sample, monkeypatch):
+    path, boxes = sample
+    monkeypatch.setattr(settings, "render_workers", 2)
+    assert asyncio.run(extract_styles_async(path, boxes)) == extract_styles(path, boxes)
+
+
+def test_raster_renders_box_regions_only(sample, monkeypatch):
+    path, boxes = sample
+
+    def full_page(*args, **kwargs):
+        raise AssertionError("페이지 전체를 래스터화함")
+
+    monkeypatch.setattr(page_raster, "render_page_image", full_page)
+    styles = extract_styles(path, boxes, use_text_layer=False)
+    assert [style["isBold"] for style in styles] == [False, True, False, True]
+
+
+def test_async_bytes_source_is_spooled_to_a_file(sample, monkeypatch):
+    path, boxes = sample
+    monkeypatch.setattr(settings, "render_workers", 2)
+    with open(path, "rb") as f:
+        data = f.read()
+
+    spooled = []
+    spool_source = style_extraction.spool_source
+    monkeypatch.setattr(
+        style_extraction, "spool_source", lambda source: spooled.append(spool_source(source)) or spooled[-1]
+    )
+
+    before = set(os.listdir(tempfile.gettempdir()))
+    assert asyncio.run(extract_styles_async(data, boxes)) == extract_styles(path, boxes)
+    # 작업에는 경로를 넘기고, 끝나면 임시 파일을 지움
+    assert len(spooled) == 1
+    assert not os.path.exists(spooled[0])
+    assert set(os.listdir(tempfile.gettempdir())) - before == set()
+
+
+def test_empty_boxes_return_no_styles(sample):
+    path, _ = sample
+    assert plan_style_tasks([], 4) == ({}, [])
+    assert extract_styles(path, []) == []
+    assert asyncio.run(extract_styles_async(path, [])) == []
@@ -0,0 +1,64 @@
+import numpy as np
+
+from app.modules.font_registry import get_face
+from app.modules.text_fitting import (
+    fit_font_sizes,
+    measure_unit_width,
+    solve_font_size,
+    solve_font_sizes,
+)
+
+
+def test_width_scales_linearly_with_font_size():
+    font = get_face().font
+    unit = measure_unit_width("번역된 문장 Translated", font)
+
+    for size in (3, 7.5, 11, 40):
+        assert np.isclose(font.text_length("번역된 문장 Translated", fontsize=size), unit * size)
+
+
+def test_solve_font_size_respects_width_height_and_cap():
+    # 너비 제한: 100 / 10 = 10pt
+    assert solve_font_size(10, 100, 50, 20) == 10
+    # 높이 제한
+    assert solve_font_size(1, 100, 8, 20) == 8
+    # 요청한 크기로 제한
+    assert solve_font_size(1, 100, 50, 12) == 12
+    # 빈 텍스트는 높이와 요청 크기로만 결정
+    assert solve_font_size(0, 10, 30, 12) == 12
+    # 최소 크기로도 맞출 수 없는 경우
+    assert solve_font_size(500, 100, 50, 12) is None
+
+
+def test_solved_size_is_exact_fit():
+    font = get_face().font
+    text = "exact optimal size"
+    size = solve_font_size(measure_unit_width(text, font), 120, 40, 50)
+
+    assert np.isclose(font.text_length(text, fontsize=size), 120)
+
+
+def test_vectorized_matches_scalar():
+    unit_widths = [10, 1, 1, 0, 500]
+    box_widths = [100, 100, 100, 10, 100]
+    box_heights = [50, 8, 50, 30, 50]
+    max_sizes = [20, 20, 12, 12, 12]
+
+    sizes = solve_font_sizes(unit_widths, box_widths, box_heights, max_sizes)
+
+    for i, size in enumerate(sizes):
+        expected = solve_font_size(unit_widths[i], box_widths[i], box_heights[i], max_sizes[i])
+        if expected is None:
+            assert np.isnan(size)
+        else:
+            assert size == expected
+
+
+def test_fit_font_sizes_for_page():
+    font = get_face().font
+    rects = np.array([[0, 0, 100, 20], [0, 30, 2, 31]])
+
+    sizes = fit_font_sizes(["hello", "too long to fit"], [font, font], rects, 11)
+
+    assert sizes[0] is not None and sizes[0] <= 11
+    assert sizes[1] is None
@@ -0,0 +1,119 @@
+import os
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect
+
+from app.modules.translation_memory import (
+    TranslationMemory,
+    get_translation_memory_stats,
+    normalize_text,
+    reset_translation_memory_stats,
+)
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+class StubTranslator:
+    """원문 앞에 언어 코드를 붙여서 반환하고 호출 기록을 남기는 번역기"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, from_lang, to_lang, texts):
+        self.calls.append(list(texts))
+        return [f"[{to_lang}] {text}" for text in texts]
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'memory.db'}"
+
+
+@pytest.fixture
+def memory(db_url):
+    memory = TranslationMemory(db_url, lru_size=100)
+    memory.create_table()
+    reset_translation_memory_stats()
+    return memory
+
+
+def test_translator_only_called_for_misses(memory):
+    translator = StubTranslator()
+    texts = ["Confidential", "Page  1", "", "Confidential", "Total\namount"]
+
+    first = memory.translate("en", "ko", texts, translator)
+    assert first == ["[ko] Confidential", "[ko] Page  1", "", "[ko] Confidential", "[ko] Total\namount"]
+    # 같은 원문은 한 번만, 공백만 있는 원문은 보내지 않음
+    assert translator.calls == [["Confidential", "Page  1", "Total\namount"]]
+
+    # 공백이 달라도 정규화 결과가 같으면 적중
+    second = memory.translate("en", "ko", ["Page 1", "Total amount", "New"], translator)
+    assert second == ["[ko] Page  1", "[ko] Total\namount", "[ko] New"]
+    assert translator.calls[1] == ["New"]
+
+    stats = get_translation_memory_stats()
+    assert stats["lookups"] == 6
+    assert stats["lru_hits"] == 2
+    assert stats["misses"] == 4
+    assert stats["hit_rate"] == pytest.approx(2 / 6)
+
+
+def test_persists_across_instances_and_language_pairs(memory, db_url):
+    memory.put_many("en", "ko", [("Invoice", "송장"), ("Date", "날짜")])
+    memory.put_many("en", "ko", [("Invoice", "청구서")])
+
+    # 새 프로세스처럼 LRU가 빈 상태
+    other = TranslationMemory(db_url, lru_size=100)
+    reset_translation_memory_stats()
+    assert other.get_many("en", "ko", ["Invoice", "Date", "Unknown"]) == ["청구서", "날짜", None]
+    assert other.get_many("en", "ja", ["Invoice"]) == [None]
+    assert other.get_many("en", "ko", ["Invoice"]) == ["청구서"]
+
+    stats = get_translation_memory_stats()
+    assert (stats["db_hits"], stats["lru_hits"], stats["misses"]) == (2, 1, 2)
+
+
+def test_lru_evicts_least_recently_used(db_url):
+    memory = TranslationMemory(db_url, lru_size=2)
+    memory.create_table()
+    memory.put_many("en", "ko", [("a", "A"), ("b", "B"), ("c", "C")])
+    reset_translation_memory_stats()
+
+    assert memory.get_many("en", "ko", ["a", "c"]) == ["A", "C"]
+    stats = get_translation_memory_stats()
+    assert (stats["lru_hits"], stats["db_hits"]) == (1, 1)
+
+
+def test_bulk_get_spans_query_chunks(memory):
+    texts = [f"label {i}" for i in range(1200)]
+    memory.put_many("en", "ko", [(text, text.upper()) for text in texts])
+
+    other = TranslationMemory(memory.engine, lru_size=0)
+    assert other.get_many("en", "ko", texts) == [text.upper() for text in texts]
+
+
+def test_normalize_text():
+    assert normalize_text("  Total\n\tamount ") == "Total amount"
+    # 조합형 한글도 같은 키
+    assert normalize_text("가") == "가"
+
+
+def test_migration_creates_translation_memory_table(db_url):
+    config = Config(os.path.join(ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(ROOT, "alembic"))
+    config.set_main_option("sqlalchemy.url", db_url)
+
+    command.upgrade(config, "head")
+    tables = set(inspect(create_engine(db_url)).get_table_names())
+    assert {"documents", "translation_memory"} <= tables
+
+    memory = TranslationMemory(db_url)
+    memory.put_many("en", "ko", [("Invoice", "송장")])
+    memory.put_many("en", "ko", [("Invoice", "청구서")])
+    assert TranslationMemory(db_url).get_many("en", "ko", ["Invoice"]) == ["청구서"]
+
+    command.downgrade(config, "446fa7fed31b")
+    assert "translation_memory" not in inspect(create_engine(db_url)).get_table_names()
@@ -0,0 +1,130 @@
+import time
+
+import fitz  # PyMuPDF
+import numpy as np
+import pytest
+
+from app.modules.google_document import (
+    GoogleDocumentDimension,
+    GoogleDocumentParagraph,
+    LayoutElements,
+)
+from app.modules.page_raster import PageRasterCache, PageRasterizer
+from app.utils.dimension import (
+    bounding_polys_to_rects,
+    get_point_rects_from_elements,
+    get_rect,
+    get_rect_from_paragraph,
+    get_rect_style_from_paragraph,
+    get_rects_from_elements,
+)
+
+
+def make_paragraph(x0, y0, x1, y1):
+    vertices = [{"x": x0, "y": y0}, {"x": x1, "y": y0}, {"x": x1, "y": y1}, {"x": x0, "y": y1}]
+    return GoogleDocumentParagraph.from_dict(
+        {
+            "layout": {
+                "textAnchor": {"textSegments": [{"startIndex": 0, "endIndex": 1}]},
+                "boundingPoly": {"normalizedVertices": vertices},
+                "orientation": "PAGE_UP",
+            }
+        }
+    )
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    doc = fitz.open()
+    page = doc.new_page(width=612, height=792)
+    page.draw_rect(fitz.Rect(100, 100, 400, 160), color=None, fill=(0, 0, 1))
+    page.insert_text((110, 140), "Hello world", fontsize=24, color=(1, 1, 1))
+    path = tmp_path / "page.pdf"
+    doc.save(path)
+    return str(path)
+
+
+def test_get_rect_from_paragraph():
+    dimension = GoogleDocumentDimension(width=1758, height=2275, unit="pixels")
+    paragraph = make_paragraph(0.1, 0.2, 0.5, 0.25)
+    # round(0.1 * 1758) = 176 -> 176 * 612 / 1758 = 61.2 -> 61
+    assert get_rect_from_paragraph(dimension, [612, 792], paragraph) == [61, 158, 306, 198]
+
+
+def test_get_rect_style_from_paragraph_uses_box_region(pdf_path):
+    # Document AI 좌표계가 PDF와 비율이 같은 1758 x 2275 픽셀
+    dimension = GoogleDocumentDimension(width=1758, height=2275, unit="pixels")
+    paragraph = make_paragraph(105 / 612, 110 / 792, 395 / 612, 150 / 792)
+
+    rasterizer = PageRasterizer(pdf_path, cache=PageRasterCache(0))
+    style = get_rect_style_from_paragraph(pdf_path, 0, paragraph, dimension, rasterizer)
+    rasterizer.close()
+
+    # BGR 순서: 파란 배경, 흰 글자
+    assert style["bg_color"] == pytest.approx((1, 0, 0), abs=0.05)
+    assert min(style["text_color"][1:]) > 0.3
+    assert style == get_rect_style_from_paragraph(pdf_path, 0, paragraph, dimension)
+
+
+def layout_elements(polys):
+    return LayoutElements(
+        [{"layout": {"boundingPoly": {"normalizedVertices": poly}}} for poly in polys],
+        GoogleDocumentParagraph,
+    )
+
+
+def random_polys(count, seed=0):
+    rng = np.random.default_rng(seed)
+    polys = []
+    for _ in range(count):
+        x0, y0 = rng.random(2) * 0.8
+        w, h = rng.random(2) * 0.2
+        # 기울어진 사각형도 포함
+        dx = rng.random() * 0.01
+        corners = [(x0, y0), (x0 + w, y0 + dx), (x0 + w - dx, y0 + h), (x0, y0 + h)]
+        polys.append([{"x": float(x), "y": float(y)} for x, y in corners])
+    return polys
+
+
+def test_batch_rects_match_per_paragraph():
+    dimension = GoogleDocumentDimension(width=1758, height=2275, unit="pixels")
+    polys = random_polys(500)
+    # 꼭짓점이 3개인 요소 (4번째 자리는 0으로 채워짐)
+    polys[7] = polys[7][:3]
+    elements = layout_elements(polys)
+
+    expected = [get_rect_from_paragraph(dimension, [612, 792], p) for p in elements]
+    assert get_rects_from_elements(dimension, [612, 792], elements).tolist() == expected
+
+    scale = 612 / 1758
+    points = get_point_rects_from_elements(dimension, 612, elements)
+    for rect, paragraph in zip(points, elements):
+        assert rect.tolist() == [v * scale for v in get_rect(paragraph, dimension)]
+
+
+def test_pixel_vertices_and_empty_polys():
+    vertices = np.array([[[10, 20], [30, 20], [30, 50], [10, 50]], [[0, 0]] * 4])
+    rects = bounding_polys_to_rects(vertices, 100, 100, scale=0.5, counts=[4, 0], normalized=False)
+    assert rects.tolist() == [[5, 10, 15, 25], [0, 0, 0, 0]]
+    assert bounding_polys_to_rects(np.zeros((0, 4, 2)), 100, 100).shape == (0, 4)
+
+
+def test_batch_rects_benchmark():
+    """페이지 하나에 문단이 많은 경우 요소별 계산과 속도 비교"""
+    dimension = GoogleDocumentDimension(width=1758, height=2275, unit="pixels")
+    elements = layout_elements(random_polys(2000, seed=1))
+    paragraphs = list(elements)
+
+    start = time.perf_counter()
+    expected = [get_rect_from_paragraph(dimension, [612, 792], p) for p in paragraphs]
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rects = get_rects_from_elements(dimension, [612, 792], elements)
+    batch_seconds = time.perf_counter() - start
+
+    print(
+        f"\n{len(paragraphs)} paragraphs: per-paragraph {loop_seconds * 1000:.1f}ms, "
+        f"batch {batch_seconds * 1000:.2f}ms ({loop_seconds / batch_seconds:.0f}x)"
+    )
+    assert rects.tolist() == expected